@@ -0,0 +1,70 @@
+"""In-process broadcast channels for fan-out translations.
+
+A speaker publishes each utterance once per language to a channel;
+listeners subscribe to (channel, language) and receive the events through
+their own bounded queue.  A slow listener loses its oldest events instead
+of holding up the speaker or the other listeners.
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastHub:
+    def __init__(self, queue_size: int = 16) -> None:
+        self._queue_size = queue_size
+        self._subscribers: dict[str, dict[str, set[asyncio.Queue]]] = {}
+
+    def subscribe(self, channel: str, lang: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(channel, {}).setdefault(lang, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, channel: str, lang: str, queue: asyncio.Queue) -> None:
+        langs = self._subscribers.get(channel)
+        if not langs:
+            return
+        queues = langs.get(lang)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del langs[lang]
+        if not langs:
+            del self._subscribers[channel]
+
+    def languages(self, channel: str) -> list[str]:
+        """Languages with at least one listener on the channel."""
+        return sorted(self._subscribers.get(channel, {}))
+
+    def publish(self, channel: str, lang: str, event: dict) -> int:
+        """Deliver ``event`` to every listener of (channel, lang). Returns the listener count."""
+        queues = self._subscribers.get(channel, {}).get(lang, set())
+        for queue in queues:
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                logger.debug("Broadcast listener on %s/%s is lagging, dropped an event", channel, lang)
+            queue.put_nowait(event)
+        return len(queues)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            channel: {lang: len(queues) for lang, queues in langs.items()}
+            for channel, langs in self._subscribers.items()
+        }
+
+
+_hub: BroadcastHub | None = None
+
+
+def get_broadcast_hub() -> BroadcastHub:
+    global _hub
+    if _hub is None:
+        from backend.dependencies import get_settings
+
+        _hub = BroadcastHub(get_settings().broadcast_queue_size)
+    return _hub
@@ -8,17 +8,40 @@ class Settings(BaseSettings):
     stt_provider: str = "local"
     whisper_model: str = "small"
     whisper_compute_type: str = "int8"
+    whisper_translate_enabled: bool = True  # allow Whisper's task=translate for ->en (profile must opt in)
+    whisper_num_workers: int = 2        # parallel transcriptions (chunks of long recordings, concurrent requests)
+    stt_chunk_threshold_s: float = 120.0  # recordings longer than this are split at silences
+    stt_chunk_max_s: float = 30.0
+    stt_chunk_overlap_s: float = 1.0    # overlap when a chunk must cut through continuous speech
 
     # TTS
     tts_provider: str = "local"
     piper_voice: str = "de_DE-thorsten-high"
     chatterbox_url: str = "http://gpu00.node:4123"
     chatterbox_voice: str = "default"
+    tts_cache_max_mb: int = 64          # in-memory cache of synthesized audio, 0 = off
+
+    # Speculative translation of stable partial transcripts (conversation socket)
+    speculative_translation_enabled: bool = True
+    speculative_stable_updates: int = 2  # unchanged partials before a prefix counts as stable
+
+    # Fan-out pipeline / listener broadcast
+    fanout_max_parallel: int = 3        # target languages translated + synthesized at once
+    broadcast_queue_size: int = 16      # buffered events per listener before old ones are dropped
 
     # Translate
     translate_provider: str = "local"
     ollama_model: str = "gemma3:4b"
     ollama_url: str = "http://localhost:11434"
+    translate_routing_file: str = ""                  # translation-benchmark.py JSON output
+    translate_routing_quality_tolerance: float = 5.0  # chrF points a faster model may trail the best
+
+    # Keep-alive scheduler (keeps Ollama models loaded during predicted active hours)
+    keepalive_enabled: bool = False
+    keepalive_interval_s: int = 60
+    keepalive_history_days: int = 14
+    keepalive_active_rate: float = 1.0    # expected requests/hour that count as "active"
+    keepalive_idle_grace_s: int = 600     # stay warm this long after the last request
 
     # OpenAI-compatible translation
     openai_compat_url: str = ""
@@ -34,6 +57,15 @@ class Settings(BaseSettings):
     elevenlabs_model: str = "eleven_multilingual_v2"
     elevenlabs_voice_id: str = ""
 
+    # Hedging: start a fallback call when the primary exceeds a latency percentile
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20         # no hedging until this many samples exist
+    hedge_min_delay_ms: int = 250       # floor for the hedge delay
+    hedge_translate_fallback: str = ""  # "deepl", "ollama", "openai" or empty
+    hedge_ollama_url: str = ""          # second Ollama instance for the "ollama" fallback
+    hedge_tts_fallback: str = ""        # "local" (Piper), "chatterbox" or empty
+
     # Gateway
     gateway_enabled: bool = True
     gateway_api_keys: str = ""          # comma-separated, empty = no auth
@@ -46,10 +78,50 @@ class Settings(BaseSettings):
     # Chat History
     history_enabled: bool = True
     audio_storage_path: str = "data/audio"
+    history_queue_size: int = 1000      # pending messages before pipeline requests wait for the writer
+    history_batch_size: int = 100       # messages per INSERT
+    history_flush_interval_ms: int = 500
+    archive_encoder_concurrency: int = 2  # parallel Opus encodes for archived audio
+    archive_queue_size: int = 200
+    cleanup_interval_s: int = 300       # how often expired sessions are deleted
+    cleanup_batch_size: int = 500       # sessions per DELETE ... RETURNING
+    cleanup_batch_pause_ms: int = 200   # pause between batches while a backlog is drained
+    audio_sweep_interval_s: int = 86400  # how often audio packs without a session are removed
+    partition_interval: str = "month"   # "month" or "day"; only used once messages are partitioned
+    partitions_ahead: int = 3           # future partitions kept pre-created
+    partition_drop_enabled: bool = True  # drop past partitions whose sessions have all expired
+    partition_maintenance_interval_s: int = 3600
+    supervisor_leader_retry_s: float = 30.0   # standby processes retry a leader-only task's lock this often
+    supervisor_backoff_max_s: float = 300.0   # longest wait before restarting a crashed background task
+
+    # Translation memory (reuses earlier translations from message history)
+    translation_memory_enabled: bool = False
+    translation_memory_fuzzy_threshold: float = 0.0   # trigram similarity, 0 = exact only
+    translation_memory_require_approved: bool = False
+
+    # Async pipeline jobs (/v1/jobs, needs the database)
+    jobs_enabled: bool = True
+    jobs_concurrency: int = 2           # jobs processed at once per replica
+    jobs_poll_interval_s: float = 2.0
+    jobs_stale_after_s: int = 600       # requeue running jobs without a heartbeat for this long
+    jobs_max_attempts: int = 3
+    jobs_retention_hours: int = 24      # finished jobs and their audio are deleted after this
+    jobs_storage_path: str = "data/jobs"
+    jobs_webhook_allowed_hosts: str = ""  # comma-separated; when set, webhooks may only target these hosts
 
     # Embeddings
     embedding_provider: str = "ollama"
     embedding_model: str = "nomic-embed-text"
     embedding_url: str = "http://localhost:11434"
+    embedding_batch_size: int = 32          # texts per /api/embed call
+    embedding_flush_interval_ms: int = 1000
+
+    # Semantic search (HNSW index on messages.embedding)
+    search_ef_search: int = 40          # HNSW candidate list; higher = better recall, slower
+    search_iterative_scan: str = ""     # "relaxed_order"/"strict_order" keeps filtered searches full (pgvector >= 0.8)
+    search_binary_candidates: int = 0   # >0: Hamming first pass over embedding_bit for this many rows, re-ranked by cosine
+    search_embedding_cache_size: int = 1024  # query vectors kept (LRU), 0 = off
+    search_result_cache_ttl_s: float = 30.0  # repeat/paged searches reuse results this long, 0 = off
+    search_result_window: int = 100     # rows fetched and cached per search for paging
 
     model_config = {"env_file": ".env"}
@@ -0,0 +1,157 @@
+"""Opus archival encoder pool for recorded message audio.
+
+A fixed number of worker tasks drain a bounded queue of encode jobs, so
+no matter how many desks are talking, at most ``concurrency`` encodes run
+at once.  Encoding uses PyAV's in-process libopus when ``av`` is
+installed and falls back to one ``ffmpeg`` subprocess per job otherwise.
+Clips are appended to the session's pack file (``segments.py``) from a
+worker thread, never on the event loop.
+"""
+
+import asyncio
+import io
+import logging
+import subprocess
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from backend.database.segments import append_segment
+
+logger = logging.getLogger(__name__)
+
+OPUS_BITRATE = 16_000
+
+try:
+    import av  # type: ignore[import-not-found]
+except ImportError:  # optional, ffmpeg is used instead
+    av = None
+
+
+def _encode_pyav(audio: bytes, bitrate: int) -> bytes:
+    out = io.BytesIO()
+    with av.open(io.BytesIO(audio)) as src, av.open(out, "w", format="ogg") as dst:
+        stream = dst.add_stream("libopus", rate=48000)
+        stream.bit_rate = bitrate
+        stream.layout = "mono"
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=48000)
+        for frame in src.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                dst.mux(stream.encode(resampled))
+        for resampled in resampler.resample(None):
+            dst.mux(stream.encode(resampled))
+        dst.mux(stream.encode(None))
+    return out.getvalue()
+
+
+async def _encode_ffmpeg(audio: bytes, bitrate: int) -> bytes:
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-i", "pipe:0", "-c:a", "libopus", "-b:a", f"{bitrate // 1000}k",
+        "-f", "opus", "pipe:1",
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    opus_data, _ = await proc.communicate(input=audio)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with {proc.returncode}")
+    return opus_data
+
+
+@dataclass
+class _EncodeJob:
+    audio: bytes
+    session_id: uuid.UUID
+    future: "asyncio.Future[str | None]"
+
+
+class OpusArchiver:
+    def __init__(
+        self,
+        audio_storage_path: str,
+        *,
+        concurrency: int = 2,
+        max_queue: int = 200,
+        bitrate: int = OPUS_BITRATE,
+    ) -> None:
+        self._root = Path(audio_storage_path)
+        self._concurrency = max(concurrency, 1)
+        self._queue: asyncio.Queue[_EncodeJob] = asyncio.Queue(maxsize=max_queue)
+        self._bitrate = bitrate
+        self._workers: list[asyncio.Task] = []
+        self.backend = "pyav" if av is not None else "ffmpeg"
+        self._active = 0
+        self._encoded = 0
+        self._failed = 0
+        self._encode_ms = 0
+        self._bytes_in = 0
+        self._bytes_written = 0
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self._concurrency)]
+
+    async def archive(self, audio: bytes, session_id: uuid.UUID) -> str | None:
+        """Encode ``audio`` to Opus into the session's pack; returns the locator or None on failure."""
+        self.start()
+        future: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+        await self._queue.put(_EncodeJob(audio, session_id, future))
+        return await future
+
+    async def encode(self, audio: bytes) -> bytes:
+        if av is not None:
+            return await asyncio.to_thread(_encode_pyav, audio, self._bitrate)
+        return await _encode_ffmpeg(audio, self._bitrate)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._active += 1
+            try:
+                result = await self._process(job)
+            except Exception as exc:
+                self._failed += 1
+                logger.debug("Opus archiving for session %s failed: %s", job.session_id, exc)
+                result = None
+            finally:
+                self._active -= 1
+                self._queue.task_done()
+            if not job.future.done():  # the caller may have gone away
+                job.future.set_result(result)
+
+    async def _process(self, job: _EncodeJob) -> str | None:
+        start = time.perf_counter()
+        opus_data = await self.encode(job.audio)
+        self._encode_ms += int((time.perf_counter() - start) * 1000)
+        if not opus_data:
+            raise RuntimeError("encoder returned no data")
+        locator = await asyncio.to_thread(append_segment, self._root, job.session_id, opus_data)
+        self._encoded += 1
+        self._bytes_in += len(job.audio)
+        self._bytes_written += len(opus_data)
+        return locator
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let queued encodes finish, then stop the workers."""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Opus archiver stopped with %d encodes pending", self._queue.qsize())
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "concurrency": self._concurrency,
+            "queued": self._queue.qsize(),
+            "active": self._active,
+            "encoded": self._encoded,
+            "failed": self._failed,
+            "avg_encode_ms": round(self._encode_ms / self._encoded) if self._encoded else None,
+            "bytes_in": self._bytes_in,
+            "bytes_written": self._bytes_written,
+        }
@@ -1,8 +1,23 @@
-"""Background task for cleaning up expired sessions and audio files."""
+"""Background task for cleaning up expired sessions and audio files.
+
+Expired sessions are deleted in bounded batches with ``DELETE ... RETURNING``
+(messages go with them via ``ON DELETE CASCADE``), so no batch holds many
+row locks or loads ORM objects.  The returned ids drive the removal of the
+audio packs, which runs in worker threads instead of on the event loop.  A
+short pause between batches keeps a large backlog -- e.g. after a retention
+policy change -- from saturating the database.
+
+``sweep_orphan_audio`` reconciles the audio root against the ``sessions``
+table: entries are checked a thousand ids per query, and packs of sessions
+that no longer exist (deleted while a write was in flight, or removed
+without the API) are deleted.
+"""
 
 import asyncio
 import logging
-import shutil
+import os
+import time
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -10,49 +25,129 @@ from sqlalchemy import delete, select
 
 from backend.database.connection import get_session_factory
 from backend.database.models import Session
+from backend.database.segments import remove_session_audio, session_id_of
 from backend.dependencies import get_settings
 
 logger = logging.getLogger(__name__)
 
+_stats = {"runs": 0, "deleted_sessions": 0, "deleted_audio_dirs": 0, "last_run_ms": None, "last_error": None}
+_sweep_stats = {"runs": 0, "checked": 0, "removed": 0, "last_run_ms": None, "last_error": None}
+
+ORPHAN_GRACE_S = 3600  # leave recently written packs alone
+SWEEP_BATCH = 1000
+
+
+async def delete_expired_batch(batch_size: int) -> list[uuid.UUID]:
+    """Delete up to ``batch_size`` expired sessions; returns their ids."""
+    now = datetime.now(timezone.utc)
+    expired = (
+        select(Session.id)
+        .where(Session.expires_at.isnot(None), Session.expires_at < now)
+        .order_by(Session.expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)  # replicas cleaning concurrently take different rows
+    )
+    async with get_session_factory()() as db:
+        result = await db.execute(delete(Session).where(Session.id.in_(expired)).returning(Session.id))
+        ids = list(result.scalars())
+        await db.commit()
+    return ids
+
 
-async def cleanup_expired_sessions() -> dict:
-    """Delete expired sessions and their audio files. Returns stats."""
+async def cleanup_expired_sessions(max_batches: int | None = None) -> dict:
+    """Delete expired sessions and their audio files batch by batch. Returns stats."""
     s = get_settings()
-    factory = get_session_factory()
+    audio_root = Path(s.audio_storage_path)
     deleted_sessions = 0
     deleted_audio_dirs = 0
+    batches = 0
 
-    async with factory() as db:
-        # Find expired sessions
-        now = datetime.now(timezone.utc)
-        stmt = select(Session).where(Session.expires_at.isnot(None), Session.expires_at < now)
-        result = await db.execute(stmt)
-        expired = result.scalars().all()
+    while max_batches is None or batches < max_batches:
+        ids = await delete_expired_batch(s.cleanup_batch_size)
+        batches += 1
+        if not ids:
+            break
+        deleted_sessions += len(ids)
+        removed = await asyncio.gather(*(asyncio.to_thread(remove_session_audio, audio_root, sid) for sid in ids))
+        deleted_audio_dirs += sum(removed)
+        if len(ids) < s.cleanup_batch_size:
+            break
+        await asyncio.sleep(s.cleanup_batch_pause_ms / 1000)
 
-        for session in expired:
-            # Delete audio directory
-            audio_dir = Path(s.audio_storage_path) / str(session.id)
-            if audio_dir.exists():
-                shutil.rmtree(audio_dir, ignore_errors=True)
-                deleted_audio_dirs += 1
-
-        if expired:
-            # Bulk delete (cascade handles messages)
-            expired_ids = [session.id for session in expired]
-            await db.execute(delete(Session).where(Session.id.in_(expired_ids)))
-            await db.commit()
-            deleted_sessions = len(expired_ids)
-
-    return {"deleted_sessions": deleted_sessions, "deleted_audio_dirs": deleted_audio_dirs}
+    return {"deleted_sessions": deleted_sessions, "deleted_audio_dirs": deleted_audio_dirs, "batches": batches}
 
 
 async def cleanup_loop() -> None:
-    """Run cleanup every hour."""
+    """Run cleanup every ``cleanup_interval_s`` seconds."""
     while True:
+        start = time.perf_counter()
         try:
             stats = await cleanup_expired_sessions()
+            _stats["deleted_sessions"] += stats["deleted_sessions"]
+            _stats["deleted_audio_dirs"] += stats["deleted_audio_dirs"]
+            _stats["last_error"] = None
             if stats["deleted_sessions"] > 0:
-                logger.info("Cleanup: deleted %d sessions, %d audio dirs", stats["deleted_sessions"], stats["deleted_audio_dirs"])
+                logger.info(
+                    "Cleanup: deleted %d sessions, %d audio dirs in %d batches",
+                    stats["deleted_sessions"], stats["deleted_audio_dirs"], stats["batches"],
+                )
         except Exception as exc:
+            _stats["last_error"] = str(exc)
             logger.warning("Cleanup failed: %s", exc)
-        await asyncio.sleep(3600)  # 1 hour
+        _stats["runs"] += 1
+        _stats["last_run_ms"] = int((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(get_settings().cleanup_interval_s)
+
+
+def cleanup_stats() -> dict:
+    return dict(_stats)
+
+
+def _scan_audio_root(root: Path, older_than: float) -> list[uuid.UUID]:
+    if not root.is_dir():
+        return []
+    found = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            sid = session_id_of(entry.name)
+            if sid is not None and entry.stat(follow_symlinks=False).st_mtime < older_than:
+                found.append(sid)
+    return found
+
+
+async def sweep_orphan_audio() -> dict:
+    """Delete audio packs (and legacy directories) whose session no longer exists."""
+    root = Path(get_settings().audio_storage_path)
+    candidates = await asyncio.to_thread(_scan_audio_root, root, time.time() - ORPHAN_GRACE_S)
+    removed = 0
+    for start in range(0, len(candidates), SWEEP_BATCH):
+        batch = candidates[start:start + SWEEP_BATCH]
+        async with get_session_factory()() as db:
+            existing = set((await db.execute(select(Session.id).where(Session.id.in_(batch)))).scalars())
+        orphans = [sid for sid in batch if sid not in existing]
+        results = await asyncio.gather(*(asyncio.to_thread(remove_session_audio, root, sid) for sid in orphans))
+        removed += sum(results)
+    return {"checked": len(candidates), "removed": removed}
+
+
+async def audio_sweep_loop() -> None:
+    """Run the orphan sweep every ``audio_sweep_interval_s`` seconds."""
+    while True:
+        start = time.perf_counter()
+        try:
+            stats = await sweep_orphan_audio()
+            _sweep_stats["checked"] += stats["checked"]
+            _sweep_stats["removed"] += stats["removed"]
+            _sweep_stats["last_error"] = None
+            if stats["removed"]:
+                logger.info("Audio sweep: removed %d orphaned packs", stats["removed"])
+        except Exception as exc:
+            _sweep_stats["last_error"] = str(exc)
+            logger.warning("Audio sweep failed: %s", exc)
+        _sweep_stats["runs"] += 1
+        _sweep_stats["last_run_ms"] = int((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(get_settings().audio_sweep_interval_s)
+
+
+def audio_sweep_stats() -> dict:
+    return dict(_sweep_stats)
@@ -0,0 +1,69 @@
+"""Batched data migrations that commit as they go.
+
+``env.py`` runs all pending migrations in one transaction, so a loop of
+UPDATEs inside ``upgrade()`` would still hold every lock and dead tuple
+until the end.  ``in_batches`` leaves that transaction: it commits what the
+migration did so far (e.g. an ADD COLUMN), runs the batches in autocommit
+mode -- every statement commits on its own -- and opens a new transaction
+for the rest of the migration.
+
+Rows written by the running application while the batches run may be
+missed; migrations that need every row follow up with a catch-up pass
+(``commit=False``) that runs in the migration's transaction again.
+"""
+
+from collections.abc import Callable, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.engine import Connection, Row
+
+
+def _batches(
+    conn: Connection, table: str, columns: str, where: str | None, batch_size: int,
+    apply: Callable[[Connection, Sequence[Row]], None],
+) -> None:
+    last_id = None
+    while True:
+        conditions = [where] if where else []
+        params: dict[str, object] = {"limit": batch_size}
+        if last_id is not None:
+            conditions.append("id > :last_id")
+            params["last_id"] = last_id
+        query = f"SELECT {columns} FROM {table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+        rows = conn.execute(sa.text(query + " ORDER BY id LIMIT :limit"), params).all()
+        if not rows:
+            return
+        apply(conn, rows)
+        last_id = rows[-1][0]
+
+
+def in_batches(
+    table: str,
+    apply: Callable[[Connection, Sequence[Row]], None],
+    *,
+    columns: str = "id",
+    where: str | None = None,
+    batch_size: int = 5000,
+    commit: bool = True,
+) -> None:
+    """Call ``apply(conn, rows)`` for id-ordered batches of ``table``.
+
+    ``columns`` must start with ``id``.  With ``commit=True`` each batch is
+    committed on its own (see the module docstring); ``commit=False`` keeps
+    the batches in the migration's transaction.
+    """
+    if not commit:
+        _batches(op.get_bind(), table, columns, where, batch_size, apply)
+        return
+    with op.get_context().autocommit_block():
+        _batches(op.get_bind(), table, columns, where, batch_size, apply)
+
+
+def update_ids(statement: str) -> Callable[[Connection, Sequence[Row]], None]:
+    """``apply`` callback running ``statement`` with the batch's ids bound to ``:ids``."""
+    def apply(conn: Connection, rows: Sequence[Row]) -> None:
+        conn.execute(sa.text(statement), {"ids": [row[0] for row in rows]})
+    return apply
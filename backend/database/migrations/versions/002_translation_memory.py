@@ -0,0 +1,59 @@
+"""translation memory columns and indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.database.migrations.batching import in_batches
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def source_hash(text: str) -> str:
+    """Copy of backend.translation_memory.source_hash as of this revision."""
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _store_hashes(conn, rows) -> None:
+    conn.execute(
+        sa.text("UPDATE messages SET source_hash = :h WHERE id = :id"),
+        [{"id": row[0], "h": source_hash(row[1])} for row in rows],
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column("messages", sa.Column("source_hash", sa.String(64), nullable=True))
+    op.add_column("messages", sa.Column("approved", sa.Boolean(), nullable=False, server_default=sa.text("false")))
+
+    # Hashed in Python: NFKC + casefold has no exact SQL equivalent
+    in_batches("messages", _store_hashes, columns="id, original_text", where="source_hash IS NULL")
+    # Messages written meanwhile
+    in_batches("messages", _store_hashes, columns="id, original_text", where="source_hash IS NULL", commit=False)
+
+    op.create_index("idx_messages_tm", "messages", ["original_lang", "translated_lang", "source_hash"])
+    op.create_index(
+        "idx_messages_original_trgm", "messages", ["original_text"],
+        postgresql_using="gin", postgresql_ops={"original_text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_messages_original_trgm", table_name="messages")
+    op.drop_index("idx_messages_tm", table_name="messages")
+    op.drop_column("messages", "approved")
+    op.drop_column("messages", "source_hash")
@@ -0,0 +1,25 @@
+"""partial index for the embedding backfill
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_messages_embedding_missing", "messages", ["id"],
+        postgresql_where=sa.text("embedding IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_messages_embedding_missing", table_name="messages")
@@ -0,0 +1,29 @@
+"""generated tsvector column and GIN index for keyword search
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 'simple' config: no stemming, messages mix languages
+    op.add_column("messages", sa.Column(
+        "search_tsv", postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', original_text || ' ' || translated_text)", persisted=True),
+    ))
+    op.create_index("idx_messages_search_tsv", "messages", ["search_tsv"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("idx_messages_search_tsv", table_name="messages")
+    op.drop_column("messages", "search_tsv")
@@ -0,0 +1,88 @@
+"""half-precision embeddings plus a binary-quantized column
+
+Converts messages.embedding from vector(768) to halfvec(768), halving its
+storage, and adds embedding_bit (binary_quantize of the embedding) for a
+Hamming-distance first pass.  Rows are converted in batches that commit on
+their own (``migrations/batching.py``), so the server keeps running; a short
+catch-up pass under a table lock converts rows embedded meanwhile before the
+columns are swapped.  The HNSW indexes are then built CONCURRENTLY -- vector
+searches fall back to sequential scans until they are ready.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import BIT, HALFVEC
+
+from backend.database.migrations.batching import in_batches, update_ids
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIM = 768
+TO_HALF = (
+    f"UPDATE messages SET embedding_half = embedding::halfvec({DIM}), "
+    f"embedding_bit = binary_quantize(embedding)::bit({DIM}) WHERE id = ANY(:ids)"
+)
+TO_FULL = f"UPDATE messages SET embedding_full = embedding::vector({DIM}) WHERE id = ANY(:ids)"
+
+
+def upgrade() -> None:
+    op.add_column("messages", sa.Column("embedding_half", HALFVEC(DIM), nullable=True))
+    op.add_column("messages", sa.Column("embedding_bit", BIT(DIM), nullable=True))
+    pending = "embedding IS NOT NULL AND embedding_half IS NULL"
+    in_batches("messages", update_ids(TO_HALF), where=pending)
+    # Rows embedded while the batches ran; the lock keeps new ones out until the swap
+    op.execute("LOCK TABLE messages IN SHARE ROW EXCLUSIVE MODE")
+    in_batches("messages", update_ids(TO_HALF), where=pending, commit=False)
+    # Dropping the column drops its HNSW and backfill indexes as well
+    op.drop_column("messages", "embedding")
+    op.alter_column("messages", "embedding_half", new_column_name="embedding")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_messages_embedding_missing", "messages", ["id"],
+            postgresql_where=sa.text("embedding IS NULL"), postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_messages_embedding_hnsw", "messages", ["embedding"],
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_messages_embedding_bit", "messages", ["embedding_bit"],
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding_bit": "bit_hamming_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    from pgvector.sqlalchemy import Vector
+
+    op.add_column("messages", sa.Column("embedding_full", Vector(DIM), nullable=True))
+    pending = "embedding IS NOT NULL AND embedding_full IS NULL"
+    in_batches("messages", update_ids(TO_FULL), where=pending)
+    op.execute("LOCK TABLE messages IN SHARE ROW EXCLUSIVE MODE")
+    in_batches("messages", update_ids(TO_FULL), where=pending, commit=False)
+    op.drop_index("idx_messages_embedding_bit", table_name="messages")
+    op.drop_column("messages", "embedding_bit")
+    op.drop_column("messages", "embedding")
+    op.alter_column("messages", "embedding_full", new_column_name="embedding")
+    op.create_index(
+        "idx_messages_embedding_missing", "messages", ["id"],
+        postgresql_where=sa.text("embedding IS NULL"),
+    )
+    op.create_index(
+        "idx_messages_embedding_hnsw", "messages", ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
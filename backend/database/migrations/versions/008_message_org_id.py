@@ -0,0 +1,37 @@
+"""denormalized org_id on messages
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.database.migrations.batching import in_batches, update_ids
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COPY_ORG = (
+    "UPDATE messages m SET org_id = s.org_id FROM sessions s "
+    "WHERE s.id = m.session_id AND s.org_id IS NOT NULL AND m.org_id IS NULL"
+)
+
+
+def upgrade() -> None:
+    op.add_column("messages", sa.Column("org_id", sa.UUID(), nullable=True))
+
+    # Copy sessions.org_id batch by batch, each batch committed on its own
+    in_batches("messages", update_ids(COPY_ORG + " AND m.id = ANY(:ids)"))
+    # Messages written meanwhile
+    op.execute(COPY_ORG)
+
+    op.create_index("idx_messages_org_langs", "messages", ["org_id", "original_lang", "translated_lang"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_messages_org_langs", table_name="messages")
+    op.drop_column("messages", "org_id")
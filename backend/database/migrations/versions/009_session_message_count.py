@@ -0,0 +1,43 @@
+"""sessions.message_count and an index for keyset pagination
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.database.migrations.batching import in_batches, update_ids
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("message_count", sa.Integer(), nullable=False, server_default=sa.text("0")))
+
+    # Count per batch of sessions, each batch committed on its own
+    started = op.get_bind().execute(sa.text("SELECT clock_timestamp()")).scalar()
+    in_batches("sessions", update_ids(
+        "UPDATE sessions s SET message_count = c.n FROM ("
+        "  SELECT session_id, count(*) AS n FROM messages WHERE session_id = ANY(:ids) GROUP BY session_id"
+        ") c WHERE s.id = c.session_id"
+    ), batch_size=1000)
+    # Recount sessions that received messages meanwhile
+    op.get_bind().execute(
+        sa.text(
+            "UPDATE sessions s SET message_count = (SELECT count(*) FROM messages m WHERE m.session_id = s.id) "
+            "WHERE s.updated_at >= :started"
+        ),
+        {"started": started},
+    )
+
+    op.create_index("idx_sessions_updated", "sessions", [sa.text("updated_at DESC"), "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_sessions_updated", table_name="sessions")
+    op.drop_column("sessions", "message_count")
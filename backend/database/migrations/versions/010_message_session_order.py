@@ -0,0 +1,25 @@
+"""composite (session_id, created_at, id) index for message pagination
+
+Replaces idx_messages_session, which is a prefix of the new index.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_messages_session_created", "messages", ["session_id", "created_at", "id"])
+    op.drop_index("idx_messages_session", table_name="messages")
+
+
+def downgrade() -> None:
+    op.create_index("idx_messages_session", "messages", ["session_id"])
+    op.drop_index("idx_messages_session_created", table_name="messages")
@@ -0,0 +1,32 @@
+"""profile_id on messages, part of the translation memory key
+
+The profile's system prompt shapes a translation, so translation memory
+only reuses messages produced under the same profile.  Existing rows keep
+profile_id NULL: which profile (if any) a request used was never stored,
+and guessing it from the session could serve a generic translation to a
+profile request.  They stay available to requests without a profile.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("messages", sa.Column("profile_id", sa.String(50), nullable=True))
+    op.drop_index("idx_messages_tm", table_name="messages")
+    op.create_index("idx_messages_tm", "messages", ["original_lang", "translated_lang", "profile_id", "source_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_messages_tm", table_name="messages")
+    op.create_index("idx_messages_tm", "messages", ["original_lang", "translated_lang", "source_hash"])
+    op.drop_column("messages", "profile_id")
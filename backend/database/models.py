@@ -3,9 +3,9 @@
 import uuid
 from datetime import datetime, timezone
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from pgvector.sqlalchemy import BIT, HALFVEC
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -40,6 +40,7 @@ class Session(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))  # kept by the history writer
 
     organization: Mapped[Organization | None] = relationship(back_populates="sessions")
     messages: Mapped[list["Message"]] = relationship(back_populates="session", cascade="all, delete-orphan")
@@ -47,6 +48,7 @@ class Session(Base):
     __table_args__ = (
         Index("idx_sessions_org", "org_id"),
         Index("idx_sessions_expires", "expires_at"),
+        Index("idx_sessions_updated", text("updated_at DESC"), "id"),
     )
 
 
@@ -55,22 +57,73 @@ class Message(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    org_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)  # copy of sessions.org_id
     direction: Mapped[str] = mapped_column(String(10), nullable=False)  # 'source' or 'target'
     original_text: Mapped[str] = mapped_column(Text, nullable=False)
     translated_text: Mapped[str] = mapped_column(Text, nullable=False)
     original_lang: Mapped[str] = mapped_column(String(10), nullable=False)
     translated_lang: Mapped[str] = mapped_column(String(10), nullable=False)
     audio_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
-    embedding = mapped_column(Vector(768), nullable=True)
+    embedding = mapped_column(HALFVEC(768), nullable=True, deferred=True)  # never loaded with message lists
+    embedding_bit = mapped_column(BIT(768), nullable=True, deferred=True)  # binary_quantize(embedding), first-pass search
+    search_tsv = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', original_text || ' ' || translated_text)", persisted=True),
+        deferred=True,
+    )  # keyword/hybrid search
     stt_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     translate_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     tts_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     model_used: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    source_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)  # translation memory key
+    profile_id: Mapped[str | None] = mapped_column(String(50), nullable=True)  # profile whose prompt produced translated_text
+    approved: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=text("false"))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
 
     session: Mapped[Session] = relationship(back_populates="messages")
 
     __table_args__ = (
-        Index("idx_messages_session", "session_id"),
+        Index("idx_messages_session_created", "session_id", "created_at", "id"),
         Index("idx_messages_created", "created_at"),
+        Index("idx_messages_tm", "original_lang", "translated_lang", "profile_id", "source_hash"),
+        Index("idx_messages_org_langs", "org_id", "original_lang", "translated_lang"),
+        Index(
+            "idx_messages_original_trgm", "original_text",
+            postgresql_using="gin", postgresql_ops={"original_text": "gin_trgm_ops"},
+        ),
+        # Keyset scan for the embedding backfill
+        Index("idx_messages_embedding_missing", "id", postgresql_where=text("embedding IS NULL")),
+        Index("idx_messages_search_tsv", "search_tsv", postgresql_using="gin"),
+        Index(
+            "idx_messages_embedding_hnsw", "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+        ),
+        Index(
+            "idx_messages_embedding_bit", "embedding_bit",
+            postgresql_using="hnsw", postgresql_ops={"embedding_bit": "bit_hamming_ops"},
+        ),
+    )
+
+
+class PipelineJob(Base):
+    __tablename__ = "pipeline_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")  # queued, running, done, failed
+    stage: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")  # queued, stt, translate, tts, done
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    audio_path: Mapped[str | None] = mapped_column(String(500), nullable=True)  # uploaded audio, removed when finished
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    webhook_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    client: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("idx_pipeline_jobs_queue", "status", "created_at"),
     )
@@ -0,0 +1,168 @@
+"""Maintenance of the optional time-partitioned ``messages`` layout.
+
+``tools/partition_messages.py migrate`` converts ``messages`` into a table
+range-partitioned by ``created_at`` (one partition per month or day).  On
+such a database the maintenance loop
+
+* pre-creates the partitions for the next ``partitions_ahead`` intervals,
+  so inserts never hit a missing range, and
+* drops past partitions in which every message belongs to an expired
+  session -- detaching a partition is O(1), unlike deleting its rows one by
+  one through the ``sessions`` cascade.
+
+Sessions are still expired by ``cleanup.py``; when their messages already
+went with a dropped partition, that delete is cheap.  Partitions holding
+messages of a session with longer retention (e.g. medical next to hotel
+sessions) are kept until that session expires too.  On an unpartitioned
+database the loop does nothing.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from backend.database.connection import get_engine
+from backend.dependencies import get_settings
+
+logger = logging.getLogger(__name__)
+
+TABLE = "messages"
+_NAME = re.compile(r"^messages_p(\d{4})_(\d{2})(?:_(\d{2}))?$")
+
+_stats: dict = {"runs": 0, "created": 0, "dropped": 0, "partitions": None, "last_error": None}
+
+
+def interval_start(ts: datetime, interval: str) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    if interval == "day":
+        return datetime(ts.year, ts.month, ts.day, tzinfo=timezone.utc)
+    if interval == "month":
+        return datetime(ts.year, ts.month, 1, tzinfo=timezone.utc)
+    raise ValueError(f"Unknown partition interval {interval!r}")
+
+
+def next_start(start: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    return datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(start: datetime, interval: str) -> str:
+    if interval == "day":
+        return f"{TABLE}_p{start:%Y_%m_%d}"
+    return f"{TABLE}_p{start:%Y_%m}"
+
+
+def parse_partition(name: str) -> tuple[datetime, datetime] | None:
+    """Bounds of a partition created by this module, from its name."""
+    match = _NAME.match(name)
+    if not match:
+        return None
+    year, month, day = match.groups()
+    if day:
+        start = datetime(int(year), int(month), int(day), tzinfo=timezone.utc)
+        return start, next_start(start, "day")
+    start = datetime(int(year), int(month), 1, tzinfo=timezone.utc)
+    return start, next_start(start, "month")
+
+
+def create_partition_sql(start: datetime, interval: str, parent: str = TABLE) -> str:
+    end = next_start(start, interval)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start, interval)} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+async def is_partitioned() -> bool:
+    async with get_engine().connect() as conn:
+        return bool((await conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t)"
+        ), {"t": TABLE})).scalar())
+
+
+async def list_partitions() -> list[str]:
+    async with get_engine().connect() as conn:
+        rows = await conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:t) ORDER BY c.relname"
+        ), {"t": TABLE})
+        return [row[0] for row in rows]
+
+
+async def ensure_partitions(interval: str, ahead: int, now: datetime | None = None) -> list[str]:
+    """Create the current and the next ``ahead`` partitions; returns the new ones."""
+    existing = set(await list_partitions())
+    start = interval_start(now or datetime.now(timezone.utc), interval)
+    created = []
+    async with get_engine().begin() as conn:
+        for _ in range(ahead + 1):
+            name = partition_name(start, interval)
+            if name not in existing:
+                await conn.execute(text(create_partition_sql(start, interval)))
+                created.append(name)
+            start = next_start(start, interval)
+    return created
+
+
+async def is_droppable(name: str) -> bool:
+    """True when no message in the partition belongs to a session that is still retained."""
+    async with get_engine().connect() as conn:
+        retained = (await conn.execute(text(
+            f"SELECT 1 FROM {name} m JOIN sessions s ON s.id = m.session_id "
+            "WHERE s.expires_at IS NULL OR s.expires_at >= now() LIMIT 1"
+        ))).scalar()
+    return not retained
+
+
+async def drop_partition(name: str) -> None:
+    # DETACH ... CONCURRENTLY only blocks writers briefly, but cannot run in a transaction
+    engine = get_engine().execution_options(isolation_level="AUTOCOMMIT")
+    async with engine.connect() as conn:
+        await conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name} CONCURRENTLY"))
+        await conn.execute(text(f"DROP TABLE {name}"))
+
+
+async def maintain_partitions(interval: str, ahead: int, drop: bool = True, now: datetime | None = None) -> dict:
+    if not await is_partitioned():
+        return {"partitioned": False}
+    now = now or datetime.now(timezone.utc)
+    created = await ensure_partitions(interval, ahead, now)
+    dropped = []
+    if drop:
+        for name in await list_partitions():
+            bounds = parse_partition(name)
+            # Only whole past intervals; the current one still receives inserts
+            if bounds is None or bounds[1] > now:
+                continue
+            if await is_droppable(name):
+                await drop_partition(name)
+                dropped.append(name)
+    return {"partitioned": True, "created": created, "dropped": dropped}
+
+
+async def partition_loop() -> None:
+    """Run partition maintenance every ``partition_maintenance_interval_s`` seconds."""
+    while True:
+        s = get_settings()
+        try:
+            result = await maintain_partitions(s.partition_interval, s.partitions_ahead, s.partition_drop_enabled)
+            _stats["runs"] += 1
+            _stats["last_error"] = None
+            if result["partitioned"]:
+                _stats["created"] += len(result["created"])
+                _stats["dropped"] += len(result["dropped"])
+                _stats["partitions"] = len(await list_partitions())
+                if result["created"] or result["dropped"]:
+                    logger.info("Partitions: created %s, dropped %s", result["created"], result["dropped"])
+        except Exception as exc:
+            _stats["last_error"] = str(exc)
+            logger.warning("Partition maintenance failed: %s", exc)
+        await asyncio.sleep(s.partition_maintenance_interval_s)
+
+
+def partition_stats() -> dict:
+    return dict(_stats)
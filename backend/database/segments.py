@@ -0,0 +1,94 @@
+"""Packed per-session audio storage.
+
+All archived audio of a session lives in one append-only file,
+``<audio_storage_path>/<session_id>.ogg``.  Every message's clip is a
+complete Ogg Opus stream appended to it, so the pack as a whole is a valid
+chained Ogg stream.  ``messages.audio_path`` holds a locator
+``<session_id>.ogg@<offset>:<length>`` and a clip is served with a single
+positioned read; deleting a session's audio is a single unlink.
+
+Appends take an exclusive ``flock`` on the pack, so several workers writing
+to the same session never interleave.  Older ``<session_id>/<message_id>.opus``
+files are still read and removed, they are just no longer written.
+"""
+
+import fcntl
+import os
+import re
+import shutil
+import uuid
+from pathlib import Path
+
+PACK_SUFFIX = ".ogg"
+_LOCATOR = re.compile(r"^(?P<file>[0-9a-f-]{36}\.ogg)@(?P<offset>\d+):(?P<length>\d+)$")
+
+
+def pack_path(root: Path, session_id: uuid.UUID | str) -> Path:
+    return root / f"{session_id}{PACK_SUFFIX}"
+
+
+def parse_locator(audio_path: str) -> tuple[str, int, int] | None:
+    """``(file, offset, length)`` for a packed locator, None for a legacy path."""
+    match = _LOCATOR.match(audio_path)
+    if not match:
+        return None
+    return match["file"], int(match["offset"]), int(match["length"])
+
+
+def append_segment(root: Path, session_id: uuid.UUID | str, data: bytes) -> str:
+    """Append a clip to the session's pack (blocking); returns its locator."""
+    root.mkdir(parents=True, exist_ok=True)
+    path = pack_path(root, session_id)
+    with open(path, "ab") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(data)
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+    return f"{path.name}@{offset}:{len(data)}"
+
+
+def read_segment(root: Path, audio_path: str) -> bytes | None:
+    """Read one clip (blocking); None when the file or range is gone."""
+    located = parse_locator(audio_path)
+    if located is None:
+        legacy = root / audio_path
+        return legacy.read_bytes() if legacy.is_file() else None
+    name, offset, length = located
+    try:
+        fd = os.open(root / name, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        data = os.pread(fd, length, offset)
+    finally:
+        os.close(fd)
+    return data if len(data) == length else None
+
+
+def remove_session_audio(root: Path, session_id: uuid.UUID | str) -> bool:
+    """Delete a session's pack and any legacy per-message directory (blocking)."""
+    removed = False
+    try:
+        pack_path(root, session_id).unlink()
+        removed = True
+    except FileNotFoundError:
+        pass
+    legacy_dir = root / str(session_id)
+    if legacy_dir.is_dir():
+        shutil.rmtree(legacy_dir, ignore_errors=True)
+        removed = True
+    return removed
+
+
+def session_id_of(name: str) -> uuid.UUID | None:
+    """Session id of an entry in the audio root (pack file or legacy directory)."""
+    stem = name[: -len(PACK_SUFFIX)] if name.endswith(PACK_SUFFIX) else name
+    if len(stem) != 36:
+        return None
+    try:
+        return uuid.UUID(stem)
+    except ValueError:
+        return None
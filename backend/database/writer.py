@@ -0,0 +1,283 @@
+"""Batched background writer for chat history.
+
+Pipeline endpoints hand finished turns to ``HistoryWriter.submit``.  A
+single background task drains the bounded queue, inserts the messages
+of a batch in one multi-row INSERT and bumps ``sessions.updated_at`` and
+``sessions.message_count`` once per session; embeddings are queued on
+``backend.embeddings.EmbeddingQueue``.  Audio goes to the Opus archiver
+pool (``backend.database.archive``) only after the INSERT, and each
+message's ``audio_path`` is set once its encode finishes, so encoder
+latency never holds up the history itself.  When the queue is full,
+``submit`` waits -- a slow database pushes back on the producers instead of
+piling up unbounded tasks.  ``stop`` flushes what is queued (lifespan
+shutdown).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from backend.database.archive import OpusArchiver
+
+logger = logging.getLogger(__name__)
+
+WRITE_ATTEMPTS = 3
+
+
+@dataclass
+class PendingMessage:
+    session_id: uuid.UUID
+    direction: str
+    original_text: str
+    translated_text: str
+    original_lang: str
+    translated_lang: str
+    audio_data: bytes | None = None
+    audio_enabled: bool = False
+    stt_ms: int | None = None
+    translate_ms: int | None = None
+    tts_ms: int | None = None
+    model_used: str | None = None
+    profile_id: str | None = None
+    session_audio_enabled: bool | None = None  # known by callers holding the session row
+    session_org_id: uuid.UUID | None = None    # only meaningful when session_audio_enabled is set
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class HistoryWriter:
+    def __init__(
+        self,
+        audio_storage_path: str,
+        *,
+        max_queue: int = 1000,
+        batch_size: int = 100,
+        flush_interval_s: float = 0.5,
+        archiver: OpusArchiver | None = None,
+        max_pending_audio: int = 500,
+    ) -> None:
+        self.archiver = archiver or OpusArchiver(audio_storage_path)
+        self._audio_tasks: set[asyncio.Task] = set()
+        self._max_pending_audio = max_pending_audio
+        self._audio_dropped = 0
+        self._queue: asyncio.Queue[PendingMessage] = asyncio.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_s
+        self._task: asyncio.Task | None = None
+        self._written = 0
+        self._dropped = 0
+        self._batches = 0
+        self._last_batch_ms: int | None = None
+
+    async def submit(self, item: PendingMessage) -> None:
+        """Queue a message; waits while the queue is full."""
+        await self._queue.put(item)
+
+    def start(self) -> None:
+        if self._task is None:
+            self.archiver.start()
+            self._task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval_s
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write_with_retry(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_with_retry(self, batch: list[PendingMessage]) -> None:
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                await self.write_batch(batch)
+                return
+            except IntegrityError as exc:
+                # A bad row (e.g. its session was deleted meanwhile) fails the whole INSERT;
+                # write the rows one by one so only the offending ones are lost
+                if len(batch) > 1:
+                    logger.info("History batch rejected (%s), writing %d messages one by one", exc.orig, len(batch))
+                    for item in batch:
+                        await self._write_with_retry([item])
+                    return
+                logger.warning("Dropping history message %s: %s", batch[0].id, exc.orig)
+                self._dropped += 1
+                return
+            except Exception as exc:
+                if attempt + 1 == WRITE_ATTEMPTS:
+                    logger.warning("Dropping %d history messages after %d attempts: %s", len(batch), WRITE_ATTEMPTS, exc)
+                    self._dropped += len(batch)
+                    return
+                logger.info("History write failed (%s), retrying", exc)
+                await asyncio.sleep(2 ** attempt)
+
+    async def write_batch(self, batch: list[PendingMessage]) -> None:
+        from backend.database.connection import get_session_factory
+        from backend.database.models import Message, Session
+        from backend.translation_memory import source_hash
+
+        start = time.perf_counter()
+        async with get_session_factory()() as db:
+            unknown = {item.session_id for item in batch if item.session_audio_enabled is None}
+            audio_enabled: dict[uuid.UUID, bool] = {}
+            org_ids: dict[uuid.UUID, uuid.UUID | None] = {}
+            for item in batch:
+                if item.session_audio_enabled is not None:
+                    audio_enabled[item.session_id] = item.session_audio_enabled
+                    org_ids[item.session_id] = item.session_org_id
+            if unknown:
+                rows = await db.execute(
+                    select(Session.id, Session.audio_enabled, Session.org_id).where(Session.id.in_(unknown))
+                )
+                for sid, enabled, org_id in rows.all():
+                    audio_enabled[sid] = enabled
+                    org_ids[sid] = org_id
+            missing = {item.session_id for item in batch} - audio_enabled.keys()
+            if missing:
+                logger.warning("Sessions %s not found, skipping their messages", ", ".join(map(str, missing)))
+                self._dropped += sum(1 for item in batch if item.session_id in missing)
+            items = [item for item in batch if item.session_id not in missing]
+            if not items:
+                return
+
+            await db.execute(insert(Message), [
+                {
+                    "id": item.id,
+                    "session_id": item.session_id,
+                    "org_id": org_ids[item.session_id],  # denormalized for join-free filtering
+                    "direction": item.direction,
+                    "original_text": item.original_text,
+                    "translated_text": item.translated_text,
+                    "original_lang": item.original_lang,
+                    "translated_lang": item.translated_lang,
+                    "audio_path": None,  # set by _archive_audio once encoded
+                    "stt_ms": item.stt_ms,
+                    "translate_ms": item.translate_ms,
+                    "tts_ms": item.tts_ms,
+                    "model_used": item.model_used,
+                    "source_hash": source_hash(item.original_text),
+                    "profile_id": item.profile_id,
+                    "created_at": item.created_at,
+                }
+                for item in items
+            ])
+            # One timestamp + counter bump per session, in the same transaction as the INSERT
+            touched: dict[uuid.UUID, datetime] = {}
+            counts: dict[uuid.UUID, int] = {}
+            for item in items:
+                touched[item.session_id] = max(item.created_at, touched.get(item.session_id, item.created_at))
+                counts[item.session_id] = counts.get(item.session_id, 0) + 1
+            sessions = Session.__table__
+            await db.execute(
+                update(sessions)
+                .where(sessions.c.id == bindparam("sid"))
+                .values(updated_at=bindparam("ts"), message_count=sessions.c.message_count + bindparam("n")),
+                [{"sid": sid, "ts": ts, "n": counts[sid]} for sid, ts in touched.items()],
+            )
+            await db.commit()
+
+        self._written += len(items)
+        self._batches += 1
+        self._last_batch_ms = int((time.perf_counter() - start) * 1000)
+        logger.debug("History batch: %d messages, %d sessions in %dms", len(items), len(touched), self._last_batch_ms)
+
+        for item in items:
+            if item.audio_enabled and item.audio_data and audio_enabled[item.session_id]:
+                self._schedule_audio(item)
+
+        from backend.embeddings import get_embedding_queue, message_text
+        embedding_queue = get_embedding_queue()
+        if embedding_queue:
+            for item in items:
+                embedding_queue.submit(item.id, message_text(item.original_text, item.translated_text))
+
+    def _schedule_audio(self, item: PendingMessage) -> None:
+        if len(self._audio_tasks) >= self._max_pending_audio:
+            # The message is saved; only its recording is skipped while the encoders are saturated
+            self._audio_dropped += 1
+            logger.warning("Audio archive backlog full, not archiving audio of message %s", item.id)
+            return
+        task = asyncio.create_task(self._archive_audio(item))
+        self._audio_tasks.add(task)
+        task.add_done_callback(self._audio_tasks.discard)
+
+    async def _archive_audio(self, item: PendingMessage) -> None:
+        from backend.database.connection import get_session_factory
+        from backend.database.models import Message
+
+        assert item.audio_data is not None
+        audio_path = await self.archiver.archive(item.audio_data, item.session_id)
+        item.audio_data = None
+        if audio_path is None:
+            return
+        try:
+            async with get_session_factory()() as db:
+                await db.execute(update(Message).where(Message.id == item.id).values(audio_path=audio_path))
+                await db.commit()
+        except Exception as exc:
+            logger.warning("Could not record audio of message %s: %s", item.id, exc)
+
+    async def flush(self) -> None:
+        await self._queue.join()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush queued messages, then stop the writer task."""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("History writer stopped with %d messages unsaved", self._queue.qsize())
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._audio_tasks:
+            _, pending = await asyncio.wait(set(self._audio_tasks), timeout=timeout)
+            if pending:
+                logger.warning("History writer stopped with %d audio clips unarchived", len(pending))
+                for task in pending:
+                    task.cancel()
+        await self.archiver.stop(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "written": self._written,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "avg_batch": round(self._written / self._batches, 1) if self._batches else None,
+            "last_batch_ms": self._last_batch_ms,
+            "audio_pending": len(self._audio_tasks),
+            "audio_dropped": self._audio_dropped,
+        }
+
+
+_writer: HistoryWriter | None = None
+
+
+def init_history_writer(writer: HistoryWriter | None) -> None:
+    global _writer
+    _writer = writer
+
+
+def get_history_writer() -> HistoryWriter | None:
+    return _writer
@@ -0,0 +1,203 @@
+"""Batched embedding generation for chat messages.
+
+``EmbeddingQueue`` collects freshly saved messages, embeds up to
+``batch_size`` texts per provider call (``EmbeddingProvider.embed_batch``)
+and writes the vectors back with one bulk UPDATE per batch.  ``backfill``
+walks messages that still have no embedding with a keyset cursor; it is
+what ``tools/backfill_embeddings.py`` runs, and it also picks up anything
+the queue dropped.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from pgvector.sqlalchemy import BIT, HALFVEC
+from sqlalchemy import bindparam, cast, func, select, update
+
+from backend.providers.base import EmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+
+def message_text(original_text: str, translated_text: str) -> str:
+    """Both sides of a turn are embedded together for better semantic search."""
+    return f"{original_text} {translated_text}"
+
+
+async def store_embeddings(ids: list[uuid.UUID], vectors: list[list[float]]) -> None:
+    """Bulk-write vectors; the binary-quantized copy is derived in the same UPDATE."""
+    from backend.database.connection import get_session_factory
+    from backend.database.models import Message
+
+    table = Message.__table__
+    vector = bindparam("vector", type_=HALFVEC(768))
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("message_id"))
+        .values(embedding=vector, embedding_bit=cast(func.binary_quantize(vector), BIT(768)))
+    )
+    async with get_session_factory()() as db:
+        await db.execute(stmt, [
+            {"message_id": message_id, "vector": vector} for message_id, vector in zip(ids, vectors)
+        ])
+        await db.commit()
+
+
+class EmbeddingQueue:
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        *,
+        batch_size: int = 32,
+        flush_interval_s: float = 1.0,
+        max_queue: int = 5000,
+    ) -> None:
+        self._provider = provider
+        self._queue: asyncio.Queue[tuple[uuid.UUID, str]] = asyncio.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_s
+        self._task: asyncio.Task | None = None
+        self._embedded = 0
+        self._failed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._last_batch_ms: int | None = None
+
+    def submit(self, message_id: uuid.UUID, text: str) -> None:
+        """Queue a message for embedding; never waits (the backfill catches drops)."""
+        try:
+            self._queue.put_nowait((message_id, text))
+        except asyncio.QueueFull:
+            self._dropped += 1
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval_s
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self.process(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def process(self, batch: list[tuple[uuid.UUID, str]]) -> None:
+        start = time.perf_counter()
+        try:
+            vectors = await self._provider.embed_batch([text for _, text in batch])
+            await store_embeddings([message_id for message_id, _ in batch], vectors)
+        except Exception as exc:
+            # Rows keep embedding = NULL and are picked up by the backfill
+            logger.info("Embedding batch of %d failed: %s", len(batch), exc)
+            self._failed += len(batch)
+            return
+        self._embedded += len(batch)
+        self._batches += 1
+        self._last_batch_ms = int((time.perf_counter() - start) * 1000)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Embedding queue stopped with %d messages pending", self._queue.qsize())
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "embedded": self._embedded,
+            "failed": self._failed,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "avg_batch": round(self._embedded / self._batches, 1) if self._batches else None,
+            "last_batch_ms": self._last_batch_ms,
+        }
+
+
+async def backfill(
+    provider: EmbeddingProvider,
+    *,
+    batch_size: int = 64,
+    max_rate: float | None = None,
+    after: uuid.UUID | None = None,
+    limit: int | None = None,
+    on_batch: Callable[[uuid.UUID, int], Awaitable[None] | None] | None = None,
+) -> dict:
+    """Embed messages with ``embedding IS NULL`` in id order, starting after ``after``.
+
+    ``max_rate`` caps texts per second.  ``on_batch(last_id, done)`` is called
+    after each committed batch so callers can persist the cursor and resume.
+    """
+    from backend.database.connection import get_session_factory
+    from backend.database.models import Message
+
+    done = 0
+    failed = 0
+    cursor = after
+    while limit is None or done + failed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - done - failed)
+        query = (
+            select(Message.id, Message.original_text, Message.translated_text)
+            .where(Message.embedding.is_(None))
+            .order_by(Message.id)
+            .limit(size)
+        )
+        if cursor is not None:
+            query = query.where(Message.id > cursor)
+        async with get_session_factory()() as db:
+            rows = (await db.execute(query)).all()
+        if not rows:
+            break
+
+        start = time.monotonic()
+        ids = [row.id for row in rows]
+        try:
+            vectors = await provider.embed_batch([message_text(row.original_text, row.translated_text) for row in rows])
+            await store_embeddings(ids, vectors)
+            done += len(rows)
+        except Exception as exc:
+            # Skip past the batch so one bad row cannot stall the run; a later run retries it
+            logger.warning("Backfill batch after %s failed: %s", cursor, exc)
+            failed += len(rows)
+        cursor = ids[-1]
+        if on_batch:
+            result = on_batch(cursor, done)
+            if asyncio.iscoroutine(result):
+                await result
+        if max_rate:
+            await asyncio.sleep(max(len(rows) / max_rate - (time.monotonic() - start), 0))
+
+    return {"embedded": done, "failed": failed, "cursor": str(cursor) if cursor else None}
+
+
+_queue: EmbeddingQueue | None = None
+
+
+def init_embedding_queue(queue: EmbeddingQueue | None) -> None:
+    global _queue
+    _queue = queue
+
+
+def get_embedding_queue() -> EmbeddingQueue | None:
+    return _queue
@@ -9,6 +9,21 @@ class TranscriptionResponse(BaseModel):
     text: str
 
 
+class TranscriptionSegment(BaseModel):
+    id: int
+    start: float
+    end: float
+    text: str
+
+
+class VerboseTranscriptionResponse(BaseModel):
+    task: str = "transcribe"
+    language: str
+    duration: float
+    text: str
+    segments: list[TranscriptionSegment]
+
+
 class SpeechRequest(BaseModel):
     input: str
     model: str = "piper"
@@ -51,11 +66,33 @@ class TranslateGatewayResponse(BaseModel):
 
 class PipelineGatewayResponse(BaseModel):
     transcript: str
+    transcript_lang: str  # "en" when Whisper translated directly, else source_lang
     source_lang: str
     translation: str
     audio: str | None = None  # base64 WAV when response_format=json
 
 
+# --- Jobs ---
+
+class JobCreatedResponse(BaseModel):
+    id: str
+    status: str
+    status_url: str
+
+
+class JobStatusResponse(BaseModel):
+    id: str
+    status: str  # queued, running, done, failed
+    stage: str   # queued, stt, translate, tts, done
+    progress: float
+    attempts: int
+    result: dict | None = None
+    error: str | None = None
+    created_at: str
+    updated_at: str
+    finished_at: str | None = None
+
+
 # --- Service Discovery ---
 
 class HealthProvider(BaseModel):
@@ -103,6 +140,6 @@ class SessionUpdateGateway(BaseModel):
 class SearchGatewayRequest(BaseModel):
     query: str
     org_id: str | None = None
-    limit: int = 20
+    limit: int = Field(20, ge=1, le=100)
     source_lang: str | None = None
     target_lang: str | None = None
@@ -4,17 +4,22 @@ import base64
 import logging
 import re
 import time
+import uuid
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Literal
 
 import httpx
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile
-from fastapi.responses import Response as RawResponse
+from fastapi.responses import FileResponse, Response as RawResponse, StreamingResponse
 
 from backend.dependencies import get_settings, get_stt, get_tts
 from backend.gateway.auth import ClientInfo, require_auth
 from backend.gateway.models import (
     HealthProvider,
     HealthResponse,
+    JobCreatedResponse,
+    JobStatusResponse,
     LanguagesGatewayResponse,
     ModelObject,
     ModelsListResponse,
@@ -24,14 +29,19 @@ from backend.gateway.models import (
     SessionUpdateGateway,
     SpeechRequest,
     TranscriptionResponse,
+    TranscriptionSegment,
     TranslateGatewayRequest,
     TranslateGatewayResponse,
+    VerboseTranscriptionResponse,
     VoiceInfo,
     VoicesResponse,
 )
 from backend.gateway.rate_limit import check_rate_limit
+from backend.keepalive import record_activity
+from backend.planner import plan_pipeline
 from backend.providers.tts.chatterbox_remote import ChatterboxRemoteProvider
-from backend.resolver import resolve_translate, resolve_tts
+from backend.resolver import resolve_translate, resolve_tts, synthesize_hedged, translate_hedged
+from backend.tts_cache import cache_key, get_tts_cache
 
 logger = logging.getLogger(__name__)
 
@@ -50,20 +60,33 @@ def _apply_headers(response: Response, headers: dict[str, str]) -> None:
 # OpenAI-compatible: Audio
 # ---------------------------------------------------------------------------
 
-@gateway_router.post("/audio/transcriptions", response_model=TranscriptionResponse)
+@gateway_router.post("/audio/transcriptions", response_model=None)
 async def transcribe(
     response: Response,
     file: UploadFile = File(...),
     model: str = Form("whisper-small"),
     language: str | None = Form(None),
+    response_format: str = Form("json"),
     client: ClientInfo = Depends(require_auth),
-) -> TranscriptionResponse:
+) -> TranscriptionResponse | VerboseTranscriptionResponse:
     rl_headers = check_rate_limit(client)
     _apply_headers(response, rl_headers)
 
     audio = await file.read()
-    text, _ = await get_stt().transcribe(audio, language)
-    return TranscriptionResponse(text=text)
+    if response_format != "verbose_json":
+        text, _ = await get_stt().transcribe(audio, language)
+        return TranscriptionResponse(text=text)
+
+    segments, detected_lang = await get_stt().transcribe_segments(audio, language)
+    return VerboseTranscriptionResponse(
+        language=detected_lang,
+        duration=segments[-1].end if segments else 0.0,
+        text=" ".join(seg.text for seg in segments if seg.text),
+        segments=[
+            TranscriptionSegment(id=i, start=round(seg.start, 2), end=round(seg.end, 2), text=seg.text)
+            for i, seg in enumerate(segments)
+        ],
+    )
 
 
 @gateway_router.post("/audio/speech", response_model=None)
@@ -135,9 +158,11 @@ async def translate(
     _apply_headers(response, rl_headers)
 
     s = get_settings()
-    translator, ad_hoc = resolve_translate(None, None, None, req.model)
+    record_activity()
+    translator, ad_hoc = resolve_translate(None, None, None, req.model, source=req.source, target=req.target)
+    effective_model = req.model or translator.model
     try:
-        translated = await translator.translate(req.text, req.source, req.target, req.model)
+        translated = await translator.translate(req.text, req.source, req.target, effective_model)
     except RuntimeError as exc:
         raise HTTPException(status_code=502, detail=str(exc))
     finally:
@@ -147,7 +172,7 @@ async def translate(
     return TranslateGatewayResponse(
         text=translated,
         detected_source=req.source,
-        model=req.model or s.ollama_model,
+        model=effective_model or s.ollama_model,
     )
 
 
@@ -165,6 +190,7 @@ async def pipeline(
     model: str | None = Form(None),
     tts_model: str | None = Form(None),
     response_format: str = Form("json"),
+    profile_id: str | None = Form(None),
     client: ClientInfo = Depends(require_auth),
 ) -> PipelineGatewayResponse | RawResponse:
     rl_headers = check_rate_limit(client, cost=3)
@@ -175,34 +201,89 @@ async def pipeline(
     if len(audio) > max_bytes:
         raise HTTPException(status_code=413, detail=f"Audio too large (max {s.gateway_max_audio_mb}MB)")
 
+    record_activity()
+    total_start = time.perf_counter()
+    plan = plan_pipeline(None, target_lang, tts, profile_id, s.whisper_translate_enabled)
+
     # 1. STT
-    text, detected_lang = await get_stt().transcribe(audio)
+    t0 = time.perf_counter()
+    text, detected_lang = await get_stt().transcribe(audio, task=plan.stt_task)
+    stt_ms = int((time.perf_counter() - t0) * 1000)
 
     if not text.strip():
         raise HTTPException(status_code=400, detail="No speech detected")
 
     # 2. Translate
-    translator, t_ad_hoc = resolve_translate(None, None, None, model)
-    try:
-        translated = await translator.translate(text, detected_lang, target_lang, model)
-    except RuntimeError as exc:
-        raise HTTPException(status_code=502, detail=str(exc))
-    finally:
-        if t_ad_hoc:
-            await translator.cleanup()
-
-    # 3. TTS (optional)
-    audio_bytes: bytes | None = None
-    if tts:
-        tts_provider_name = "chatterbox" if tts_model in ("chatterbox", "chatterbox-multilingual") else None
-        tts_impl, tts_ad_hoc = resolve_tts(tts_provider_name, voice)
+    plan.after_stt(detected_lang, target_lang)
+    t0 = time.perf_counter()
+    translated = text
+    translate_name = plan.translate
+    if plan.needs_llm:
+        translator, t_ad_hoc = resolve_translate(None, None, None, model, source=detected_lang, target=target_lang)
+        effective_model = model or translator.model
+        translate_name = s.translate_provider
+        if translate_name == "local":
+            translate_name = f"ollama/{effective_model or s.ollama_model}"
+        translate_kwargs: dict[str, object] = {}
+        if profile_id:
+            from backend.profiles import get_system_prompt
+            translate_kwargs["system_prompt"] = get_system_prompt(profile_id, detected_lang, target_lang)
         try:
-            audio_bytes = await tts_impl.synthesize(translated, target_lang, voice)
+            translated, _ = await translate_hedged(
+                translator, translate_name, text, detected_lang, target_lang, effective_model,
+                **translate_kwargs,
+            )
         except RuntimeError as exc:
             raise HTTPException(status_code=502, detail=str(exc))
         finally:
-            if tts_ad_hoc:
-                await tts_impl.cleanup()
+            if t_ad_hoc:
+                await translator.cleanup()
+    translate_ms = int((time.perf_counter() - t0) * 1000)
+
+    # 3. TTS (optional, mit Cache)
+    audio_bytes: bytes | None = None
+    tts_ms: int | None = None
+    tts_provider_name = "chatterbox" if tts_model in ("chatterbox", "chatterbox-multilingual") else None
+    if plan.tts != "skip":
+        t0 = time.perf_counter()
+        cache = get_tts_cache()
+        key = cache_key(tts_provider_name or s.tts_provider, translated, target_lang, voice)
+        cached = cache.get(key) if cache else None
+        if cached:
+            plan.use_tts_cache()
+            audio_bytes = cached[0]
+        else:
+            tts_impl, tts_ad_hoc = resolve_tts(tts_provider_name, voice)
+            try:
+                audio_bytes, winner, _ = await synthesize_hedged(
+                    tts_impl, tts_provider_name or s.tts_provider, translated, target_lang, voice,
+                )
+            except RuntimeError as exc:
+                raise HTTPException(status_code=502, detail=str(exc))
+            finally:
+                if tts_ad_hoc:
+                    await tts_impl.cleanup()
+            if cache and winner == (tts_provider_name or s.tts_provider):
+                cache.put(key, audio_bytes, "wav")
+        tts_ms = int((time.perf_counter() - t0) * 1000)
+
+    from backend.routers.pipeline import _log_benchmark
+    _log_benchmark({
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stt_provider": f"whisper-{s.whisper_model}",
+        "translate_provider": translate_name,
+        "tts_provider": tts_provider_name or s.tts_provider,
+        "source_lang": detected_lang,
+        "target_lang": target_lang,
+        "text_length": len(text),
+        "stt_ms": stt_ms,
+        "translate_ms": translate_ms,
+        "tts_ms": tts_ms,
+        "total_ms": int((time.perf_counter() - total_start) * 1000),
+        "profile_id": profile_id,
+        "plan": plan.to_log(),
+        "gateway": True,
+    })
 
     if response_format == "audio" and audio_bytes:
         raw_resp = RawResponse(content=audio_bytes, media_type="audio/wav")
@@ -212,12 +293,113 @@ async def pipeline(
     _apply_headers(response, rl_headers)
     return PipelineGatewayResponse(
         transcript=text,
+        transcript_lang=plan.transcript_lang(detected_lang),
         source_lang=detected_lang,
         translation=translated,
         audio=base64.b64encode(audio_bytes).decode() if audio_bytes else None,
     )
 
 
+# ---------------------------------------------------------------------------
+# Async pipeline jobs
+# ---------------------------------------------------------------------------
+
+async def _get_owned_job(job_id: str, client: ClientInfo):
+    from backend.jobs import client_tag, get_job
+
+    try:
+        job = await get_job(uuid.UUID(job_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Jobs are only visible to the API key that created them
+    if job is None or job.client != client_tag(client.api_key):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@gateway_router.post("/jobs/pipeline", response_model=JobCreatedResponse, status_code=202)
+async def create_pipeline_job(
+    response: Response,
+    file: UploadFile = File(...),
+    source_lang: str | None = Form(None),
+    target_lang: str = Form("en"),
+    tts: bool = Form(True),
+    voice: str | None = Form(None),
+    model: str | None = Form(None),
+    tts_model: str | None = Form(None),
+    profile_id: str | None = Form(None),
+    webhook_url: str | None = Form(None),
+    client: ClientInfo = Depends(require_auth),
+) -> JobCreatedResponse:
+    rl_headers = check_rate_limit(client, cost=3)
+    _apply_headers(response, rl_headers)
+
+    from backend.jobs import check_webhook_url, client_tag, create_job, get_job_pool
+
+    if get_job_pool() is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable (database or JOBS_ENABLED off)")
+    if webhook_url:
+        rejected = await check_webhook_url(webhook_url)
+        if rejected:
+            raise HTTPException(status_code=422, detail=rejected)
+
+    s = get_settings()
+    max_bytes = s.gateway_max_audio_mb * 1024 * 1024
+    audio = await file.read()
+    if len(audio) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Audio too large (max {s.gateway_max_audio_mb}MB)")
+
+    record_activity()
+    job = await create_job(
+        audio,
+        {
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "tts": tts,
+            "voice": voice,
+            "model": model,
+            "tts_provider": "chatterbox" if tts_model in ("chatterbox", "chatterbox-multilingual") else None,
+            "profile_id": profile_id,
+        },
+        webhook_url=webhook_url,
+        client=client_tag(client.api_key),
+    )
+    response.headers["Location"] = f"/v1/jobs/{job.id}"
+    return JobCreatedResponse(id=str(job.id), status=job.status, status_url=f"/v1/jobs/{job.id}")
+
+
+@gateway_router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_pipeline_job(
+    job_id: str,
+    response: Response,
+    client: ClientInfo = Depends(require_auth),
+) -> JobStatusResponse:
+    rl_headers = check_rate_limit(client)
+    _apply_headers(response, rl_headers)
+
+    from backend.jobs import job_to_dict
+
+    job = await _get_owned_job(job_id, client)
+    return JobStatusResponse(**job_to_dict(job))
+
+
+@gateway_router.get("/jobs/{job_id}/audio", response_model=None)
+async def get_pipeline_job_audio(
+    job_id: str,
+    client: ClientInfo = Depends(require_auth),
+) -> FileResponse:
+    rl_headers = check_rate_limit(client)
+
+    from backend.jobs import job_audio_path
+
+    job = await _get_owned_job(job_id, client)
+    path = job_audio_path(job)
+    if job.status != "done" or path is None or not path.exists():
+        raise HTTPException(status_code=404, detail="No audio for this job")
+    media_type = "audio/mpeg" if path.suffix == ".mp3" else "audio/wav"
+    return FileResponse(path, media_type=media_type, headers=rl_headers)
+
+
 # ---------------------------------------------------------------------------
 # Service Discovery
 # ---------------------------------------------------------------------------
@@ -374,13 +556,15 @@ async def list_sessions(
     response: Response,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
+    total: Literal["exact", "estimate", "none"] = "exact",
     client: ClientInfo = Depends(require_auth),
 ) -> dict:
     rl_headers = check_rate_limit(client)
     _apply_headers(response, rl_headers)
 
     from backend.routers.sessions import list_sessions as _list
-    result = await _list(limit=limit, offset=offset)
+    result = await _list(limit=limit, offset=offset, cursor=cursor, total=total)
     return result.model_dump()
 
 
@@ -434,16 +618,61 @@ async def list_messages(
     response: Response,
     limit: int = 50,
     offset: int = 0,
+    after: str | None = None,
+    before: str | None = None,
     client: ClientInfo = Depends(require_auth),
 ) -> dict:
     rl_headers = check_rate_limit(client)
     _apply_headers(response, rl_headers)
 
     from backend.routers.messages import get_messages as _get_msgs
-    result = await _get_msgs(session_id, limit=limit, offset=offset)
+    result = await _get_msgs(session_id, limit=limit, offset=offset, after=after, before=before)
     return result.model_dump()
 
 
+@gateway_router.get("/sessions/{session_id}/export", response_model=None)
+async def export_session(
+    session_id: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    client: ClientInfo = Depends(require_auth),
+) -> StreamingResponse:
+    rl_headers = check_rate_limit(client)
+
+    from backend.routers.export import export_session as _export
+    result = await _export(session_id, format=format)
+    result.headers.update(rl_headers)
+    return result
+
+
+@gateway_router.get("/sessions/{session_id}/audio", response_model=None)
+async def export_session_audio(
+    session_id: str,
+    client: ClientInfo = Depends(require_auth),
+) -> StreamingResponse:
+    rl_headers = check_rate_limit(client)
+
+    from backend.routers.export import export_session_audio as _export
+    result = await _export(session_id)
+    result.headers.update(rl_headers)
+    return result
+
+
+@gateway_router.get("/organizations/{org_id}/export", response_model=None)
+async def export_organization(
+    org_id: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    client: ClientInfo = Depends(require_auth),
+) -> StreamingResponse:
+    rl_headers = check_rate_limit(client)
+
+    from backend.routers.export import export_organization as _export
+    result = await _export(org_id, format=format, since=since, until=until)
+    result.headers.update(rl_headers)
+    return result
+
+
 # ---------------------------------------------------------------------------
 # Semantic Search
 # ---------------------------------------------------------------------------
@@ -0,0 +1,166 @@
+"""Latency-based request hedging for translate and TTS providers.
+
+A ``LatencyTracker`` keeps a rolling window of recent call latencies per
+provider.  ``hedged_call`` starts the primary call and, if it has not
+answered within the hedge delay (a percentile of that history), starts a
+fallback call in parallel.  The first successful answer wins, the other
+task is cancelled.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Rolling per-provider latency window (milliseconds)."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, key: str, ms: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = deque(maxlen=self._window)
+            self._samples[key] = samples
+        samples.append(ms)
+
+    def percentile(self, key: str, pct: float, min_samples: int = 1) -> float | None:
+        """Nearest-rank percentile, or None if fewer than ``min_samples`` exist."""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(samples)
+        rank = math.ceil(pct / 100 * len(ordered))
+        return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+    def snapshot(self) -> dict[str, dict[str, float | int | None]]:
+        return {
+            key: {
+                "n": len(samples),
+                "p50": self.percentile(key, 50),
+                "p95": self.percentile(key, 95),
+            }
+            for key, samples in self._samples.items()
+        }
+
+
+_tracker = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    return _tracker
+
+
+@dataclass
+class HedgeResult(Generic[T]):
+    value: T
+    winner: str
+    hedged: bool
+    delay_ms: int | None
+    primary_ms: int | None
+    fallback_ms: int | None
+
+    def to_log(self, primary: str, fallback: str | None) -> dict:
+        return {
+            "primary": primary,
+            "fallback": fallback,
+            "hedged": self.hedged,
+            "winner": self.winner,
+            "delay_ms": self.delay_ms,
+            "primary_ms": self.primary_ms,
+            "fallback_ms": self.fallback_ms,
+        }
+
+
+async def _cancel(task: asyncio.Task) -> None:
+    task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+async def hedged_call(
+    primary: Callable[[], Awaitable[T]],
+    fallback: Callable[[], Awaitable[T]] | None,
+    delay_s: float | None,
+    *,
+    primary_key: str,
+    fallback_key: str | None = None,
+    tracker: LatencyTracker | None = None,
+) -> HedgeResult[T]:
+    """Run ``primary``; start ``fallback`` if it is still running after ``delay_s``.
+
+    Without a fallback or a delay this is a plain timed call.  If the winning
+    call raised, the other one is awaited instead; if both fail the primary's
+    exception propagates.  A cancelled primary is recorded with its elapsed
+    time as a lower bound, so slow tails stay visible in the percentile.
+    """
+    tracker = tracker or _tracker
+    start = time.perf_counter()
+
+    def _elapsed_ms() -> int:
+        return int((time.perf_counter() - start) * 1000)
+
+    primary_task = asyncio.ensure_future(primary())
+    delay_ms = int(delay_s * 1000) if delay_s is not None else None
+
+    if fallback is None or delay_s is None:
+        value = await primary_task
+        ms = _elapsed_ms()
+        tracker.record(primary_key, ms)
+        return HedgeResult(value, "primary", False, delay_ms, ms, None)
+
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=delay_s)
+    except asyncio.CancelledError:
+        await _cancel(primary_task)
+        raise
+    if done:
+        value = primary_task.result()
+        ms = _elapsed_ms()
+        tracker.record(primary_key, ms)
+        return HedgeResult(value, "primary", False, delay_ms, ms, None)
+
+    logger.info("Hedging %s after %dms -> %s", primary_key, delay_ms, fallback_key)
+    fallback_start = time.perf_counter()
+    fallback_task = asyncio.ensure_future(fallback())
+    pending: set[asyncio.Task] = {primary_task, fallback_task}
+    primary_ms: int | None = None
+    fallback_ms: int | None = None
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is primary_task:
+                    primary_ms = _elapsed_ms()
+                    tracker.record(primary_key, primary_ms)
+                else:
+                    fallback_ms = int((time.perf_counter() - fallback_start) * 1000)
+                    if fallback_key:
+                        tracker.record(fallback_key, fallback_ms)
+                which = "primary" if task is primary_task else "fallback"
+                if task.exception() is None:
+                    return HedgeResult(task.result(), which, True, delay_ms, primary_ms, fallback_ms)
+                logger.warning("Hedged %s call failed: %s", which, task.exception())
+        # Both failed -- surface the primary's error
+        exc = primary_task.exception()
+        assert exc is not None
+        raise exc
+    finally:
+        for task in pending:
+            if task is primary_task and primary_ms is None:
+                tracker.record(primary_key, _elapsed_ms())
+            await _cancel(task)
@@ -0,0 +1,467 @@
+"""Asynchronous pipeline jobs backed by Postgres.
+
+``create_job`` stores the uploaded audio under ``JOBS_STORAGE_PATH`` and
+inserts a queued ``pipeline_jobs`` row.  ``JobWorkerPool`` runs
+``JOBS_CONCURRENCY`` workers that claim jobs with
+``SELECT ... FOR UPDATE SKIP LOCKED`` -- so several replicas can share one
+queue, provided ``JOBS_STORAGE_PATH`` is a volume they all mount -- and
+record the current stage as they go.  Running jobs refresh
+``updated_at`` as a heartbeat; jobs whose heartbeat is older than
+``JOBS_STALE_AFTER_S`` (crashed worker, restart) are queued again until
+``JOBS_MAX_ATTEMPTS`` is reached.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import logging
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import httpx
+
+if TYPE_CHECKING:
+    from backend.database.models import PipelineJob
+
+logger = logging.getLogger(__name__)
+
+STAGE_PROGRESS = {"queued": 0.0, "stt": 0.1, "translate": 0.4, "tts": 0.7, "done": 1.0}
+JANITOR_INTERVAL_S = 60
+WEBHOOK_ATTEMPTS = 3
+
+
+def client_tag(api_key: str | None) -> str | None:
+    """Stable, non-reversible owner tag for a gateway API key."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else None
+
+
+async def check_webhook_url(url: str) -> str | None:
+    """Why ``url`` may not be used as a job webhook, or None when it may.
+
+    Hosts listed in ``JOBS_WEBHOOK_ALLOWED_HOSTS`` are always accepted; when the
+    list is set nothing else is.  Otherwise the host must resolve to public
+    addresses only, so jobs cannot be used to reach services on the internal
+    network (loopback, private, link-local, metadata endpoints).
+    """
+    from backend.dependencies import get_settings
+
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return "webhook_url must be an http(s) URL"
+    host = parts.hostname.lower()
+    allowed = {h.strip().lower() for h in get_settings().jobs_webhook_allowed_hosts.split(",") if h.strip()}
+    if allowed:
+        return None if host in allowed else f"webhook host {host} is not allowed"
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, parts.port or 443, type=socket.SOCK_STREAM)
+    except (OSError, ValueError):
+        return f"webhook host {host} does not resolve"
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if not address.is_global or address.is_multicast:
+            return f"webhook host {host} resolves to a non-public address"
+    return None
+
+
+def _storage() -> Path:
+    from backend.dependencies import get_settings
+
+    return Path(get_settings().jobs_storage_path)
+
+
+async def create_job(
+    audio: bytes, params: dict, webhook_url: str | None = None, client: str | None = None,
+) -> "PipelineJob":
+    from backend.database.connection import get_session_factory
+    from backend.database.models import PipelineJob
+
+    job_id = uuid.uuid4()
+    storage = _storage()
+    storage.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread((storage / f"{job_id}.in").write_bytes, audio)
+
+    job = PipelineJob(
+        id=job_id, status="queued", stage="queued", params=params,
+        audio_path=f"{job_id}.in", webhook_url=webhook_url, client=client, attempts=0,
+    )
+    async with get_session_factory()() as db:
+        db.add(job)
+        await db.commit()
+    if _pool is not None:
+        _pool.notify()
+    return job
+
+
+async def get_job(job_id: uuid.UUID) -> "PipelineJob | None":
+    from backend.database.connection import get_session_factory
+    from backend.database.models import PipelineJob
+
+    async with get_session_factory()() as db:
+        return await db.get(PipelineJob, job_id)
+
+
+def job_to_dict(job: "PipelineJob") -> dict:
+    result = dict(job.result) if job.result else None
+    if result:
+        result.pop("audio_file", None)
+    return {
+        "id": str(job.id),
+        "status": job.status,
+        "stage": job.stage,
+        "progress": STAGE_PROGRESS.get(job.stage, 0.0),
+        "attempts": job.attempts,
+        "result": result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "updated_at": job.updated_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def job_audio_path(job: "PipelineJob") -> Path | None:
+    name = (job.result or {}).get("audio_file")
+    return _storage() / name if name else None
+
+
+async def run_pipeline_job(
+    job: "PipelineJob", set_stage: Callable[[str], Awaitable[None]],
+) -> dict:
+    """STT -> translate -> TTS for one job, same behavior as /v1/pipeline."""
+    from backend.dependencies import get_settings, get_stt
+    from backend.planner import plan_pipeline
+    from backend.resolver import resolve_translate, resolve_tts, translate_hedged
+    from backend.routers.pipeline import _log_benchmark, _synthesize_cached
+
+    s = get_settings()
+    p = job.params
+    target_lang = p.get("target_lang", "en")
+    profile_id = p.get("profile_id")
+    model = p.get("model")
+    voice = p.get("voice")
+    plan = plan_pipeline(p.get("source_lang"), target_lang, p.get("tts", True), profile_id, s.whisper_translate_enabled)
+    try:
+        audio = await asyncio.to_thread((_storage() / job.audio_path).read_bytes)
+    except FileNotFoundError:
+        raise RuntimeError(
+            f"Job audio {job.audio_path} not found in JOBS_STORAGE_PATH (is it shared by all replicas?)"
+        ) from None
+
+    await set_stage("stt")
+    t0 = time.perf_counter()
+    segments, detected_lang = await get_stt().transcribe_segments(audio, p.get("source_lang"), task=plan.stt_task)
+    text = " ".join(seg.text for seg in segments if seg.text)
+    stt_ms = int((time.perf_counter() - t0) * 1000)
+    if not text.strip():
+        raise RuntimeError("No speech detected")
+
+    await set_stage("translate")
+    plan.after_stt(detected_lang, target_lang)
+    t0 = time.perf_counter()
+    translated = text
+    translate_name = plan.translate
+    if plan.needs_llm:
+        translator, ad_hoc = resolve_translate(None, None, None, model, source=detected_lang, target=target_lang)
+        effective_model = model or translator.model
+        translate_name = s.translate_provider
+        if translate_name == "local":
+            translate_name = f"ollama/{effective_model or s.ollama_model}"
+        translate_kwargs: dict[str, object] = {}
+        if profile_id:
+            from backend.profiles import get_system_prompt
+            translate_kwargs["system_prompt"] = get_system_prompt(profile_id, detected_lang, target_lang)
+        try:
+            translated, _ = await translate_hedged(
+                translator, translate_name, text, detected_lang, target_lang, effective_model,
+                **translate_kwargs,
+            )
+        finally:
+            if ad_hoc:
+                await translator.cleanup()
+    translate_ms = int((time.perf_counter() - t0) * 1000)
+
+    result: dict = {
+        "transcript": text,
+        "segments": [{"start": round(seg.start, 2), "end": round(seg.end, 2), "text": seg.text} for seg in segments],
+        "transcript_lang": plan.transcript_lang(detected_lang),
+        "source_lang": detected_lang,
+        "translation": translated,
+        "stt_ms": stt_ms,
+        "translate_ms": translate_ms,
+        "tts_ms": None,
+        "audio_format": None,
+    }
+    tts_provider_name = p.get("tts_provider")
+    if plan.tts != "skip":
+        await set_stage("tts")
+        t0 = time.perf_counter()
+        audio_bytes, audio_fmt, _ = await _synthesize_cached(
+            plan,
+            lambda: resolve_tts(tts_provider_name, voice),
+            tts_provider_name or s.tts_provider,
+            "",
+            translated, target_lang, voice, {},
+        )
+        name = f"{job.id}.out.{audio_fmt}"
+        await asyncio.to_thread((_storage() / name).write_bytes, audio_bytes)
+        result.update(tts_ms=int((time.perf_counter() - t0) * 1000), audio_format=audio_fmt, audio_file=name)
+
+    _log_benchmark({
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stt_provider": f"whisper-{s.whisper_model}",
+        "translate_provider": translate_name,
+        "tts_provider": tts_provider_name or s.tts_provider,
+        "source_lang": detected_lang,
+        "target_lang": target_lang,
+        "text_length": len(text),
+        "stt_ms": stt_ms,
+        "translate_ms": translate_ms,
+        "tts_ms": result["tts_ms"],
+        "total_ms": stt_ms + translate_ms + (result["tts_ms"] or 0),
+        "profile_id": profile_id,
+        "plan": plan.to_log(),
+        "gateway": True,
+        "job": True,
+    })
+    return result
+
+
+class JobWorkerPool:
+    def __init__(
+        self,
+        concurrency: int = 2,
+        *,
+        poll_interval_s: float = 2.0,
+        stale_after_s: int = 600,
+        max_attempts: int = 3,
+        retention_hours: int = 24,
+    ) -> None:
+        self._concurrency = concurrency
+        self._poll_interval_s = poll_interval_s
+        self._stale_after_s = stale_after_s
+        self._max_attempts = max_attempts
+        self._retention_hours = retention_hours
+        self._wakeup = asyncio.Event()
+        self._active: set[uuid.UUID] = set()
+        self._processed = 0
+        self._failed = 0
+        self._client = httpx.AsyncClient(timeout=10.0)
+
+    def notify(self) -> None:
+        """Wake idle workers after a local enqueue (other replicas poll)."""
+        self._wakeup.set()
+
+    async def claim(self) -> "PipelineJob | None":
+        from sqlalchemy import select
+
+        from backend.database.connection import get_session_factory
+        from backend.database.models import PipelineJob
+
+        async with get_session_factory()() as db:
+            stmt = (
+                select(PipelineJob)
+                .where(PipelineJob.status == "queued")
+                .order_by(PipelineJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = (await db.execute(stmt)).scalar_one_or_none()
+            if job is None:
+                return None
+            job.status = "running"
+            job.stage = "queued"
+            job.attempts += 1
+            await db.commit()
+            return job
+
+    async def _update(self, job_id: uuid.UUID, **values: object) -> None:
+        from sqlalchemy import update
+
+        from backend.database.connection import get_session_factory
+        from backend.database.models import PipelineJob
+
+        values.setdefault("updated_at", datetime.now(timezone.utc))
+        async with get_session_factory()() as db:
+            await db.execute(update(PipelineJob).where(PipelineJob.id == job_id).values(**values))
+            await db.commit()
+
+    async def _heartbeat(self, job_id: uuid.UUID) -> None:
+        while True:
+            await asyncio.sleep(max(self._stale_after_s / 3, 1))
+            try:
+                await self._update(job_id)
+            except Exception as exc:
+                logger.debug("Job heartbeat failed for %s: %s", job_id, exc)
+
+    async def process(self, job: "PipelineJob") -> None:
+        self._active.add(job.id)
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        status, result, error = "done", None, None
+        try:
+            result = await run_pipeline_job(job, lambda stage: self._update(job.id, stage=stage))
+        except Exception as exc:
+            logger.warning("Pipeline job %s failed: %s", job.id, exc)
+            status, error = "failed", str(exc)
+        finally:
+            heartbeat.cancel()
+        # A cancelled job (shutdown) stays in _active so release() hands it back to the queue
+
+        now = datetime.now(timezone.utc)
+        await self._update(
+            job.id, status=status, stage="done" if status == "done" else job.stage,
+            result=result, error=error, finished_at=now, audio_path=None,
+        )
+        self._active.discard(job.id)
+        if job.audio_path:
+            (_storage() / job.audio_path).unlink(missing_ok=True)
+        self._processed += 1
+        if status == "failed":
+            self._failed += 1
+
+        if job.webhook_url:
+            job.status, job.result, job.error, job.finished_at, job.updated_at = status, result, error, now, now
+            job.stage = "done" if status == "done" else job.stage
+            await self._call_webhook(job.webhook_url, job_to_dict(job))
+
+    async def _call_webhook(self, url: str, payload: dict) -> None:
+        # Checked again at send time: the name may resolve differently than at submission
+        rejected = await check_webhook_url(url)
+        if rejected:
+            logger.warning("Not calling webhook for job %s: %s", payload.get("id"), rejected)
+            return
+        for attempt in range(WEBHOOK_ATTEMPTS):
+            try:
+                resp = await self._client.post(url, json=payload)
+                if resp.status_code < 500:
+                    return
+                logger.debug("Webhook %s answered %s", url, resp.status_code)
+            except httpx.HTTPError as exc:
+                logger.debug("Webhook %s failed: %s", url, exc)
+            await asyncio.sleep(2 ** attempt)
+        logger.warning("Giving up on webhook %s for job %s", url, payload.get("id"))
+
+    async def requeue_stale(self) -> int:
+        """Requeue running jobs without a recent heartbeat; fail those out of attempts."""
+        from sqlalchemy import update
+
+        from backend.database.connection import get_session_factory
+        from backend.database.models import PipelineJob
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self._stale_after_s)
+        stale = (PipelineJob.status == "running") & (PipelineJob.updated_at < cutoff)
+        async with get_session_factory()() as db:
+            failed = await db.execute(
+                update(PipelineJob)
+                .where(stale, PipelineJob.attempts >= self._max_attempts)
+                .values(status="failed", error="Worker lost too many times", finished_at=datetime.now(timezone.utc))
+            )
+            requeued = await db.execute(
+                update(PipelineJob).where(stale).values(status="queued", stage="queued", updated_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+        if failed.rowcount or requeued.rowcount:
+            logger.info("Jobs: requeued %d stale, failed %d", requeued.rowcount, failed.rowcount)
+        return requeued.rowcount
+
+    async def purge_finished(self) -> int:
+        """Delete finished jobs past their retention together with their audio."""
+        from sqlalchemy import delete
+
+        from backend.database.connection import get_session_factory
+        from backend.database.models import PipelineJob
+
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self._retention_hours)
+        async with get_session_factory()() as db:
+            rows = (await db.execute(
+                delete(PipelineJob)
+                .where(PipelineJob.status.in_(("done", "failed")), PipelineJob.finished_at < cutoff)
+                .returning(PipelineJob.id)
+            )).scalars().all()
+            await db.commit()
+        storage = _storage()
+        for job_id in rows:
+            for path in storage.glob(f"{job_id}.*"):
+                path.unlink(missing_ok=True)
+        return len(rows)
+
+    async def release(self) -> None:
+        """Hand this process's running jobs back to the queue (graceful shutdown)."""
+        from sqlalchemy import update
+
+        from backend.database.connection import get_session_factory
+        from backend.database.models import PipelineJob
+
+        if not self._active:
+            return
+        async with get_session_factory()() as db:
+            await db.execute(
+                update(PipelineJob)
+                .where(PipelineJob.id.in_(self._active), PipelineJob.status == "running")
+                .values(status="queued", stage="queued", updated_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+        self._active.clear()
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self.claim()
+            except Exception as exc:
+                logger.warning("Job claim failed: %s", exc)
+                job = None
+            if job is not None:
+                try:
+                    await self.process(job)
+                except Exception as exc:
+                    # The job stays "running" and is requeued by requeue_stale
+                    logger.warning("Finishing job %s failed: %s", job.id, exc)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _janitor(self) -> None:
+        while True:
+            try:
+                await self.requeue_stale()
+                await self.purge_finished()
+            except Exception as exc:
+                logger.warning("Job maintenance failed: %s", exc)
+            await asyncio.sleep(JANITOR_INTERVAL_S)
+
+    async def run(self) -> None:
+        # A TaskGroup cancels the siblings when one task fails, so a restart never leaves orphans
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._janitor())
+            for _ in range(self._concurrency):
+                group.create_task(self._worker())
+
+    def status(self) -> dict:
+        return {
+            "concurrency": self._concurrency,
+            "active": [str(job_id) for job_id in self._active],
+            "processed": self._processed,
+            "failed": self._failed,
+        }
+
+    async def cleanup(self) -> None:
+        await self._client.aclose()
+
+
+_pool: JobWorkerPool | None = None
+
+
+def init_job_pool(pool: JobWorkerPool | None) -> None:
+    global _pool
+    _pool = pool
+
+
+def get_job_pool() -> JobWorkerPool | None:
+    return _pool
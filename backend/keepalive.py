@@ -0,0 +1,220 @@
+"""Traffic-aware keep-alive scheduler for Ollama models.
+
+Learns an hour-of-week request profile from recent message history plus
+live pipeline traffic.  While a window is predicted to be active (or a
+request came in recently) the translation and embedding models get their
+``keep_alive`` refreshed before it expires; in idle windows the refresh
+stops and Ollama unloads the models, freeing VRAM.
+
+Besides ``OLLAMA_MODEL``, the translation models include the models that
+language-pair routing picks for pairs seen in the history window and the
+routed models this process used recently.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SLOTS = 7 * 24  # hour-of-week buckets
+RELEARN_INTERVAL_S = 3600
+
+
+def _slot(at: datetime) -> int:
+    return at.weekday() * 24 + at.hour
+
+
+class KeepAliveScheduler:
+    def __init__(
+        self,
+        ollama_url: str,
+        translate_model: str,
+        embedding_url: str | None = None,
+        embedding_model: str | None = None,
+        *,
+        interval_s: int = 60,
+        history_days: int = 14,
+        active_rate: float = 1.0,
+        idle_grace_s: int = 600,
+        history_enabled: bool = True,
+    ) -> None:
+        self._ollama_url = ollama_url.rstrip("/")
+        self._translate_model = translate_model
+        self._embedding_url = (embedding_url or ollama_url).rstrip("/")
+        self._embedding_model = embedding_model
+        self._interval_s = interval_s
+        self._history_days = history_days
+        self._active_rate = active_rate
+        self._idle_grace_s = idle_grace_s
+        self._history_enabled = history_enabled
+
+        self._learned = [0.0] * SLOTS    # expected requests/hour from history
+        self._live = [0] * SLOTS         # requests seen by this process since last relearn
+        self._history_pairs: set[tuple[str, str]] = set()  # language pairs in the history window
+        self._routed: dict[str, float] = {}  # routed model -> last use (monotonic)
+        self._last_activity: float | None = None
+        self._last_learn: float | None = None
+        self._last_decision: dict = {}
+        self._client = httpx.AsyncClient(timeout=60.0)
+
+    @property
+    def keep_alive(self) -> str:
+        # Two intervals of headroom so a late tick never lets the model expire
+        return f"{self._interval_s * 2 + 30}s"
+
+    def record_activity(self, at: datetime | None = None) -> None:
+        at = at or datetime.now(timezone.utc)
+        self._live[_slot(at)] += 1
+        self._last_activity = time.monotonic()
+
+    def record_model(self, model: str) -> None:
+        """Note a routed translation model so it is kept warm with the default one."""
+        self._routed[model] = time.monotonic()
+
+    def translate_models(self) -> list[str]:
+        """Default model first, then routed models for recently seen language pairs."""
+        from backend.routing import route_model
+
+        horizon = time.monotonic() - self._history_days * 86400
+        self._routed = {m: t for m, t in self._routed.items() if t > horizon}
+        models = [self._translate_model]
+        candidates = [route_model(source, target) for source, target in sorted(self._history_pairs)]
+        for model in [*candidates, *self._routed]:
+            if model and model not in models:
+                models.append(model)
+        return models
+
+    def expected_rate(self, at: datetime) -> float:
+        slot = _slot(at)
+        return self._learned[slot] + self._live[slot]
+
+    def decide(self, now: datetime | None = None) -> tuple[bool, str]:
+        """Return (keep_warm, reason) for the current moment."""
+        now = now or datetime.now(timezone.utc)
+        if self._last_activity is not None and time.monotonic() - self._last_activity < self._idle_grace_s:
+            return True, "recent_activity"
+        current = self.expected_rate(now)
+        upcoming = self.expected_rate(now + timedelta(hours=1))
+        if current >= self._active_rate:
+            return True, f"active_window ({current:.1f} req/h)"
+        if upcoming >= self._active_rate and now.minute >= 45:
+            return True, f"pre_warm ({upcoming:.1f} req/h next hour)"
+        return False, f"idle_window ({current:.1f} req/h)"
+
+    async def learn_from_history(self) -> None:
+        """Rebuild the hour-of-week profile from stored messages."""
+        from sqlalchemy import text
+
+        from backend.database.connection import get_session_factory
+
+        since = datetime.now(timezone.utc) - timedelta(days=self._history_days)
+        weeks = max(self._history_days / 7, 1.0)
+        stmt = text(
+            "SELECT extract(isodow FROM created_at AT TIME ZONE 'UTC')::int - 1 AS dow, "
+            "extract(hour FROM created_at AT TIME ZONE 'UTC')::int AS hour, count(*) "
+            "FROM messages WHERE created_at > :since GROUP BY 1, 2"
+        )
+        pairs_stmt = text(
+            "SELECT DISTINCT original_lang, translated_lang FROM messages WHERE created_at > :since"
+        )
+        learned = [0.0] * SLOTS
+        async with get_session_factory()() as db:
+            for dow, hour, count in (await db.execute(stmt, {"since": since})).all():
+                learned[dow * 24 + hour] = count / weeks
+            pairs = {(source, target) for source, target in (await db.execute(pairs_stmt, {"since": since})).all()}
+        self._learned = learned
+        self._history_pairs = pairs
+        self._live = [0] * SLOTS
+        self._last_learn = time.monotonic()
+
+    async def _refresh(self) -> list[str]:
+        refreshed: list[str] = []
+        for model in self.translate_models():
+            try:
+                await self._client.post(
+                    f"{self._ollama_url}/api/chat",
+                    json={"model": model, "messages": [], "stream": False, "keep_alive": self.keep_alive},
+                )
+                refreshed.append(model)
+            except Exception as exc:
+                logger.debug("Keep-alive for %s failed: %s", model, exc)
+        if self._embedding_model:
+            try:
+                await self._client.post(
+                    f"{self._embedding_url}/api/embed",
+                    json={"model": self._embedding_model, "input": "", "keep_alive": self.keep_alive},
+                )
+                refreshed.append(self._embedding_model)
+            except Exception as exc:
+                logger.debug("Keep-alive for %s failed: %s", self._embedding_model, exc)
+        return refreshed
+
+    async def tick(self) -> None:
+        if self._history_enabled and (
+            self._last_learn is None or time.monotonic() - self._last_learn > RELEARN_INTERVAL_S
+        ):
+            try:
+                await self.learn_from_history()
+            except Exception as exc:
+                logger.debug("Keep-alive history learning failed: %s", exc)
+
+        keep_warm, reason = self.decide()
+        refreshed = await self._refresh() if keep_warm else []
+        self._last_decision = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "keep_warm": keep_warm,
+            "reason": reason,
+            "refreshed": refreshed,
+            "keep_alive": self.keep_alive if keep_warm else None,
+        }
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as exc:
+                logger.warning("Keep-alive tick failed: %s", exc)
+            await asyncio.sleep(self._interval_s)
+
+    def status(self) -> dict:
+        now = datetime.now(timezone.utc)
+        return {
+            "enabled": True,
+            "models": [*self.translate_models(), *([self._embedding_model] if self._embedding_model else [])],
+            "interval_s": self._interval_s,
+            "active_rate": self._active_rate,
+            "expected_rate_now": round(self.expected_rate(now), 2),
+            "expected_rate_next_hour": round(self.expected_rate(now + timedelta(hours=1)), 2),
+            "last_decision": self._last_decision or None,
+        }
+
+    async def cleanup(self) -> None:
+        await self._client.aclose()
+
+
+_scheduler: KeepAliveScheduler | None = None
+
+
+def init_keepalive(scheduler: KeepAliveScheduler | None) -> None:
+    global _scheduler
+    _scheduler = scheduler
+
+
+def get_keepalive() -> KeepAliveScheduler | None:
+    return _scheduler
+
+
+def record_activity() -> None:
+    """Note a translation request; no-op when the scheduler is disabled."""
+    if _scheduler is not None:
+        _scheduler.record_activity()
+
+
+def record_routed_model(model: str) -> None:
+    """Note a model picked by language-pair routing; no-op when the scheduler is disabled."""
+    if _scheduler is not None:
+        _scheduler.record_model(model)
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
@@ -12,7 +11,7 @@ from fastapi.responses import FileResponse
 from backend.config import Settings
 from backend.dependencies import init_providers, get_stt, get_tts, get_translate
 from backend.providers import create_stt, create_tts, create_translate
-from backend.routers import stt, tts, translate, pipeline, config, sessions, messages, search, retention
+from backend.routers import stt, tts, translate, pipeline, broadcast, conversation, config, sessions, messages, search, retention, admin, export
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
@@ -35,6 +34,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Initialize database if history is enabled
     embedding_provider = None
+    db_ready = False
     if settings.history_enabled:
         try:
             from backend.database.connection import init_db, get_engine
@@ -43,13 +43,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             from sqlalchemy import text
             async with get_engine().begin() as conn:
                 await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             from backend.database.models import Base
             async with get_engine().begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
             logger.info("Database initialized")
-            # Start cleanup background task
-            from backend.database.cleanup import cleanup_loop
-            asyncio.create_task(cleanup_loop())
+            db_ready = True
             # Create embedding provider singleton
             from backend.providers.embedding.ollama_embed import OllamaEmbeddingProvider
             embedding_provider = OllamaEmbeddingProvider(
@@ -60,8 +59,100 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     init_providers(settings, stt_provider, tts_provider, translate_provider, embedding_provider)
 
+    from backend.supervisor import TaskSupervisor, init_supervisor
+    supervisor = TaskSupervisor(
+        leader_retry_s=settings.supervisor_leader_retry_s,
+        backoff_max_s=settings.supervisor_backoff_max_s,
+    )
+    init_supervisor(supervisor)
+    if db_ready:
+        # One process per deployment runs these (Postgres advisory lock per task)
+        from backend.database.cleanup import audio_sweep_loop, audio_sweep_stats, cleanup_loop, cleanup_stats
+        from backend.database.partitions import partition_loop, partition_stats
+        supervisor.add("cleanup", cleanup_loop, leader=True, stats=cleanup_stats)
+        supervisor.add("audio-sweep", audio_sweep_loop, leader=True, stats=audio_sweep_stats)
+        supervisor.add("partitions", partition_loop, leader=True, stats=partition_stats)
+
+    history_writer = None
+    if db_ready:
+        from backend.database.archive import OpusArchiver
+        from backend.database.writer import HistoryWriter, init_history_writer
+        history_writer = HistoryWriter(
+            settings.audio_storage_path,
+            max_queue=settings.history_queue_size,
+            batch_size=settings.history_batch_size,
+            flush_interval_s=settings.history_flush_interval_ms / 1000,
+            archiver=OpusArchiver(
+                settings.audio_storage_path,
+                concurrency=settings.archive_encoder_concurrency,
+                max_queue=settings.archive_queue_size,
+            ),
+        )
+        init_history_writer(history_writer)
+        history_writer.start()
+
+    embedding_queue = None
+    if embedding_provider:
+        from backend.embeddings import EmbeddingQueue, init_embedding_queue
+        embedding_queue = EmbeddingQueue(
+            embedding_provider,
+            batch_size=settings.embedding_batch_size,
+            flush_interval_s=settings.embedding_flush_interval_ms / 1000,
+        )
+        init_embedding_queue(embedding_queue)
+        embedding_queue.start()
+
+    scheduler = None
+    if settings.keepalive_enabled and settings.translate_provider == "local":
+        from backend.keepalive import KeepAliveScheduler, init_keepalive
+        scheduler = KeepAliveScheduler(
+            settings.ollama_url,
+            settings.ollama_model,
+            settings.embedding_url if embedding_provider else None,
+            settings.embedding_model if embedding_provider else None,
+            interval_s=settings.keepalive_interval_s,
+            history_days=settings.keepalive_history_days,
+            active_rate=settings.keepalive_active_rate,
+            idle_grace_s=settings.keepalive_idle_grace_s,
+            history_enabled=db_ready,
+        )
+        init_keepalive(scheduler)
+        # Per process: it reacts to the translation requests this process sees
+        supervisor.add("keepalive", scheduler.run, stats=scheduler.status)
+
+    job_pool = None
+    if db_ready and settings.jobs_enabled:
+        from backend.jobs import JobWorkerPool, init_job_pool
+        job_pool = JobWorkerPool(
+            settings.jobs_concurrency,
+            poll_interval_s=settings.jobs_poll_interval_s,
+            stale_after_s=settings.jobs_stale_after_s,
+            max_attempts=settings.jobs_max_attempts,
+            retention_hours=settings.jobs_retention_hours,
+        )
+        init_job_pool(job_pool)
+        # Every replica works the queue (SKIP LOCKED); job audio lives in JOBS_STORAGE_PATH,
+        # which must therefore be a volume shared by all replicas
+        supervisor.add("jobs", job_pool.run, stats=job_pool.status)
+
     yield
 
+    await supervisor.stop()
+    if job_pool:
+        try:
+            await job_pool.release()
+        except Exception as exc:
+            logger.warning("Could not requeue running jobs: %s", exc)
+        await job_pool.cleanup()
+    if scheduler:
+        await scheduler.cleanup()
+
+    if history_writer:
+        # Flush queued history before the providers and the engine go away
+        await history_writer.stop()
+    if embedding_queue:
+        await embedding_queue.stop()
+
     logger.info("Shutting down providers")
     await get_stt().cleanup()
     if tts_provider:
@@ -97,11 +188,15 @@ app.include_router(stt.router)
 app.include_router(tts.router)
 app.include_router(translate.router)
 app.include_router(pipeline.router)
+app.include_router(broadcast.router)
+app.include_router(conversation.router)
 app.include_router(config.router)
 app.include_router(sessions.router)
 app.include_router(messages.router)
 app.include_router(search.router)
 app.include_router(retention.router)
+app.include_router(admin.router)
+app.include_router(export.router)
 
 # Gateway (v1 API for external clients)
 if Settings().gateway_enabled:
@@ -67,6 +67,60 @@ class PipelineResponse(BaseModel):
     tts_ms: int | None = None
 
 
+class FanoutResult(BaseModel):
+    target_lang: str
+    translated_text: str | None = None
+    audio: str | None = None  # base64
+    audio_format: str = "wav"
+    translate_ms: int | None = None
+    tts_ms: int | None = None
+    listeners: int = 0
+    error: str | None = None
+
+
+class FanoutResponse(BaseModel):
+    original_text: str
+    detected_language: str
+    results: list[FanoutResult]
+    duration_ms: int
+    stt_ms: int
+
+
+class ConversationStart(BaseModel):
+    """First message on /api/conversation; fixed for the whole conversation.
+
+    Turns in direction "source" are spoken in source_lang and answered in
+    target_lang with ``voice``; "target" turns go the other way with
+    ``voice_reverse`` (falls back to ``voice``).
+    """
+    source_lang: str
+    target_lang: str
+    session_id: str | None = None
+    profile_id: str | None = None
+    tts: bool = True
+    tts_provider: str | None = None
+    voice: str | None = None
+    voice_reverse: str | None = None
+    exaggeration: float | None = None
+    cfg_weight: float | None = None
+    temperature: float | None = None
+    model: str | None = None
+    provider: str | None = None
+    api_url: str | None = None
+    api_key: str | None = None
+    chatterbox_url: str | None = None
+    ollama_url: str | None = None
+    ollama_keep_alive: str | None = None
+    ollama_context_length: int | None = None
+    deepl_free: bool = True
+    elevenlabs_key: str | None = None
+    elevenlabs_voice_id: str | None = None
+    elevenlabs_voice_id_reverse: str | None = None
+    elevenlabs_model: str | None = None
+    elevenlabs_stability: float | None = None
+    elevenlabs_similarity: float | None = None
+
+
 class ConfigResponse(BaseModel):
     stt_provider: str
     tts_provider: str
@@ -118,6 +172,7 @@ class LanguagesResponse(BaseModel):
 class GpuStatusResponse(BaseModel):
     ollama: dict
     chatterbox: dict
+    keepalive: dict | None = None
 
 
 class HealthProviderInfo(BaseModel):
@@ -185,7 +240,9 @@ class SessionResponse(BaseModel):
 
 class SessionListResponse(BaseModel):
     sessions: list[SessionResponse]
-    total: int
+    total: int | None = None        # None with total=none
+    total_estimated: bool = False   # True when taken from planner statistics
+    next_cursor: str | None = None  # pass as ?cursor= for the next page; None on the last page
 
 
 class MessageResponse(BaseModel):
@@ -201,9 +258,17 @@ class MessageResponse(BaseModel):
     translate_ms: int | None = None
     tts_ms: int | None = None
     model_used: str | None = None
+    approved: bool = False
     created_at: str
 
 
+class MessageUpdate(BaseModel):
+    translated_text: str | None = None
+    approved: bool | None = None
+
+
 class MessageListResponse(BaseModel):
     messages: list[MessageResponse]
     total: int
+    next_cursor: str | None = None  # ?after= for later messages; None when there are none
+    prev_cursor: str | None = None  # ?before= for earlier messages; None when there are none
@@ -0,0 +1,27 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor encodes the sort key of the last row of a page (e.g. its
+timestamp and id); the next page continues strictly after it, so deep
+pages cost the same as the first and rows inserted meanwhile do not shift
+the results.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+
+
+def encode_cursor(ts: datetime, row_id: uuid.UUID) -> str:
+    raw = json.dumps([ts.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of ``encode_cursor``; raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(ts), uuid.UUID(row_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
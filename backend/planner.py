@@ -0,0 +1,80 @@
+"""Per-request execution planner for the STT -> translate -> TTS pipeline.
+
+The planner decides which stages actually run:
+
+* ``stt_task="translate"`` lets Whisper produce English directly when the
+  target is English and the profile allows it (no LLM call).
+* Translation is skipped when the detected language already equals the
+  target, or served from the translation memory.
+* TTS is skipped when disabled and served from the TTS cache on a hit.
+
+Every decision is kept on the plan and written to the benchmark entry.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PipelinePlan:
+    stt_task: str = "transcribe"   # "transcribe" | "translate"
+    translate: str = "llm"         # "llm" | "whisper" | "skip" | "memory"
+    tts: str = "synthesize"        # "synthesize" | "cache" | "skip"
+    decisions: list[str] = field(default_factory=list)
+
+    def after_stt(self, detected_lang: str, target_lang: str) -> None:
+        """Settle the translate stage once the spoken language is known."""
+        if self.stt_task == "translate":
+            self.translate = "whisper"
+            self.decisions.append("translate: done by whisper task=translate")
+        elif detected_lang == target_lang:
+            self.translate = "skip"
+            self.decisions.append(f"translate: skipped, detected language is already {target_lang}")
+
+    def transcript_lang(self, detected_lang: str) -> str:
+        """Language of the STT text: English when Whisper translated it, else the spoken language."""
+        return "en" if self.stt_task == "translate" else detected_lang
+
+    def use_memory(self, match: str) -> None:
+        self.translate = "memory"
+        self.decisions.append(f"translate: translation memory ({match})")
+
+    def use_tts_cache(self) -> None:
+        self.tts = "cache"
+        self.decisions.append("tts: served from cache")
+
+    @property
+    def needs_llm(self) -> bool:
+        return self.translate == "llm"
+
+    def to_log(self) -> dict:
+        return {
+            "stt_task": self.stt_task,
+            "translate": self.translate,
+            "tts": self.tts,
+            "decisions": list(self.decisions),
+        }
+
+
+def plan_pipeline(
+    source_lang: str | None,
+    target_lang: str,
+    tts: bool,
+    profile_id: str | None = None,
+    whisper_translate_enabled: bool = True,
+) -> PipelinePlan:
+    """Build the initial plan before STT runs."""
+    plan = PipelinePlan()
+    if not tts:
+        plan.tts = "skip"
+        plan.decisions.append("tts: disabled by request")
+
+    if target_lang != "en" or source_lang == "en" or not whisper_translate_enabled:
+        return plan
+
+    from backend.profiles import get_profile
+
+    profile = get_profile(profile_id) if profile_id else None
+    if profile is not None and profile.whisper_translate:
+        plan.stt_task = "translate"
+        plan.decisions.append(f"stt: whisper task=translate (profile {profile.id})")
+    return plan
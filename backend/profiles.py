@@ -18,6 +18,8 @@ class IndustryProfile:
     tts_enabled_default: bool
     recommended_model: str
     description: str
+    # Whisper darf bei Ziel Englisch direkt übersetzen (ohne LLM, ohne Profil-Prompt)
+    whisper_translate: bool = False
 
 
 MEDICAL_PROMPT = (
@@ -110,6 +112,7 @@ _PROFILES: list[IndustryProfile] = [
         tts_enabled_default=True,
         recommended_model="gemma3:4b",
         description="Rezeption, Concierge, Restaurant",
+        whisper_translate=True,
     ),
     IndustryProfile(
         id="government",
@@ -140,6 +143,7 @@ _PROFILES: list[IndustryProfile] = [
         tts_enabled_default=True,
         recommended_model="gemma3:4b",
         description="Geschäfte, Boutiquen, Märkte",
+        whisper_translate=True,
     ),
     IndustryProfile(
         id="education",
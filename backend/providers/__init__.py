@@ -9,6 +9,10 @@ def create_stt(settings: Settings) -> STTProvider:
             model_size=settings.whisper_model,
             device=settings.device,
             compute_type=settings.whisper_compute_type,
+            num_workers=settings.whisper_num_workers,
+            chunk_threshold_s=settings.stt_chunk_threshold_s,
+            chunk_max_s=settings.stt_chunk_max_s,
+            chunk_overlap_s=settings.stt_chunk_overlap_s,
         )
     raise ValueError(f"Unknown STT provider: {settings.stt_provider}")
 
@@ -1,10 +1,35 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass
+class TranscriptSegment:
+    start: float  # seconds from the start of the recording
+    end: float
+    text: str
 
 
 class STTProvider(ABC):
     @abstractmethod
-    async def transcribe(self, audio: bytes, language: str | None = None) -> tuple[str, str]:
-        """Transcribe audio bytes. Returns (text, detected_language)."""
+    async def transcribe(
+        self, audio: bytes, language: str | None = None, task: str = "transcribe",
+    ) -> tuple[str, str]:
+        """Transcribe audio bytes. Returns (text, detected_language).
+
+        ``task="translate"`` asks for English output in the same pass where
+        the backend supports it.
+        """
+
+    async def transcribe_segments(
+        self, audio: bytes, language: str | None = None, task: str = "transcribe",
+    ) -> tuple[list[TranscriptSegment], str]:
+        """Transcribe into timed segments. Returns (segments, detected_language).
+
+        Providers without timing information return the whole text as one
+        segment with zero timestamps.
+        """
+        text, lang = await self.transcribe(audio, language, task=task)
+        return ([TranscriptSegment(0.0, 0.0, text)] if text else []), lang
 
     async def cleanup(self) -> None:
         """Release resources."""
@@ -27,6 +52,11 @@ class TranslateProvider(ABC):
     ) -> str:
         """Translate text. Returns translated string."""
 
+    @property
+    def model(self) -> str | None:
+        """Default model used when ``translate`` gets none (None if not model-based)."""
+        return None
+
     async def cleanup(self) -> None:
         """Release resources."""
 
@@ -36,5 +66,9 @@ class EmbeddingProvider(ABC):
     async def embed(self, text: str) -> list[float]:
         """Generate embedding vector for text."""
 
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts; providers with a batch API override this."""
+        return [await self.embed(text) for text in texts]
+
     async def cleanup(self) -> None:
         """Release resources."""
@@ -24,5 +24,15 @@ class OllamaEmbeddingProvider(EmbeddingProvider):
             raise ValueError(f"Empty embedding from {self._model}")
         return embedding
 
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        resp = await self._client.post("/api/embed", json={"model": self._model, "input": texts})
+        resp.raise_for_status()
+        embeddings = resp.json().get("embeddings", [])
+        if len(embeddings) != len(texts) or not all(embeddings):
+            raise ValueError(f"Expected {len(texts)} embeddings from {self._model}, got {len(embeddings)}")
+        return embeddings
+
     async def cleanup(self) -> None:
         await self._client.aclose()
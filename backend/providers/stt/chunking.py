@@ -0,0 +1,70 @@
+"""Split long recordings into chunks at silences and stitch the results.
+
+Chunks are cut in silences found by VAD and never exceed ``max_len``
+seconds.  A single speech region longer than that is hard-split into
+windows overlapping by ``overlap`` seconds.  Every chunk owns the time
+range up to the midpoint of its boundary with the next one; when stitching,
+a segment is kept only by the chunk that owns its midpoint, so words in an
+overlap are not duplicated.
+"""
+
+from dataclasses import dataclass
+
+from backend.providers.base import TranscriptSegment
+
+
+@dataclass
+class Chunk:
+    start: float      # audio range to transcribe, seconds
+    end: float
+    own_start: float  # segments with their midpoint in [own_start, own_end) belong to this chunk
+    own_end: float
+
+
+def plan_chunks(
+    speech: list[tuple[float, float]], duration: float, max_len: float, overlap: float = 1.0,
+) -> list[Chunk]:
+    """Group VAD speech regions (seconds) into chunks of at most ``max_len``."""
+    if not speech:
+        return []
+    overlap = min(overlap, max_len / 2)
+    ranges: list[tuple[float, float]] = []
+    cur_start, cur_end = speech[0][0], speech[0][0]
+    for start, end in speech:
+        if end - cur_start <= max_len:
+            cur_end = end
+            continue
+        if cur_end > cur_start:
+            # Cut in the silence before this region
+            ranges.append((cur_start, cur_end))
+            cur_start = start
+        while end - cur_start > max_len:
+            ranges.append((cur_start, cur_start + max_len))
+            cur_start += max_len - overlap
+        cur_end = end
+    ranges.append((cur_start, cur_end))
+
+    chunks: list[Chunk] = []
+    for i, (start, end) in enumerate(ranges):
+        own_start = 0.0 if i == 0 else chunks[-1].own_end
+        if i + 1 < len(ranges):
+            next_start = ranges[i + 1][0]
+            # Overlapping windows split the overlap, silence cuts split the gap
+            own_end = (next_start + end) / 2
+        else:
+            own_end = max(duration, end)
+        chunks.append(Chunk(start, min(end, duration), own_start, own_end))
+    return chunks
+
+
+def stitch(results: list[tuple[Chunk, list[TranscriptSegment]]]) -> list[TranscriptSegment]:
+    """Merge per-chunk segments (already in absolute time) in order, dropping overlap duplicates."""
+    merged: list[TranscriptSegment] = []
+    last = len(results) - 1
+    for i, (chunk, segments) in enumerate(results):
+        for seg in segments:
+            mid = (seg.start + seg.end) / 2
+            if mid >= chunk.own_start and (mid < chunk.own_end or i == last):
+                merged.append(seg)
+    merged.sort(key=lambda seg: seg.start)
+    return merged
@@ -1,14 +1,18 @@
+import asyncio
 import io
 import logging
-import tempfile
-from pathlib import Path
 
 from faster_whisper import WhisperModel
+from faster_whisper.audio import decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 
-from backend.providers.base import STTProvider
+from backend.providers.base import STTProvider, TranscriptSegment
+from backend.providers.stt.chunking import Chunk, plan_chunks, stitch
 
 logger = logging.getLogger(__name__)
 
+SAMPLE_RATE = 16000
+
 
 def _resolve_device(device: str) -> tuple[str, str]:
     """Resolve 'auto' device to actual device + compute type."""
@@ -26,50 +30,120 @@ def _resolve_device(device: str) -> tuple[str, str]:
 
 
 class WhisperLocalProvider(STTProvider):
-    def __init__(self, model_size: str, device: str, compute_type: str) -> None:
+    def __init__(
+        self,
+        model_size: str,
+        device: str,
+        compute_type: str,
+        *,
+        num_workers: int = 1,
+        chunk_threshold_s: float = 120.0,
+        chunk_max_s: float = 30.0,
+        chunk_overlap_s: float = 1.0,
+    ) -> None:
         self._model_size = model_size
         self._device_raw = device
         self._compute_type = compute_type
+        self._num_workers = max(num_workers, 1)
+        self._chunk_threshold_s = chunk_threshold_s
+        self._chunk_max_s = chunk_max_s
+        self._chunk_overlap_s = chunk_overlap_s
         self._model: WhisperModel | None = None
+        # Bounds concurrent model.transcribe calls to the model's worker count
+        self._slots = asyncio.Semaphore(self._num_workers)
 
     def _ensure_model(self) -> WhisperModel:
         if self._model is None:
             device, compute = _resolve_device(self._device_raw)
             if self._compute_type != "int8":
                 compute = self._compute_type
-            logger.info("Loading Whisper model=%s device=%s compute=%s", self._model_size, device, compute)
+            logger.info(
+                "Loading Whisper model=%s device=%s compute=%s workers=%d",
+                self._model_size, device, compute, self._num_workers,
+            )
             self._model = WhisperModel(
                 self._model_size,
                 device=device,
                 compute_type=compute,
+                num_workers=self._num_workers,
             )
         return self._model
 
-    async def transcribe(self, audio: bytes, language: str | None = None) -> tuple[str, str]:
+    async def transcribe(
+        self, audio: bytes, language: str | None = None, task: str = "transcribe",
+    ) -> tuple[str, str]:
+        segments, detected_lang = await self.transcribe_segments(audio, language, task=task)
+        return " ".join(seg.text for seg in segments if seg.text), detected_lang
+
+    async def transcribe_segments(
+        self, audio: bytes, language: str | None = None, task: str = "transcribe",
+    ) -> tuple[list[TranscriptSegment], str]:
         if not audio or len(audio) < 100:
-            return "", language or "unknown"
+            return [], language or "unknown"
 
         model = self._ensure_model()
+        try:
+            samples = await asyncio.to_thread(decode_audio, io.BytesIO(audio), SAMPLE_RATE)
+        except Exception as exc:
+            logger.warning("Whisper could not decode audio (%d bytes): %s", len(audio), exc)
+            return [], language or "unknown"
+        duration = len(samples) / SAMPLE_RATE
+
+        if duration <= self._chunk_threshold_s:
+            return await self._run(model, samples, 0.0, language, task)
 
-        # Use .webm suffix — ffmpeg (bundled with faster-whisper) handles the conversion
-        with tempfile.NamedTemporaryFile(suffix=".webm", delete=True) as tmp:
-            tmp.write(audio)
-            tmp.flush()
+        # Long recording: cut at silences and transcribe chunks in parallel
+        regions = await asyncio.to_thread(
+            get_speech_timestamps, samples, VadOptions(min_silence_duration_ms=500),
+        )
+        speech = [(r["start"] / SAMPLE_RATE, r["end"] / SAMPLE_RATE) for r in regions]
+        chunks = plan_chunks(speech, duration, self._chunk_max_s, self._chunk_overlap_s)
+        if not chunks:
+            return [], language or "unknown"
+        logger.info(
+            "Transcribing %.0fs of audio in %d chunks (%d workers)", duration, len(chunks), self._num_workers,
+        )
 
+        def _slice(chunk: Chunk):
+            return samples[int(chunk.start * SAMPLE_RATE):int(chunk.end * SAMPLE_RATE)]
+
+        results: list[tuple[Chunk, list[TranscriptSegment]]] = []
+        detected_lang = language
+        rest = chunks
+        if language is None:
+            # Detect once on the first chunk so every chunk uses the same language
+            first_segments, detected_lang = await self._run(model, _slice(chunks[0]), chunks[0].start, None, task)
+            results.append((chunks[0], first_segments))
+            rest = chunks[1:]
+        outputs = await asyncio.gather(*(
+            self._run(model, _slice(chunk), chunk.start, detected_lang, task) for chunk in rest
+        ))
+        results.extend((chunk, segments) for chunk, (segments, _) in zip(rest, outputs))
+        return stitch(results), detected_lang or "unknown"
+
+    async def _run(
+        self, model: WhisperModel, samples, offset: float, language: str | None, task: str,
+    ) -> tuple[list[TranscriptSegment], str]:
+        def _transcribe() -> tuple[list[TranscriptSegment], str]:
+            segments, info = model.transcribe(
+                samples,
+                language=language,
+                task=task,
+                beam_size=5,
+                vad_filter=True,
+            )
+            # The generator does the decoding work, so consume it in this thread
+            return [
+                TranscriptSegment(offset + seg.start, offset + seg.end, seg.text.strip())
+                for seg in segments
+            ], info.language or language or "unknown"
+
+        async with self._slots:
             try:
-                segments, info = model.transcribe(
-                    tmp.name,
-                    language=language,
-                    beam_size=5,
-                    vad_filter=True,
-                )
-                text = " ".join(seg.text.strip() for seg in segments)
-                detected_lang = info.language or language or "unknown"
+                return await asyncio.to_thread(_transcribe)
             except ValueError:
-                logger.warning("Whisper could not process audio (%d bytes)", len(audio))
-                return "", language or "unknown"
-
-        return text, detected_lang
+                logger.warning("Whisper could not process audio (%d samples)", len(samples))
+                return [], language or "unknown"
 
     async def cleanup(self) -> None:
         self._model = None
@@ -19,6 +19,10 @@ class OllamaLocalProvider(TranslateProvider):
         self._base_url = base_url.rstrip("/")
         self._client = httpx.AsyncClient(timeout=120.0)
 
+    @property
+    def model(self) -> str:
+        return self._model
+
     async def translate(
         self, text: str, source: str, target: str,
         model: str | None = None, **kwargs: object,
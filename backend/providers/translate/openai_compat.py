@@ -22,6 +22,10 @@ class OpenAICompatProvider(TranslateProvider):
             headers["Authorization"] = f"Bearer {api_key}"
         self._client = httpx.AsyncClient(timeout=120.0, headers=headers)
 
+    @property
+    def model(self) -> str:
+        return self._model
+
     async def translate(
         self, text: str, source: str, target: str,
         model: str | None = None, **kwargs: object,
@@ -3,10 +3,16 @@
 Routers use these to create ad-hoc providers when the frontend requests
 a different provider/URL than the startup singleton.  Ad-hoc providers
 must always be cleaned up in a ``finally`` block.
+
+The hedging helpers wrap a resolved provider: if it is slower than its
+recent latency percentile, a configured fallback is raced against it.
 """
 
 from backend.dependencies import get_settings, get_tts, get_translate
+from backend.hedging import get_latency_tracker, hedged_call
+from backend.keepalive import record_routed_model
 from backend.providers.base import TTSProvider, TranslateProvider
+from backend.routing import route_model
 
 
 def resolve_tts(
@@ -50,8 +56,14 @@ def resolve_translate(
     model: str | None,
     ollama_url: str | None = None,
     deepl_free: bool = True,
+    source: str | None = None,
+    target: str | None = None,
 ) -> tuple[TranslateProvider, bool]:
-    """Return (provider_instance, is_ad_hoc). Ad-hoc providers must be cleaned up."""
+    """Return (provider_instance, is_ad_hoc). Ad-hoc providers must be cleaned up.
+
+    When no model is given and the request goes to Ollama, the language-pair
+    routing table may pick one; the returned provider's ``model`` reflects it.
+    """
     if provider == "openai" and api_url:
         from backend.providers.translate.openai_compat import OpenAICompatProvider
 
@@ -62,11 +74,176 @@ def resolve_translate(
         from backend.providers.translate.deepl_remote import DeepLRemoteProvider
 
         return DeepLRemoteProvider(api_key=api_key, free=deepl_free), True
+    s = get_settings()
+    routed: str | None = None
+    if model is None and (ollama_url or s.translate_provider == "local"):
+        routed = route_model(source, target)
+        if routed and not ollama_url:
+            record_routed_model(routed)
     if ollama_url:
         from backend.providers.translate.ollama_local import OllamaLocalProvider
 
-        s = get_settings()
         return OllamaLocalProvider(
-            model=model or s.ollama_model, base_url=ollama_url,
+            model=model or routed or s.ollama_model, base_url=ollama_url,
         ), True
-    return get_translate(), False
+    singleton = get_translate()
+    if routed and routed != singleton.model:
+        return _RoutedModel(singleton, routed), False
+    return singleton, False
+
+
+class _RoutedModel(TranslateProvider):
+    """The translate singleton with a routed default model.
+
+    Only the model passed per call changes, so routed requests share the
+    singleton's HTTP client instead of opening a connection of their own.
+    """
+
+    def __init__(self, provider: TranslateProvider, model: str) -> None:
+        self._provider = provider
+        self._model = model
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    async def translate(
+        self, text: str, source: str, target: str,
+        model: str | None = None, **kwargs: object,
+    ) -> str:
+        return await self._provider.translate(text, source, target, model or self._model, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Hedging policy
+# ---------------------------------------------------------------------------
+
+def _hedge_delay(primary_name: str) -> float | None:
+    """Seconds to wait before hedging, or None while history is too thin."""
+    s = get_settings()
+    p = get_latency_tracker().percentile(primary_name, s.hedge_percentile, s.hedge_min_samples)
+    if p is None:
+        return None
+    return max(p, s.hedge_min_delay_ms) / 1000
+
+
+def translate_fallback_name(primary_name: str) -> str | None:
+    """Name of the configured translate fallback, or None if it does not apply."""
+    s = get_settings()
+    kind = s.hedge_translate_fallback
+    if not s.hedge_enabled or not kind:
+        return None
+    if kind == "deepl" and s.deepl_api_key and not primary_name.startswith("deepl"):
+        return "deepl"
+    if kind == "openai" and s.openai_compat_url and not primary_name.startswith("openai"):
+        return f"openai/{s.openai_compat_model}"
+    if kind == "ollama" and s.hedge_ollama_url:
+        return f"ollama@{s.hedge_ollama_url}"
+    return None
+
+
+def resolve_translate_fallback(name: str, model: str | None) -> TranslateProvider:
+    """Create the ad-hoc fallback provider named by ``translate_fallback_name``."""
+    s = get_settings()
+    if name == "deepl":
+        from backend.providers.translate.deepl_remote import DeepLRemoteProvider
+
+        return DeepLRemoteProvider(api_key=s.deepl_api_key or "", free=s.deepl_free)
+    if name.startswith("openai/"):
+        from backend.providers.translate.openai_compat import OpenAICompatProvider
+
+        return OpenAICompatProvider(
+            model=s.openai_compat_model, base_url=s.openai_compat_url, api_key=s.openai_api_key or "",
+        )
+    from backend.providers.translate.ollama_local import OllamaLocalProvider
+
+    return OllamaLocalProvider(model=model or s.ollama_model, base_url=s.hedge_ollama_url)
+
+
+def tts_fallback_name(primary_name: str) -> str | None:
+    """Name of the configured TTS fallback, or None if it does not apply."""
+    s = get_settings()
+    kind = s.hedge_tts_fallback
+    if not s.hedge_enabled or not kind or kind == primary_name:
+        return None
+    if kind == "local" and s.tts_provider == "local" and get_tts() is not None:
+        return "local"
+    if kind == "chatterbox" and s.chatterbox_url:
+        return "chatterbox"
+    return None
+
+
+async def translate_hedged(
+    translator: TranslateProvider,
+    primary_name: str,
+    text: str,
+    source: str,
+    target: str,
+    model: str | None = None,
+    **kwargs: object,
+) -> tuple[str, dict | None]:
+    """Translate with the hedging policy. Returns (text, hedge log entry or None)."""
+    fallback_name = translate_fallback_name(primary_name)
+
+    async def _primary() -> str:
+        return await translator.translate(text, source, target, model, **kwargs)
+
+    async def _fallback() -> str:
+        assert fallback_name is not None
+        # A fallback Ollama serves the same model; other backends use their own
+        fb_model = model if fallback_name.startswith("ollama@") else None
+        fb = resolve_translate_fallback(fallback_name, model)
+        try:
+            return await fb.translate(text, source, target, fb_model, **kwargs)
+        finally:
+            await fb.cleanup()
+
+    result = await hedged_call(
+        _primary,
+        _fallback if fallback_name else None,
+        _hedge_delay(primary_name) if fallback_name else None,
+        primary_key=primary_name,
+        fallback_key=fallback_name,
+    )
+    if fallback_name is None:
+        return result.value, None
+    return result.value, result.to_log(primary_name, fallback_name)
+
+
+async def synthesize_hedged(
+    tts_impl: TTSProvider,
+    primary_name: str,
+    text: str,
+    lang: str,
+    voice: str | None = None,
+    **kwargs: object,
+) -> tuple[bytes, str, dict | None]:
+    """Synthesize with the hedging policy. Returns (audio, winning provider name, hedge log entry or None)."""
+    fallback_name = tts_fallback_name(primary_name)
+
+    async def _primary() -> bytes:
+        return await tts_impl.synthesize(text, lang, voice, **kwargs)
+
+    async def _fallback() -> bytes:
+        # Voices are provider-specific, so the fallback uses its own default voice
+        if fallback_name == "local":
+            singleton = get_tts()
+            assert singleton is not None
+            return await singleton.synthesize(text, lang, None)
+        fb, _ = resolve_tts("chatterbox", None)
+        try:
+            return await fb.synthesize(text, lang, None)
+        finally:
+            await fb.cleanup()
+
+    result = await hedged_call(
+        _primary,
+        _fallback if fallback_name else None,
+        _hedge_delay(primary_name) if fallback_name else None,
+        primary_key=primary_name,
+        fallback_key=fallback_name,
+    )
+    winner = primary_name if result.winner == "primary" else (fallback_name or primary_name)
+    if fallback_name is None:
+        return result.value, winner, None
+    return result.value, winner, result.to_log(primary_name, fallback_name)
@@ -0,0 +1,42 @@
+"""Operational status of background workers."""
+
+from fastapi import APIRouter
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/status")
+async def admin_status() -> dict:
+    from backend.database.cleanup import cleanup_stats
+    from backend.database.partitions import partition_stats
+    from backend.database.writer import get_history_writer
+    from backend.embeddings import get_embedding_queue
+    from backend.jobs import get_job_pool
+    from backend.search_cache import get_query_embedding_cache, get_search_result_cache
+
+    writer = get_history_writer()
+    pool = get_job_pool()
+    embedding_queue = get_embedding_queue()
+    query_cache = get_query_embedding_cache()
+    result_cache = get_search_result_cache()
+    return {
+        "history_writer": writer.stats() if writer else None,
+        "audio_archive": writer.archiver.stats() if writer else None,
+        "embeddings": embedding_queue.stats() if embedding_queue else None,
+        "jobs": pool.status() if pool else None,
+        "cleanup": cleanup_stats(),
+        "partitions": partition_stats(),
+        "search_cache": {
+            "query_embeddings": query_cache.stats() if query_cache else None,
+            "results": result_cache.stats() if result_cache else None,
+        },
+    }
+
+
+@router.get("/tasks")
+async def admin_tasks() -> dict:
+    """Supervised background tasks: state, leadership, restarts and last-run stats."""
+    from backend.supervisor import get_supervisor
+
+    supervisor = get_supervisor()
+    return {"tasks": supervisor.status() if supervisor else {}}
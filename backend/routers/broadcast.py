@@ -0,0 +1,304 @@
+"""Fan-out pipeline and listener broadcast.
+
+``POST /api/pipeline/fanout`` runs STT once and translates + synthesizes the
+utterance for every target language concurrently.  With a ``channel`` the
+results are also published to listeners subscribed via SSE
+(``GET /api/broadcast/{channel}/{lang}``) or WebSocket; every language is
+processed once per utterance regardless of how many listeners it has.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from backend.broadcast import get_broadcast_hub
+from backend.dependencies import get_settings, get_stt
+from backend.keepalive import record_activity
+from backend.models import FanoutResponse, FanoutResult
+from backend.planner import plan_pipeline
+from backend.resolver import resolve_translate, resolve_tts, translate_hedged
+from backend.routers.pipeline import (
+    _log_benchmark,
+    _lookup_translation_memory,
+    _save_message,
+    _synthesize_cached,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["broadcast"])
+
+SSE_KEEPALIVE_S = 15.0
+
+
+def _parse_voices(voices: str | None) -> dict[str, str]:
+    """Parse "ar:omar,tr:ayse" into a per-language voice map."""
+    result: dict[str, str] = {}
+    for item in (voices or "").split(","):
+        lang, sep, name = item.partition(":")
+        if sep and lang.strip() and name.strip():
+            result[lang.strip()] = name.strip()
+    return result
+
+
+@router.post("/pipeline/fanout", response_model=FanoutResponse)
+async def fanout_pipeline(
+    file: UploadFile = File(...),
+    source_lang: str | None = Query(None),
+    target_langs: str = Query("", description="Comma-separated target languages"),
+    channel: str | None = Query(None, description="Broadcast channel; its listeners' languages are added"),
+    tts: bool = Query(True),
+    voice: str | None = Query(None),
+    voices: str | None = Query(None, description="Per-language voices, e.g. ar:omar,tr:ayse"),
+    tts_provider: str | None = Query(None),
+    exaggeration: float | None = Query(None),
+    cfg_weight: float | None = Query(None),
+    temperature: float | None = Query(None),
+    model: str | None = Query(None),
+    provider: str | None = Query(None),
+    api_url: str | None = Query(None),
+    api_key: str | None = Query(None),
+    chatterbox_url: str | None = Query(None),
+    ollama_url: str | None = Query(None),
+    ollama_keep_alive: str | None = Query(None),
+    ollama_context_length: int | None = Query(None),
+    deepl_free: bool = Query(True),
+    elevenlabs_key: str | None = Query(None),
+    elevenlabs_voice_id: str | None = Query(None),
+    elevenlabs_model: str | None = Query(None),
+    elevenlabs_stability: float | None = Query(None),
+    elevenlabs_similarity: float | None = Query(None),
+    session_id: str | None = Query(None),
+    profile_id: str | None = Query(None),
+    max_parallel: int | None = Query(None, ge=1),
+) -> FanoutResponse:
+    total_start = time.perf_counter()
+    record_activity()
+    s = get_settings()
+    hub = get_broadcast_hub()
+
+    targets = [t.strip() for t in target_langs.split(",") if t.strip()]
+    if channel:
+        targets += hub.languages(channel)
+    targets = list(dict.fromkeys(targets))
+    if not targets:
+        raise HTTPException(status_code=400, detail="No target languages and no listeners on the channel")
+
+    # 1. STT once for all targets (no Whisper translate: the transcript is shared)
+    t0 = time.perf_counter()
+    audio = await file.read()
+    text, detected_lang = await get_stt().transcribe(audio, source_lang)
+    stt_ms = int((time.perf_counter() - t0) * 1000)
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="No speech detected")
+
+    voice_map = _parse_voices(voices)
+    tts_provider_name = tts_provider or s.tts_provider
+    tts_params: dict[str, object] = {
+        "exaggeration": exaggeration,
+        "cfg_weight": cfg_weight,
+        "temperature": temperature,
+        "stability": elevenlabs_stability,
+        "similarity_boost": elevenlabs_similarity,
+    }
+    semaphore = asyncio.Semaphore(max_parallel or s.fanout_max_parallel)
+    audio_saved = False  # the recording is the same for every target; store it with one message
+
+    async def _one(target: str) -> FanoutResult:
+        nonlocal audio_saved
+        async with semaphore:
+            plan = plan_pipeline(detected_lang, target, tts, profile_id, whisper_translate_enabled=False)
+            plan.after_stt(detected_lang, target)
+            result = FanoutResult(target_lang=target)
+            translated = text
+            effective_model = model
+            translate_provider_name = provider or s.translate_provider
+            tm_match = None
+            t0 = time.perf_counter()
+            try:
+                # 2. Translate
+                if plan.needs_llm:
+                    tm_match = await _lookup_translation_memory(text, detected_lang, target, session_id, profile_id)
+                    if tm_match:
+                        plan.use_memory(tm_match.match)
+                        translated = tm_match.translated_text
+                if plan.needs_llm:
+                    translator, ad_hoc = resolve_translate(
+                        provider, api_url, api_key, model, ollama_url, deepl_free,
+                        source=detected_lang, target=target,
+                    )
+                    effective_model = model or translator.model
+                    if translate_provider_name == "local":
+                        translate_provider_name = f"ollama/{effective_model or s.ollama_model}"
+                    translate_kwargs: dict[str, object] = {}
+                    if ollama_keep_alive is not None:
+                        translate_kwargs["keep_alive"] = ollama_keep_alive
+                    if ollama_context_length is not None:
+                        translate_kwargs["num_ctx"] = ollama_context_length
+                    if profile_id:
+                        from backend.profiles import get_system_prompt
+                        translate_kwargs["system_prompt"] = get_system_prompt(profile_id, detected_lang, target)
+                    try:
+                        translated, _ = await translate_hedged(
+                            translator, translate_provider_name,
+                            text, detected_lang, target, effective_model,
+                            **translate_kwargs,
+                        )
+                    finally:
+                        if ad_hoc:
+                            await translator.cleanup()
+                else:
+                    translate_provider_name = plan.translate
+                result.translated_text = translated
+                result.translate_ms = int((time.perf_counter() - t0) * 1000)
+
+                # 3. TTS
+                if plan.tts != "skip":
+                    t0 = time.perf_counter()
+                    target_voice = voice_map.get(target) or (
+                        voice if tts_provider != "elevenlabs" else elevenlabs_voice_id
+                    )
+                    audio_bytes, result.audio_format, _ = await _synthesize_cached(
+                        plan,
+                        lambda: resolve_tts(
+                            tts_provider, voice, chatterbox_url,
+                            elevenlabs_key, elevenlabs_voice_id, elevenlabs_model,
+                            elevenlabs_stability, elevenlabs_similarity,
+                        ),
+                        tts_provider_name,
+                        f"{chatterbox_url or ''}/{elevenlabs_model or ''}",
+                        translated, target, target_voice, tts_params,
+                    )
+                    result.audio = base64.b64encode(audio_bytes).decode()
+                    result.tts_ms = int((time.perf_counter() - t0) * 1000)
+            except Exception as exc:
+                logger.warning("Fan-out to %s failed: %s", target, exc)
+                result.error = str(exc)
+                return result
+
+            if channel:
+                result.listeners = hub.publish(channel, target, {
+                    "type": "utterance",
+                    "original_text": text,
+                    "source_lang": detected_lang,
+                    "lang": target,
+                    "text": translated,
+                    "audio": result.audio,
+                    "audio_format": result.audio_format,
+                })
+
+            _log_benchmark({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "stt_provider": f"whisper-{s.whisper_model}",
+                "translate_provider": translate_provider_name,
+                "tts_provider": tts_provider_name,
+                "source_lang": detected_lang,
+                "target_lang": target,
+                "text_length": len(text),
+                "stt_ms": stt_ms,
+                "translate_ms": result.translate_ms,
+                "tts_ms": result.tts_ms,
+                "total_ms": int((time.perf_counter() - total_start) * 1000),
+                "profile_id": profile_id,
+                "fanout": len(targets),
+                "plan": plan.to_log(),
+            })
+
+            if session_id and s.history_enabled:
+                if plan.needs_llm:
+                    model_used = effective_model or (
+                        s.ollama_model if (provider or s.translate_provider) == "local" else provider or s.translate_provider
+                    )
+                elif tm_match:
+                    model_used = f"tm/{tm_match.match}"
+                else:
+                    model_used = plan.translate
+                # Claimed before the await so concurrent targets don't attach it twice;
+                # failed targets return above, so the audio goes with a message that is saved
+                attach_audio, audio_saved = not audio_saved, True
+                await _save_message(
+                    session_id=session_id,
+                    direction="source",
+                    original_text=text,
+                    translated_text=translated,
+                    original_lang=detected_lang,
+                    translated_lang=target,
+                    audio_data=audio if attach_audio else None,
+                    audio_enabled=attach_audio,
+                    stt_ms=stt_ms,
+                    translate_ms=result.translate_ms,
+                    tts_ms=result.tts_ms,
+                    model_used=model_used,
+                    profile_id=profile_id,
+                )
+            return result
+
+    results = await asyncio.gather(*(_one(t) for t in targets))
+    return FanoutResponse(
+        original_text=text,
+        detected_language=detected_lang,
+        results=list(results),
+        duration_ms=int((time.perf_counter() - total_start) * 1000),
+        stt_ms=stt_ms,
+    )
+
+
+@router.get("/broadcast/{channel}/{lang}")
+async def listen_sse(channel: str, lang: str, request: Request) -> StreamingResponse:
+    """Server-sent events with every utterance published to (channel, lang)."""
+    hub = get_broadcast_hub()
+    queue = hub.subscribe(channel, lang)
+
+    async def _events() -> AsyncIterator[str]:
+        try:
+            yield ": subscribed\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            hub.unsubscribe(channel, lang, queue)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/broadcast/{channel}/{lang}/ws")
+async def listen_ws(ws: WebSocket, channel: str, lang: str) -> None:
+    await ws.accept()
+    hub = get_broadcast_hub()
+    queue = hub.subscribe(channel, lang)
+
+    async def _pump() -> None:
+        while True:
+            await ws.send_json(await queue.get())
+
+    pump = asyncio.create_task(_pump())
+    try:
+        # Listeners only receive; this just waits for the client to go away
+        while (await ws.receive())["type"] != "websocket.disconnect":
+            pass
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pump.cancel()
+        hub.unsubscribe(channel, lang, queue)
+
+
+@router.get("/broadcast")
+async def broadcast_stats() -> dict[str, dict[str, int]]:
+    """Listener counts per channel and language."""
+    return get_broadcast_hub().stats()
@@ -338,7 +338,11 @@ async def get_gpu_status(
     except Exception:
         chatterbox_info = {"error": "unreachable"}
 
-    return GpuStatusResponse(ollama=ollama_info, chatterbox=chatterbox_info)
+    from backend.keepalive import get_keepalive
+    scheduler = get_keepalive()
+    keepalive_info = scheduler.status() if scheduler else {"enabled": False}
+
+    return GpuStatusResponse(ollama=ollama_info, chatterbox=chatterbox_info, keepalive=keepalive_info)
 
 
 @router.get("/chatterbox/languages", response_model=LanguagesResponse)
@@ -0,0 +1,415 @@
+"""Two-person conversation over a single WebSocket.
+
+Protocol (JSON text frames unless noted):
+
+    client -> {"type": "start", ...ConversationStart}
+    server -> {"type": "ready", "session_id": ..., "providers": {...}}
+    client -> {"type": "turn", "direction": "source" | "target"}   (optional)
+    client -> {"type": "partial", "text": ...}                     (optional, live transcript)
+    client -> <binary audio frame>                                 (one turn)
+    server -> {"type": "transcript", ...}
+    server -> {"type": "translation", ...}
+    server -> {"type": "audio", "format": "wav" | "mp3", ...} + <binary audio>
+    client -> {"type": "stop"}
+
+Providers, voices, profile and the session row are resolved once at
+"start" and reused for every turn; ad-hoc providers are cleaned up when the
+socket closes.  A failed turn is reported as {"type": "error"} and the
+conversation continues.
+
+Partial transcripts (e.g. from the browser's live speech recognition) feed
+a ``SpeculativeTranslator``: stable prefixes are translated while the
+speaker is still talking and reused when the turn's final transcript
+still starts with them.
+"""
+
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from backend.dependencies import get_settings, get_stt
+from backend.keepalive import record_activity
+from backend.models import ConversationStart
+from backend.planner import PipelinePlan, plan_pipeline
+from backend.providers.base import TranslateProvider, TTSProvider
+from backend.resolver import resolve_translate, resolve_tts, translate_hedged
+from backend.speculative import SpeculativeTranslator, get_speculation_stats
+from backend.routers.pipeline import (
+    _log_benchmark,
+    _lookup_translation_memory,
+    _save_message,
+    _synthesize_cached,
+)
+
+if TYPE_CHECKING:
+    from backend.database.models import Session
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["conversation"])
+
+DIRECTIONS = ("source", "target")
+
+
+async def _load_session(session_id: str) -> "Session | None":
+    from backend.database.connection import get_session_factory
+    from backend.database.models import Session
+
+    async with get_session_factory()() as db:
+        return await db.get(Session, uuid.UUID(session_id))
+
+
+class Conversation:
+    """Provider set and session state shared by all turns of one socket."""
+
+    def __init__(self, start: ConversationStart, session_row: "Session | None" = None) -> None:
+        self.start = start
+        self.session_row = session_row
+        self.profile_id = start.profile_id or (session_row.profile_id if session_row else None)
+        self.turns = 0
+        self._translators: dict[str, tuple[TranslateProvider, bool]] = {}
+        self._tts: tuple[TTSProvider, bool] | None = None
+        self._speculators: dict[str, SpeculativeTranslator] = {}
+
+    def langs(self, direction: str) -> tuple[str, str]:
+        if direction == "target":
+            return self.start.target_lang, self.start.source_lang
+        return self.start.source_lang, self.start.target_lang
+
+    def voice(self, direction: str) -> str | None:
+        st = self.start
+        if st.tts_provider == "elevenlabs":
+            return (st.elevenlabs_voice_id_reverse if direction == "target" else None) or st.elevenlabs_voice_id
+        return (st.voice_reverse if direction == "target" else None) or st.voice
+
+    @property
+    def translate_provider_name(self) -> str:
+        return self.start.provider or get_settings().translate_provider
+
+    @property
+    def tts_provider_name(self) -> str:
+        return self.start.tts_provider or get_settings().tts_provider
+
+    def translate_kwargs(self, source: str, target: str) -> dict[str, object]:
+        st = self.start
+        kwargs: dict[str, object] = {}
+        if st.ollama_keep_alive is not None:
+            kwargs["keep_alive"] = st.ollama_keep_alive
+        if st.ollama_context_length is not None:
+            kwargs["num_ctx"] = st.ollama_context_length
+        if self.profile_id:
+            from backend.profiles import get_system_prompt
+            kwargs["system_prompt"] = get_system_prompt(self.profile_id, source, target)
+        return kwargs
+
+    def speculate(self, direction: str, partial: str) -> None:
+        """Feed a partial transcript of the running turn."""
+        s = get_settings()
+        source, target = self.langs(direction)
+        if not s.speculative_translation_enabled or source == target:
+            return
+        spec = self._speculators.get(direction)
+        if spec is None:
+            translator, _ = self._translators[direction]
+            spec = SpeculativeTranslator(
+                translator, source, target, self.start.model or translator.model,
+                stable_updates=s.speculative_stable_updates,
+                **self.translate_kwargs(source, target),
+            )
+            self._speculators[direction] = spec
+        spec.update(partial)
+
+    def open(self) -> None:
+        """Resolve providers for both directions (routing is per language pair)."""
+        st = self.start
+        for direction in DIRECTIONS:
+            source, target = self.langs(direction)
+            self._translators[direction] = resolve_translate(
+                st.provider, st.api_url, st.api_key, st.model, st.ollama_url, st.deepl_free,
+                source=source, target=target,
+            )
+        if st.tts:
+            self._tts = resolve_tts(
+                st.tts_provider, st.voice, st.chatterbox_url,
+                st.elevenlabs_key, st.elevenlabs_voice_id, st.elevenlabs_model,
+                st.elevenlabs_stability, st.elevenlabs_similarity,
+            )
+
+    async def close(self) -> None:
+        for spec in self._speculators.values():
+            spec.cancel()
+        self._speculators.clear()
+        seen: set[int] = set()
+        for impl, ad_hoc in [*self._translators.values(), *([self._tts] if self._tts else [])]:
+            if ad_hoc and id(impl) not in seen:
+                seen.add(id(impl))
+                try:
+                    await impl.cleanup()
+                except Exception as exc:
+                    logger.debug("Conversation provider cleanup failed: %s", exc)
+        self._translators.clear()
+        self._tts = None
+
+    def describe(self) -> dict:
+        s = get_settings()
+        models = {
+            direction: translator.model or (s.ollama_model if self.translate_provider_name == "local" else None)
+            for direction, (translator, _) in self._translators.items()
+        }
+        return {
+            "translate": self.translate_provider_name,
+            "models": models,
+            "tts": self.tts_provider_name if self._tts else None,
+        }
+
+    async def run_turn(self, ws: WebSocket, audio: bytes, direction: str) -> None:
+        st = self.start
+        s = get_settings()
+        self.turns += 1
+        turn = self.turns
+        total_start = time.perf_counter()
+        record_activity()
+        source, target = self.langs(direction)
+        plan = plan_pipeline(source, target, st.tts, self.profile_id, s.whisper_translate_enabled)
+        spec = self._speculators.pop(direction, None)
+        try:
+            await self._run_turn(ws, audio, direction, turn, total_start, plan, spec)
+        finally:
+            if spec is not None:
+                spec.cancel()
+
+    async def _run_turn(
+        self, ws: WebSocket, audio: bytes, direction: str, turn: int, total_start: float,
+        plan: PipelinePlan, spec: SpeculativeTranslator | None,
+    ) -> None:
+        st = self.start
+        s = get_settings()
+        source, target = self.langs(direction)
+
+        # 1. STT -- the speaker's language is known from the direction
+        t0 = time.perf_counter()
+        text, detected_lang = await get_stt().transcribe(audio, source, task=plan.stt_task)
+        stt_ms = int((time.perf_counter() - t0) * 1000)
+        if not text.strip():
+            await ws.send_json({"type": "error", "turn": turn, "detail": "No speech detected"})
+            return
+        await ws.send_json({
+            "type": "transcript", "turn": turn, "direction": direction,
+            "text": text, "lang": plan.transcript_lang(detected_lang), "stt_ms": stt_ms,
+        })
+
+        # 2. Translate
+        plan.after_stt(detected_lang, target)
+        t0 = time.perf_counter()
+        translated = text
+        translator, _ = self._translators[direction]
+        effective_model = st.model or translator.model
+        translate_provider_name = self.translate_provider_name
+        translate_hedge: dict | None = None
+        speculation: dict | None = None
+        tm_match = None
+        if plan.needs_llm:
+            tm_match = await _lookup_translation_memory(text, detected_lang, target, st.session_id, self.profile_id)
+            if tm_match:
+                plan.use_memory(tm_match.match)
+                translated = tm_match.translated_text
+        if plan.needs_llm:
+            if translate_provider_name == "local":
+                translate_provider_name = f"ollama/{effective_model or s.ollama_model}"
+            if spec is not None and plan.stt_task == "transcribe":
+                translated, speculation = await spec.finalize(text)
+            else:
+                translated, translate_hedge = await translate_hedged(
+                    translator, translate_provider_name,
+                    text, detected_lang, target, effective_model,
+                    **self.translate_kwargs(detected_lang, target),
+                )
+        else:
+            translate_provider_name = plan.translate
+        translate_ms = int((time.perf_counter() - t0) * 1000)
+        await ws.send_json({
+            "type": "translation", "turn": turn, "direction": direction,
+            "text": translated, "lang": target, "translate_ms": translate_ms,
+            "plan": plan.translate, "speculation": speculation,
+        })
+
+        # 3. TTS with the direction's voice, provider stays resolved
+        tts_ms: int | None = None
+        tts_hedge: dict | None = None
+        if plan.tts != "skip" and self._tts is not None:
+            t0 = time.perf_counter()
+            tts = self._tts
+            audio_bytes, audio_fmt, tts_hedge = await _synthesize_cached(
+                plan,
+                lambda: (tts[0], False),
+                self.tts_provider_name,
+                f"{st.chatterbox_url or ''}/{st.elevenlabs_model or ''}",
+                translated, target, self.voice(direction),
+                {
+                    "exaggeration": st.exaggeration,
+                    "cfg_weight": st.cfg_weight,
+                    "temperature": st.temperature,
+                    "stability": st.elevenlabs_stability,
+                    "similarity_boost": st.elevenlabs_similarity,
+                },
+            )
+            tts_ms = int((time.perf_counter() - t0) * 1000)
+            await ws.send_json({
+                "type": "audio", "turn": turn, "direction": direction,
+                "format": audio_fmt, "bytes": len(audio_bytes), "tts_ms": tts_ms,
+            })
+            await ws.send_bytes(audio_bytes)
+
+        duration_ms = int((time.perf_counter() - total_start) * 1000)
+        await ws.send_json({"type": "done", "turn": turn, "duration_ms": duration_ms})
+
+        hedge: dict[str, dict] = {}
+        if translate_hedge:
+            hedge["translate"] = translate_hedge
+        if tts_hedge:
+            hedge["tts"] = tts_hedge
+        _log_benchmark({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "stt_provider": f"whisper-{s.whisper_model}",
+            "translate_provider": translate_provider_name,
+            "tts_provider": self.tts_provider_name if self._tts else None,
+            "source_lang": detected_lang,
+            "target_lang": target,
+            "text_length": len(text),
+            "stt_ms": stt_ms,
+            "translate_ms": translate_ms,
+            "tts_ms": tts_ms,
+            "total_ms": duration_ms,
+            "profile_id": self.profile_id,
+            "conversation": True,
+            "plan": plan.to_log(),
+            "hedge": hedge or None,
+            "speculation": speculation,
+            "translation_memory": (
+                {"match": tm_match.match, "similarity": tm_match.similarity, "approved": tm_match.approved}
+                if tm_match else None
+            ),
+        })
+
+        if self.session_row is not None and st.session_id:
+            if plan.needs_llm:
+                model_used = effective_model or (
+                    s.ollama_model if self.translate_provider_name == "local" else self.translate_provider_name
+                )
+            elif tm_match:
+                model_used = f"tm/{tm_match.match}"
+            else:
+                model_used = plan.translate
+            await _save_message(
+                session_id=st.session_id,
+                direction=direction,
+                original_text=text,
+                translated_text=translated,
+                original_lang=plan.transcript_lang(detected_lang),
+                translated_lang=target,
+                audio_data=audio,
+                audio_enabled=True,
+                stt_ms=stt_ms,
+                translate_ms=translate_ms,
+                tts_ms=tts_ms,
+                model_used=model_used,
+                session_row=self.session_row,
+                profile_id=self.profile_id,
+            )
+
+
+async def _receive_start(ws: WebSocket) -> ConversationStart | None:
+    msg = await ws.receive()
+    if msg["type"] == "websocket.disconnect":
+        return None
+    try:
+        if msg.get("text") is None:
+            raise ValueError("first message must be a JSON text frame")
+        data = json.loads(msg["text"])
+        if not isinstance(data, dict) or data.pop("type", "start") != "start":
+            raise ValueError("first message must be of type 'start'")
+        return ConversationStart.model_validate(data)
+    except (ValidationError, ValueError) as exc:
+        await ws.send_json({"type": "error", "detail": f"Invalid start message: {exc}"})
+        await ws.close(code=1003)
+        return None
+
+
+@router.websocket("/conversation")
+async def conversation(ws: WebSocket) -> None:
+    await ws.accept()
+    start = await _receive_start(ws)
+    if start is None:
+        return
+
+    s = get_settings()
+    session_row = None
+    if start.session_id and s.history_enabled:
+        try:
+            session_row = await _load_session(start.session_id)
+        except Exception as exc:
+            logger.warning("Conversation session lookup failed: %s", exc)
+        if session_row is None:
+            await ws.send_json({"type": "error", "detail": "Session not found"})
+            await ws.close(code=1008)
+            return
+
+    conv = Conversation(start, session_row)
+    try:
+        try:
+            conv.open()
+        except Exception as exc:
+            await ws.send_json({"type": "error", "detail": f"Provider setup failed: {exc}"})
+            await ws.close(code=1011)
+            return
+        await ws.send_json({"type": "ready", "session_id": start.session_id, "providers": conv.describe()})
+
+        direction = "source"
+        while True:
+            msg = await ws.receive()
+            if msg["type"] == "websocket.disconnect":
+                break
+            if msg.get("bytes") is not None:
+                try:
+                    await conv.run_turn(ws, msg["bytes"], direction)
+                except WebSocketDisconnect:
+                    raise
+                except Exception as exc:
+                    logger.warning("Conversation turn failed: %s", exc)
+                    await ws.send_json({"type": "error", "turn": conv.turns, "detail": str(exc)})
+                continue
+            try:
+                data = json.loads(msg.get("text") or "")
+            except json.JSONDecodeError:
+                await ws.send_json({"type": "error", "detail": "Invalid JSON"})
+                continue
+            kind = data.get("type") if isinstance(data, dict) else None
+            if kind == "turn":
+                if data.get("direction") not in DIRECTIONS:
+                    await ws.send_json({"type": "error", "detail": "direction must be 'source' or 'target'"})
+                    continue
+                direction = data["direction"]
+            elif kind == "partial":
+                if isinstance(data.get("text"), str):
+                    conv.speculate(direction, data["text"])
+            elif kind == "stop":
+                await ws.close()
+                break
+            else:
+                await ws.send_json({"type": "error", "detail": f"Unknown message type: {kind}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await conv.close()
+
+
+@router.get("/conversation/stats")
+async def conversation_stats() -> dict:
+    """Speculative translation hit rate and latency saved since startup."""
+    return {"speculation": get_speculation_stats().to_dict()}
@@ -0,0 +1,154 @@
+"""Streaming exports of message history (NDJSON/CSV) and session audio.
+
+Rows are read through a server-side cursor (``AsyncSession.stream`` with
+``yield_per``) and written to the response chunk by chunk, so memory use
+does not depend on the size of the session or organization.  The session
+audio export chains the archived Ogg Opus clips in message order; every
+clip is a complete Ogg stream, so the concatenation plays as one file.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from backend.database.connection import get_session_factory
+from backend.database.models import Message, Organization, Session
+from backend.database.segments import read_segment
+from backend.dependencies import get_settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["export"])
+
+STREAM_BATCH = 500  # rows per server-side cursor fetch and per response chunk
+
+EXPORT_COLUMNS = (
+    "id", "session_id", "direction", "original_lang", "translated_lang", "original_text", "translated_text",
+    "model_used", "stt_ms", "translate_ms", "tts_ms", "approved", "has_audio", "created_at",
+)
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _export_query() -> Select:
+    return select(
+        Message.id,
+        Message.session_id,
+        Message.direction,
+        Message.original_lang,
+        Message.translated_lang,
+        Message.original_text,
+        Message.translated_text,
+        Message.model_used,
+        Message.stt_ms,
+        Message.translate_ms,
+        Message.tts_ms,
+        Message.approved,
+        Message.audio_path.isnot(None),
+        Message.created_at,
+    ).order_by(Message.created_at, Message.id)
+
+
+def _record(row) -> dict:
+    record = dict(zip(EXPORT_COLUMNS, row))
+    record["id"] = str(record["id"])
+    record["session_id"] = str(record["session_id"])
+    record["created_at"] = record["created_at"].isoformat()
+    return record
+
+
+def format_rows(rows, fmt: str) -> str:
+    if fmt == "ndjson":
+        return "".join(json.dumps(_record(row), ensure_ascii=False) + "\n" for row in rows)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    for row in rows:
+        writer.writerow(_record(row).values())
+    return out.getvalue()
+
+
+async def _stream_rows(stmt: Select, fmt: str) -> AsyncIterator[str]:
+    if fmt == "csv":
+        yield ",".join(EXPORT_COLUMNS) + "\r\n"
+    async with get_session_factory()() as db:
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH))
+        async for rows in result.partitions():
+            yield format_rows(rows, fmt)
+
+
+def _download(body: AsyncIterator, media_type: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _require_session(uid: uuid.UUID) -> None:
+    async with get_session_factory()() as db:
+        if (await db.execute(select(Session.id).where(Session.id == uid))).scalar() is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+
+@router.get("/sessions/{session_id}/export")
+async def export_session(
+    session_id: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+) -> StreamingResponse:
+    uid = uuid.UUID(session_id)
+    await _require_session(uid)
+    stmt = _export_query().where(Message.session_id == uid)
+    return _download(_stream_rows(stmt, format), MEDIA_TYPES[format], f"session-{uid}.{format}")
+
+
+@router.get("/organizations/{org_id}/export")
+async def export_organization(
+    org_id: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: datetime | None = Query(None, description="Only messages created at or after this time"),
+    until: datetime | None = Query(None, description="Only messages created before this time"),
+) -> StreamingResponse:
+    uid = uuid.UUID(org_id)
+    async with get_session_factory()() as db:
+        if await db.get(Organization, uid) is None:
+            raise HTTPException(status_code=404, detail="Organization not found")
+    stmt = _export_query().where(Message.org_id == uid)
+    if since:
+        stmt = stmt.where(Message.created_at >= since)
+    if until:
+        stmt = stmt.where(Message.created_at < until)
+    return _download(_stream_rows(stmt, format), MEDIA_TYPES[format], f"organization-{uid}.{format}")
+
+
+async def _stream_audio(uid: uuid.UUID) -> AsyncIterator[bytes]:
+    root = Path(get_settings().audio_storage_path)
+    stmt = (
+        select(Message.audio_path)
+        .where(Message.session_id == uid, Message.audio_path.isnot(None))
+        .order_by(Message.created_at, Message.id)
+        .execution_options(yield_per=STREAM_BATCH)
+    )
+    async with get_session_factory()() as db:
+        result = await db.stream_scalars(stmt)
+        async for audio_path in result:
+            data = await asyncio.to_thread(read_segment, root, audio_path)
+            if data is None:
+                logger.debug("Skipping missing audio %s in export of session %s", audio_path, uid)
+                continue
+            yield data
+
+
+@router.get("/sessions/{session_id}/audio")
+async def export_session_audio(session_id: str) -> StreamingResponse:
+    uid = uuid.UUID(session_id)
+    await _require_session(uid)
+    return _download(_stream_audio(uid), "audio/ogg", f"session-{uid}.ogg")
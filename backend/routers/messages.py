@@ -1,17 +1,20 @@
 """Message history endpoints."""
 
+import asyncio
 import logging
 import uuid
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse
-from sqlalchemy import func, select
+from fastapi.responses import Response
+from sqlalchemy import select, tuple_
 
 from backend.database.connection import get_session_factory
 from backend.database.models import Message, Session
+from backend.database.segments import read_segment
 from backend.dependencies import get_settings
-from backend.models import MessageListResponse, MessageResponse
+from backend.models import MessageListResponse, MessageResponse, MessageUpdate
+from backend.pagination import decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -32,47 +35,95 @@ def _message_to_response(msg: Message) -> MessageResponse:
         translate_ms=msg.translate_ms,
         tts_ms=msg.tts_ms,
         model_used=msg.model_used,
+        approved=msg.approved,
         created_at=msg.created_at.isoformat(),
     )
 
 
+def _cursor(value: str | None) -> tuple | None:
+    if value is None:
+        return None
+    try:
+        return decode_cursor(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.get("/{session_id}/messages", response_model=MessageListResponse)
 async def get_messages(
     session_id: str,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    after: str | None = Query(None, description="next_cursor of a previous page; replaces offset"),
+    before: str | None = Query(None, description="prev_cursor of a previous page; replaces offset"),
 ) -> MessageListResponse:
+    if after and before:
+        raise HTTPException(status_code=400, detail="Use either after or before, not both")
+    after_key, before_key = _cursor(after), _cursor(before)
+
     factory = get_session_factory()
     async with factory() as db:
         uid = uuid.UUID(session_id)
 
-        # Check session exists
-        session = await db.get(Session, uid)
-        if not session:
+        # Existence and count in one lookup (message_count is maintained on insert)
+        total = (await db.execute(select(Session.message_count).where(Session.id == uid))).scalar()
+        if total is None:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        # Count total
-        total_result = await db.execute(
-            select(func.count(Message.id)).where(Message.session_id == uid)
-        )
-        total = total_result.scalar() or 0
+        # (session_id, created_at, id) is served by idx_messages_session_created
+        key = tuple_(Message.created_at, Message.id)
+        stmt = select(Message).where(Message.session_id == uid).limit(limit + 1)
+        if before_key:
+            stmt = stmt.where(key < tuple_(*before_key)).order_by(Message.created_at.desc(), Message.id.desc())
+        else:
+            stmt = stmt.order_by(Message.created_at.asc(), Message.id.asc())
+            if after_key:
+                stmt = stmt.where(key > tuple_(*after_key))
+            elif offset:
+                stmt = stmt.offset(offset)
+        rows = list((await db.execute(stmt)).scalars())
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if before_key:
+        rows.reverse()
+    next_cursor = prev_cursor = None
+    if rows:
+        first = encode_cursor(rows[0].created_at, rows[0].id)
+        last = encode_cursor(rows[-1].created_at, rows[-1].id)
+        if before_key:
+            # Paging backwards: later messages exist (at least the cursor row)
+            next_cursor, prev_cursor = last, first if more else None
+        else:
+            next_cursor = last if more else None
+            prev_cursor = first if after_key or offset else None
+    return MessageListResponse(
+        messages=[_message_to_response(m) for m in rows],
+        total=total,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
 
-        # Fetch messages
-        stmt = (
-            select(Message)
-            .where(Message.session_id == uid)
-            .order_by(Message.created_at.asc())
-            .limit(limit)
-            .offset(offset)
-        )
-        result = await db.execute(stmt)
-        messages = [_message_to_response(m) for m in result.scalars()]
 
-        return MessageListResponse(messages=messages, total=total)
+@router.patch("/{session_id}/messages/{message_id}", response_model=MessageResponse)
+async def update_message(session_id: str, message_id: str, body: MessageUpdate) -> MessageResponse:
+    """Correct and/or approve a translation for reuse by the translation memory."""
+    factory = get_session_factory()
+    async with factory() as db:
+        msg = await db.get(Message, uuid.UUID(message_id))
+        if not msg or str(msg.session_id) != session_id:
+            raise HTTPException(status_code=404, detail="Message not found")
+        if body.translated_text is not None:
+            msg.translated_text = body.translated_text
+        if body.approved is not None:
+            msg.approved = body.approved
+        await db.commit()
+        await db.refresh(msg)
+        return _message_to_response(msg)
 
 
 @router.get("/{session_id}/messages/{message_id}/audio")
-async def get_message_audio(session_id: str, message_id: str) -> FileResponse:
+async def get_message_audio(session_id: str, message_id: str) -> Response:
     factory = get_session_factory()
     s = get_settings()
     async with factory() as db:
@@ -83,12 +134,14 @@ async def get_message_audio(session_id: str, message_id: str) -> FileResponse:
         if not msg.audio_path:
             raise HTTPException(status_code=404, detail="No audio for this message")
 
-        audio_file = Path(s.audio_storage_path) / msg.audio_path
-        if not audio_file.exists():
-            raise HTTPException(status_code=404, detail="Audio file not found")
+        audio_path = msg.audio_path
 
-        return FileResponse(
-            path=str(audio_file),
-            media_type="audio/opus",
-            filename=f"{message_id}.opus",
-        )
+    # One positioned read from the session's pack file
+    data = await asyncio.to_thread(read_segment, Path(s.audio_storage_path), audio_path)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    return Response(
+        content=data,
+        media_type="audio/opus",
+        headers={"Content-Disposition": f'attachment; filename="{message_id}.opus"'},
+    )
@@ -1,18 +1,26 @@
-import asyncio
 import base64
 import json
 import logging
-import subprocess
 import time
 import uuid
+from collections.abc import Callable
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, File, HTTPException, Query, UploadFile
 
 from backend.dependencies import get_settings, get_stt
+from backend.keepalive import record_activity
 from backend.models import PipelineResponse
-from backend.resolver import resolve_translate, resolve_tts
+from backend.planner import PipelinePlan, plan_pipeline
+from backend.providers.base import TTSProvider
+from backend.resolver import resolve_translate, resolve_tts, synthesize_hedged, translate_hedged
+from backend.tts_cache import cache_key, get_tts_cache
+
+if TYPE_CHECKING:
+    from backend.database.models import Session
+    from backend.translation_memory import TMMatch
 
 logger = logging.getLogger(__name__)
 
@@ -45,91 +53,99 @@ async def _save_message(
     translate_ms: int | None,
     tts_ms: int | None,
     model_used: str | None,
+    session_row: "Session | None" = None,
+    profile_id: str | None = None,
 ) -> None:
-    """Save a pipeline result as a message in the database. Non-blocking."""
-    try:
-        from backend.database.connection import get_session_factory
-        from backend.database.models import Message, Session
+    """Queue a pipeline result for the history writer.
 
-        s = get_settings()
-        factory = get_session_factory()
-        async with factory() as db:
-            session = await db.get(Session, uuid.UUID(session_id))
-            if not session:
-                logger.warning("Session %s not found, skipping message save", session_id)
-                return
+    Waits only while the writer's queue is full.  Callers that already hold
+    the session (the conversation socket) pass it as ``session_row`` so the
+    writer can skip the audio_enabled lookup.
+    """
+    from backend.database.writer import PendingMessage, get_history_writer
 
-            msg_id = uuid.uuid4()
-            audio_path: str | None = None
+    writer = get_history_writer()
+    if writer is None:
+        return
+    try:
+        await writer.submit(PendingMessage(
+            session_id=uuid.UUID(session_id),
+            direction=direction,
+            original_text=original_text,
+            translated_text=translated_text,
+            original_lang=original_lang,
+            translated_lang=translated_lang,
+            audio_data=audio_data,
+            audio_enabled=audio_enabled,
+            stt_ms=stt_ms,
+            translate_ms=translate_ms,
+            tts_ms=tts_ms,
+            model_used=model_used,
+            profile_id=profile_id,
+            session_audio_enabled=session_row.audio_enabled if session_row is not None else None,
+            session_org_id=session_row.org_id if session_row is not None else None,
+        ))
+    except ValueError:
+        logger.warning("Invalid session id %r, skipping message save", session_id)
 
-            # Save audio to filesystem if enabled
-            if audio_enabled and audio_data and session.audio_enabled:
-                audio_dir = Path(s.audio_storage_path) / session_id
-                audio_dir.mkdir(parents=True, exist_ok=True)
-                opus_file = audio_dir / f"{msg_id}.opus"
-                try:
-                    # Encode to Opus using ffmpeg
-                    proc = await asyncio.create_subprocess_exec(
-                        "ffmpeg", "-i", "pipe:0", "-c:a", "libopus", "-b:a", "16k",
-                        "-f", "opus", "pipe:1",
-                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                    )
-                    opus_data, _ = await proc.communicate(input=audio_data)
-                    if proc.returncode == 0 and opus_data:
-                        opus_file.write_bytes(opus_data)
-                        audio_path = f"{session_id}/{msg_id}.opus"
-                except Exception as exc:
-                    logger.debug("Opus encoding failed: %s", exc)
 
-            msg = Message(
-                id=msg_id,
-                session_id=uuid.UUID(session_id),
-                direction=direction,
-                original_text=original_text,
-                translated_text=translated_text,
-                original_lang=original_lang,
-                translated_lang=translated_lang,
-                audio_path=audio_path,
-                stt_ms=stt_ms,
-                translate_ms=translate_ms,
-                tts_ms=tts_ms,
-                model_used=model_used,
-            )
-            db.add(msg)
-            # Update session timestamp
-            session.updated_at = datetime.now(timezone.utc)
-            await db.commit()
-            logger.debug("Message saved: %s in session %s", msg_id, session_id)
+async def _lookup_translation_memory(
+    text: str, source: str, target: str, session_id: str | None, profile_id: str | None,
+) -> "TMMatch | None":
+    """Look up a stored translation; never fails the pipeline."""
+    s = get_settings()
+    if not (s.translation_memory_enabled and s.history_enabled):
+        return None
+    try:
+        from backend.database.connection import get_session_factory
+        from backend.translation_memory import lookup
 
-            # Generate embedding (non-blocking, fire-and-forget)
-            asyncio.create_task(_generate_embedding(str(msg_id), original_text, translated_text))
+        async with get_session_factory()() as db:
+            return await lookup(
+                db, text, source, target, session_id, profile_id,
+                fuzzy_threshold=s.translation_memory_fuzzy_threshold,
+                require_approved=s.translation_memory_require_approved,
+            )
     except Exception as exc:
-        logger.warning("Failed to save message: %s", exc)
+        logger.debug("Translation memory lookup failed: %s", exc)
+        return None
 
 
-async def _generate_embedding(message_id: str, original_text: str, translated_text: str) -> None:
-    """Generate embedding for a message and store it in the database."""
-    try:
-        from backend.dependencies import get_embedding
-        provider = get_embedding()
-        if not provider:
-            return
+async def _synthesize_cached(
+    plan: PipelinePlan,
+    resolve: Callable[[], tuple[TTSProvider, bool]],
+    tts_provider_name: str,
+    cache_scope: str,
+    text: str,
+    lang: str,
+    voice: str | None,
+    params: dict[str, object],
+) -> tuple[bytes, str, dict | None]:
+    """TTS stage: serve from the audio cache or synthesize with hedging.
 
-        # Embed combined text for better semantic search
-        combined = f"{original_text} {translated_text}"
-        embedding = await provider.embed(combined)
+    ``resolve`` is only called on a cache miss and must return the usual
+    (provider, is_ad_hoc) pair.  Returns (audio, format, hedge log entry).
+    """
+    cache = get_tts_cache()
+    key = cache_key(f"{tts_provider_name}@{cache_scope}", text, lang, voice, **params)
+    cached = cache.get(key) if cache else None
+    if cached:
+        plan.use_tts_cache()
+        return cached[0], cached[1], None
 
-        from backend.database.connection import get_session_factory
-        from backend.database.models import Message
-        factory = get_session_factory()
-        async with factory() as db:
-            msg = await db.get(Message, uuid.UUID(message_id))
-            if msg:
-                msg.embedding = embedding
-                await db.commit()
-                logger.debug("Embedding saved for message %s", message_id)
-    except Exception as exc:
-        logger.debug("Embedding generation failed for %s: %s", message_id, exc)
+    tts_impl, tts_ad_hoc = resolve()
+    try:
+        audio_bytes, winner, hedge = await synthesize_hedged(
+            tts_impl, tts_provider_name, text, lang, voice, **params,
+        )
+    finally:
+        if tts_ad_hoc:
+            await tts_impl.cleanup()
+    audio_fmt = "mp3" if winner == "elevenlabs" else "wav"
+    # Fallback audio uses a different voice and must not be served as the primary's
+    if cache and winner == tts_provider_name:
+        cache.put(key, audio_bytes, audio_fmt)
+    return audio_bytes, audio_fmt, hedge
 
 
 @router.post("/pipeline", response_model=PipelineResponse)
@@ -161,76 +177,103 @@ async def full_pipeline(
     profile_id: str | None = Query(None),  # Industry Profile für System-Prompt-Injection
 ) -> PipelineResponse:
     total_start = time.perf_counter()
+    record_activity()
+    s = get_settings()
+    plan = plan_pipeline(source_lang, target_lang, tts, profile_id, s.whisper_translate_enabled)
 
-    # 1. STT
+    # 1. STT (Whisper übersetzt bei Ziel Englisch ggf. direkt)
     t0 = time.perf_counter()
     audio = await file.read()
-    text, detected_lang = await get_stt().transcribe(audio, source_lang)
+    text, detected_lang = await get_stt().transcribe(audio, source_lang, task=plan.stt_task)
     stt_ms = int((time.perf_counter() - t0) * 1000)
 
     if not text.strip():
         raise HTTPException(status_code=400, detail="No speech detected")
 
     # 2. Translate — mit optionalem Profil-System-Prompt
+    plan.after_stt(detected_lang, target_lang)
     t0 = time.perf_counter()
-    translator, ad_hoc = resolve_translate(provider, api_url, api_key, model, ollama_url, deepl_free)
+    translated = text
+    effective_model: str | None = model
+    translate_hedge: dict | None = None
+    tm_match = None
+    if plan.needs_llm:
+        tm_match = await _lookup_translation_memory(text, detected_lang, target_lang, session_id, profile_id)
+        if tm_match:
+            plan.use_memory(tm_match.match)
+            translated = tm_match.translated_text
+    translate_provider_name = provider or s.translate_provider
+    if plan.needs_llm:
+        translator, ad_hoc = resolve_translate(
+            provider, api_url, api_key, model, ollama_url, deepl_free,
+            source=detected_lang, target=target_lang,
+        )
+        # Routing may have picked a model for this language pair
+        effective_model = model or translator.model
+        if translate_provider_name == "local":
+            translate_provider_name = f"ollama/{effective_model or s.ollama_model}"
 
-    # System-Prompt aus Profil (falls angegeben, sonst Provider-Default)
-    translate_kwargs: dict[str, object] = {}
-    if ollama_keep_alive is not None:
-        translate_kwargs["keep_alive"] = ollama_keep_alive
-    if ollama_context_length is not None:
-        translate_kwargs["num_ctx"] = ollama_context_length
-    if profile_id:
-        from backend.profiles import get_system_prompt
-        translate_kwargs["system_prompt"] = get_system_prompt(profile_id, detected_lang, target_lang)
+        # System-Prompt aus Profil (falls angegeben, sonst Provider-Default)
+        translate_kwargs: dict[str, object] = {}
+        if ollama_keep_alive is not None:
+            translate_kwargs["keep_alive"] = ollama_keep_alive
+        if ollama_context_length is not None:
+            translate_kwargs["num_ctx"] = ollama_context_length
+        if profile_id:
+            from backend.profiles import get_system_prompt
+            translate_kwargs["system_prompt"] = get_system_prompt(profile_id, detected_lang, target_lang)
 
-    try:
-        translated = await translator.translate(
-            text, detected_lang, target_lang, model,
-            **translate_kwargs,
-        )
-    finally:
-        if ad_hoc:
-            await translator.cleanup()
+        try:
+            translated, translate_hedge = await translate_hedged(
+                translator, translate_provider_name,
+                text, detected_lang, target_lang, effective_model,
+                **translate_kwargs,
+            )
+        finally:
+            if ad_hoc:
+                await translator.cleanup()
+    else:
+        translate_provider_name = plan.translate
     translate_ms = int((time.perf_counter() - t0) * 1000)
 
-    # 3. TTS (optional)
+    # 3. TTS (optional, mit Cache)
     audio_b64: str | None = None
     tts_ms: int | None = None
-    if tts:
+    tts_provider_name = tts_provider or s.tts_provider
+    audio_fmt = "mp3" if tts_provider_name == "elevenlabs" else "wav"
+    tts_hedge: dict | None = None
+    if plan.tts != "skip":
         t0 = time.perf_counter()
-        tts_impl, tts_ad_hoc = resolve_tts(
-            tts_provider, voice, chatterbox_url,
-            elevenlabs_key, elevenlabs_voice_id, elevenlabs_model,
-            elevenlabs_stability, elevenlabs_similarity,
+        tts_voice = voice if tts_provider != "elevenlabs" else elevenlabs_voice_id
+        tts_params: dict[str, object] = {
+            "exaggeration": exaggeration,
+            "cfg_weight": cfg_weight,
+            "temperature": temperature,
+            "stability": elevenlabs_stability,
+            "similarity_boost": elevenlabs_similarity,
+        }
+        audio_bytes, audio_fmt, tts_hedge = await _synthesize_cached(
+            plan,
+            lambda: resolve_tts(
+                tts_provider, voice, chatterbox_url,
+                elevenlabs_key, elevenlabs_voice_id, elevenlabs_model,
+                elevenlabs_stability, elevenlabs_similarity,
+            ),
+            tts_provider_name,
+            f"{chatterbox_url or ''}/{elevenlabs_model or ''}",
+            translated, target_lang, tts_voice, tts_params,
         )
-        try:
-            audio_bytes = await tts_impl.synthesize(
-                translated,
-                target_lang,
-                voice if tts_provider != "elevenlabs" else elevenlabs_voice_id,
-                exaggeration=exaggeration,
-                cfg_weight=cfg_weight,
-                temperature=temperature,
-                stability=elevenlabs_stability,
-                similarity_boost=elevenlabs_similarity,
-            )
-            audio_b64 = base64.b64encode(audio_bytes).decode()
-        finally:
-            if tts_ad_hoc:
-                await tts_impl.cleanup()
+        audio_b64 = base64.b64encode(audio_bytes).decode()
         tts_ms = int((time.perf_counter() - t0) * 1000)
 
-    audio_fmt = "mp3" if tts_provider == "elevenlabs" else "wav"
     duration_ms = int((time.perf_counter() - total_start) * 1000)
 
     # Benchmark logging
-    s = get_settings()
-    translate_provider_name = provider or s.translate_provider
-    if translate_provider_name == "local":
-        translate_provider_name = f"ollama/{model or s.ollama_model}"
-    tts_provider_name = tts_provider or s.tts_provider
+    hedge: dict[str, dict] = {}
+    if translate_hedge:
+        hedge["translate"] = translate_hedge
+    if tts_hedge:
+        hedge["tts"] = tts_hedge
     _log_benchmark({
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "stt_provider": f"whisper-{s.whisper_model}",
@@ -244,17 +287,29 @@ async def full_pipeline(
         "tts_ms": tts_ms,
         "total_ms": duration_ms,
         "profile_id": profile_id,
+        "model_routed": model is None and effective_model is not None and effective_model != s.ollama_model,
+        "plan": plan.to_log(),
+        "hedge": hedge or None,
+        "translation_memory": (
+            {"match": tm_match.match, "similarity": tm_match.similarity, "approved": tm_match.approved}
+            if tm_match else None
+        ),
     })
 
-    # Save to chat history (non-blocking)
+    # Save to chat history (queued for the batched writer)
     if session_id and s.history_enabled:
-        model_used = model or (s.ollama_model if (provider or s.translate_provider) == "local" else provider or s.translate_provider)
-        asyncio.create_task(_save_message(
+        if plan.needs_llm:
+            model_used = effective_model or (s.ollama_model if (provider or s.translate_provider) == "local" else provider or s.translate_provider)
+        elif tm_match:
+            model_used = f"tm/{tm_match.match}"
+        else:
+            model_used = plan.translate
+        await _save_message(
             session_id=session_id,
             direction="source",
             original_text=text,
             translated_text=translated,
-            original_lang=detected_lang,
+            original_lang=plan.transcript_lang(detected_lang),  # never label Whisper's English as the spoken language
             translated_lang=target_lang,
             audio_data=audio,
             audio_enabled=True,
@@ -262,7 +317,8 @@ async def full_pipeline(
             translate_ms=translate_ms,
             tts_ms=tts_ms,
             model_used=model_used,
-        ))
+            profile_id=profile_id,
+        )
 
     return PipelineResponse(
         original_text=text,
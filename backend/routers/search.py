@@ -1,28 +1,38 @@
-"""Semantic search endpoint using pgvector cosine similarity."""
+"""Search endpoint: pgvector cosine similarity, Postgres full-text, or both fused."""
 
+import asyncio
 import logging
 import uuid
+from typing import Literal
 
-from fastapi import APIRouter, Query
-from pydantic import BaseModel
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException
+from pgvector.sqlalchemy import BIT, HALFVEC
+from pydantic import BaseModel, Field
+from sqlalchemy import Select, bindparam, cast, func, literal_column, select, text
 
 from backend.database.connection import get_session_factory
-from backend.database.models import Message, Session
-from backend.dependencies import get_settings
-from backend.providers.embedding.ollama_embed import OllamaEmbeddingProvider
+from backend.database.models import Message
+from backend.dependencies import get_embedding, get_settings
+from backend.search_cache import get_query_embedding_cache, get_search_result_cache, result_key
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["search"])
 
+RRF_K = 60  # rank offset from the original reciprocal rank fusion paper
+MAX_EF_SEARCH = 1000  # upper bound pgvector accepts for hnsw.ef_search
+TS_CONFIG = "simple"  # no stemming: messages mix languages, and exact terms (drug names, case numbers) matter
+
 
 class SearchRequest(BaseModel):
     query: str
     org_id: str | None = None
-    limit: int = 20
+    limit: int = Field(20, ge=1, le=100)
+    offset: int = Field(0, ge=0)
     source_lang: str | None = None
     target_lang: str | None = None
+    mode: Literal["vector", "keyword", "hybrid"] = "vector"
+    ef_search: int | None = Field(None, ge=10, le=MAX_EF_SEARCH)  # recall/latency trade-off, default SEARCH_EF_SEARCH
 
 
 class SearchResult(BaseModel):
@@ -32,70 +42,173 @@ class SearchResult(BaseModel):
     translated_text: str
     original_lang: str
     translated_lang: str
-    similarity: float
+    similarity: float  # cosine similarity (vector), ts_rank_cd (keyword) or fused RRF score (hybrid)
     created_at: str
 
 
 class SearchResponse(BaseModel):
     results: list[SearchResult]
     query: str
+    mode: str = "vector"
+    cached: bool = False
 
 
-@router.post("/search", response_model=SearchResponse)
-async def semantic_search(body: SearchRequest) -> SearchResponse:
+async def _query_embedding(query: str) -> list[float]:
     s = get_settings()
-
-    # Generate query embedding
-    provider = OllamaEmbeddingProvider(base_url=s.embedding_url, model=s.embedding_model)
-    try:
-        query_embedding = await provider.embed(body.query)
-    finally:
-        await provider.cleanup()
-
-    factory = get_session_factory()
-    async with factory() as db:
-        # Build query with cosine distance
-        distance = Message.embedding.cosine_distance(query_embedding)
-        stmt = (
-            select(
-                Message.id,
-                Message.session_id,
-                Message.original_text,
-                Message.translated_text,
-                Message.original_lang,
-                Message.translated_lang,
-                Message.created_at,
-                (1 - distance).label("similarity"),
+    cache = get_query_embedding_cache()
+    if cache:
+        vector = cache.get(s.embedding_model, query)
+        if vector is not None:
+            return vector
+    provider = get_embedding()
+    if provider is None:
+        raise HTTPException(status_code=503, detail="Embedding provider not available")
+    vector = await provider.embed(query)
+    if cache:
+        cache.put(s.embedding_model, query, vector)
+    return vector
+
+
+def _columns(score) -> Select:
+    return select(
+        Message.id,
+        Message.session_id,
+        Message.original_text,
+        Message.translated_text,
+        Message.original_lang,
+        Message.translated_lang,
+        Message.created_at,
+        score.label("similarity"),
+    )
+
+
+def _apply_filters(stmt: Select, body: SearchRequest) -> Select:
+    if body.org_id:
+        # Inlined rather than bound, so the planner can pick a per-org partial vector
+        # index (tools/org_vector_index.py) even for generic prepared-statement plans
+        org_id = uuid.UUID(body.org_id)
+        stmt = stmt.where(Message.org_id == literal_column(f"'{org_id}'::uuid"))
+    if body.source_lang:
+        stmt = stmt.where(Message.original_lang == body.source_lang)
+    if body.target_lang:
+        stmt = stmt.where(Message.translated_lang == body.target_lang)
+    return stmt
+
+
+def _to_result(row, score: float | None = None) -> SearchResult:
+    return SearchResult(
+        message_id=str(row[0]),
+        session_id=str(row[1]),
+        original_text=row[2],
+        translated_text=row[3],
+        original_lang=row[4],
+        translated_lang=row[5],
+        created_at=row[6].isoformat(),
+        similarity=round(float(row[7] if score is None else score), 4),
+    )
+
+
+async def _vector_rows(body: SearchRequest, fetch: int, ef_search: int) -> list:
+    s = get_settings()
+    query_embedding = await _query_embedding(body.query)
+    async with get_session_factory()() as db:
+        # Tune the HNSW scans for this transaction only; they should see at least the rows fetched,
+        # within the range pgvector accepts (deep pages may then come back short)
+        scan = min(max(ef_search, fetch, s.search_binary_candidates), MAX_EF_SEARCH)
+        await db.execute(text("SELECT set_config('hnsw.ef_search', :v, true)"), {"v": str(scan)})
+        if s.search_iterative_scan and (body.org_id or body.source_lang or body.target_lang):
+            await db.execute(
+                text("SELECT set_config('hnsw.iterative_scan', :v, true)"), {"v": s.search_iterative_scan},
             )
-            .where(Message.embedding.isnot(None))
-        )
+        query_vector = bindparam("query_vector", query_embedding, type_=HALFVEC(768))
+        distance = Message.embedding.cosine_distance(query_vector)
+        if s.search_binary_candidates > 0:
+            # First pass: Hamming distance on the 1-bit quantized copy, then re-rank by cosine
+            query_bits = cast(func.binary_quantize(query_vector), BIT(768))
+            candidates = (
+                _apply_filters(select(Message.id), body)
+                .where(Message.embedding_bit.isnot(None))
+                .order_by(Message.embedding_bit.hamming_distance(query_bits))
+                .limit(max(s.search_binary_candidates, fetch))
+                .subquery()
+            )
+            stmt = _columns(1 - distance).where(Message.id.in_(select(candidates.c.id)))
+        else:
+            stmt = _apply_filters(_columns(1 - distance), body).where(Message.embedding.isnot(None))
+        return (await db.execute(stmt.order_by(distance).limit(fetch))).all()
+
+
+async def _keyword_rows(body: SearchRequest, fetch: int) -> list:
+    tsquery = func.websearch_to_tsquery(TS_CONFIG, body.query)
+    rank = func.ts_rank_cd(Message.search_tsv, tsquery)
+    stmt = (
+        _apply_filters(_columns(rank), body)
+        .where(Message.search_tsv.op("@@")(tsquery))
+        .order_by(rank.desc(), Message.created_at.desc())
+        .limit(fetch)
+    )
+    async with get_session_factory()() as db:
+        return (await db.execute(stmt)).all()
+
+
+def reciprocal_rank_fusion(ranked: list[list], k: int = RRF_K) -> list[tuple[object, float]]:
+    """Merge ranked row lists (rows keyed by their first column) by summed 1/(k + rank)."""
+    scores: dict[object, float] = {}
+    rows: dict[object, object] = {}
+    for results in ranked:
+        for rank, row in enumerate(results, start=1):
+            scores[row[0]] = scores.get(row[0], 0.0) + 1.0 / (k + rank)
+            rows.setdefault(row[0], row)
+    order = sorted(scores, key=lambda key: scores[key], reverse=True)
+    return [(rows[key], scores[key]) for key in order]
+
 
-        # Apply filters
-        if body.org_id:
-            stmt = stmt.join(Session, Session.id == Message.session_id).where(
-                Session.org_id == uuid.UUID(body.org_id)
+@router.post("/search", response_model=SearchResponse)
+async def semantic_search(body: SearchRequest) -> SearchResponse:
+    s = get_settings()
+    ef_search = body.ef_search or s.search_ef_search
+    needed = body.offset + body.limit
+
+    # Pages of a recent search are served from its cached top rows
+    result_cache = get_search_result_cache()
+    key = result_key(
+        body.query, mode=body.mode, org_id=body.org_id, source_lang=body.source_lang,
+        target_lang=body.target_lang, ef_search=ef_search,
+    )
+    if result_cache:
+        cached = result_cache.get(key, needed)
+        if cached is not None:
+            return SearchResponse(results=cached[body.offset:needed], query=body.query, mode=body.mode, cached=True)
+
+    # Fetch a window beyond the requested page so following pages hit the cache
+    fetch = max(needed, s.search_result_window) if result_cache else needed
+
+    if body.mode == "keyword":
+        # Answers without the embedding service
+        rows = await _keyword_rows(body, fetch)
+        results = [_to_result(row) for row in rows]
+        complete = len(rows) < fetch
+    elif body.mode == "hybrid":
+        keyword_task = asyncio.create_task(_keyword_rows(body, fetch))
+        try:
+            vector_rows = await _vector_rows(body, fetch, ef_search)
+        except Exception as exc:
+            # The keyword half still answers; reported as mode "keyword" and not cached
+            logger.warning("Hybrid search without vector results: %s", getattr(exc, "detail", exc))
+            keyword_rows = await keyword_task
+            return SearchResponse(
+                results=[_to_result(row) for row in keyword_rows][body.offset:needed],
+                query=body.query, mode="keyword",
             )
-        if body.source_lang:
-            stmt = stmt.where(Message.original_lang == body.source_lang)
-        if body.target_lang:
-            stmt = stmt.where(Message.translated_lang == body.target_lang)
-
-        stmt = stmt.order_by(distance).limit(body.limit)
-        result = await db.execute(stmt)
-        rows = result.all()
-
-    results = [
-        SearchResult(
-            message_id=str(row[0]),
-            session_id=str(row[1]),
-            original_text=row[2],
-            translated_text=row[3],
-            original_lang=row[4],
-            translated_lang=row[5],
-            created_at=row[6].isoformat(),
-            similarity=round(float(row[7]), 4),
-        )
-        for row in rows
-    ]
-
-    return SearchResponse(results=results, query=body.query)
+        keyword_rows = await keyword_task
+        fused = reciprocal_rank_fusion([vector_rows, keyword_rows])
+        results = [_to_result(row, score) for row, score in fused[:fetch]]
+        complete = len(vector_rows) < fetch and len(keyword_rows) < fetch
+    else:
+        rows = await _vector_rows(body, fetch, ef_search)
+        results = [_to_result(row) for row in rows]
+        complete = len(rows) < fetch
+
+    if result_cache:
+        result_cache.put(key, results, complete=complete)
+    return SearchResponse(results=results[body.offset:needed], query=body.query, mode=body.mode)
@@ -1,18 +1,22 @@
 """Session CRUD endpoints."""
 
+import asyncio
 import logging
-import shutil
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from typing import Literal
+
 from fastapi import APIRouter, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, or_, select, text
 
 from backend.database.connection import get_session_factory
-from backend.database.models import Message, Organization, Session
+from backend.database.models import Organization, Session
+from backend.database.segments import remove_session_audio
 from backend.dependencies import get_settings
 from backend.models import SessionCreate, SessionListResponse, SessionResponse, SessionUpdate
+from backend.pagination import decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +30,7 @@ RETENTION_MAP = {
 }
 
 
-def _session_to_response(session: Session, message_count: int = 0) -> SessionResponse:
+def _session_to_response(session: Session) -> SessionResponse:
     return SessionResponse(
         id=str(session.id),
         org_id=str(session.org_id) if session.org_id else None,
@@ -35,7 +39,7 @@ def _session_to_response(session: Session, message_count: int = 0) -> SessionRes
         target_lang=session.target_lang,
         audio_enabled=session.audio_enabled,
         profile_id=session.profile_id,
-        message_count=message_count,
+        message_count=session.message_count or 0,
         created_at=session.created_at.isoformat(),
         updated_at=session.updated_at.isoformat(),
         expires_at=session.expires_at.isoformat() if session.expires_at else None,
@@ -84,49 +88,66 @@ async def create_session(body: SessionCreate) -> SessionResponse:
         return _session_to_response(session)
 
 
+async def _count_sessions(db, mode: str) -> tuple[int | None, bool]:
+    if mode == "none":
+        return None, False
+    if mode == "estimate":
+        # Planner statistics: free, but only as fresh as the last (auto)vacuum/analyze
+        estimate = (await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'sessions'::regclass")
+        )).scalar()
+        if estimate is not None and estimate >= 0:
+            return int(estimate), True
+    total = (await db.execute(select(func.count()).select_from(Session))).scalar() or 0
+    return total, False
+
+
 @router.get("", response_model=SessionListResponse)
 async def list_sessions(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor of the previous page; replaces offset"),
+    total: Literal["exact", "estimate", "none"] = Query("exact"),
 ) -> SessionListResponse:
     factory = get_session_factory()
     async with factory() as db:
-        # Count total
-        total_result = await db.execute(select(func.count(Session.id)))
-        total = total_result.scalar() or 0
-
-        # Fetch sessions with message count
-        stmt = (
-            select(Session, func.count(Message.id).label("msg_count"))
-            .outerjoin(Message, Message.session_id == Session.id)
-            .group_by(Session.id)
-            .order_by(Session.updated_at.desc())
-            .limit(limit)
-            .offset(offset)
+        count, estimated = await _count_sessions(db, total)
+
+        # Newest activity first; (updated_at DESC, id) matches idx_sessions_updated
+        stmt = select(Session).order_by(Session.updated_at.desc(), Session.id).limit(limit + 1)
+        if cursor:
+            try:
+                after_ts, after_id = decode_cursor(cursor)
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            stmt = stmt.where(or_(
+                Session.updated_at < after_ts,
+                and_(Session.updated_at == after_ts, Session.id > after_id),
+            ))
+        elif offset:
+            stmt = stmt.offset(offset)
+        rows = list((await db.execute(stmt)).scalars())
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].updated_at, rows[-1].id)
+        return SessionListResponse(
+            sessions=[_session_to_response(session) for session in rows],
+            total=count,
+            total_estimated=estimated,
+            next_cursor=next_cursor,
         )
-        result = await db.execute(stmt)
-        rows = result.all()
-
-        sessions = [_session_to_response(row[0], row[1]) for row in rows]
-        return SessionListResponse(sessions=sessions, total=total)
 
 
 @router.get("/{session_id}", response_model=SessionResponse)
 async def get_session(session_id: str) -> SessionResponse:
     factory = get_session_factory()
     async with factory() as db:
-        uid = uuid.UUID(session_id)
-        stmt = (
-            select(Session, func.count(Message.id).label("msg_count"))
-            .outerjoin(Message, Message.session_id == Session.id)
-            .where(Session.id == uid)
-            .group_by(Session.id)
-        )
-        result = await db.execute(stmt)
-        row = result.first()
-        if not row:
+        session = await db.get(Session, uuid.UUID(session_id))
+        if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        return _session_to_response(row[0], row[1])
+        return _session_to_response(session)
 
 
 @router.patch("/{session_id}", response_model=SessionResponse)
@@ -144,13 +165,7 @@ async def update_session(session_id: str, body: SessionUpdate) -> SessionRespons
         session.updated_at = datetime.now(timezone.utc)
         await db.commit()
         await db.refresh(session)
-
-        # Get message count
-        count_result = await db.execute(
-            select(func.count(Message.id)).where(Message.session_id == uid)
-        )
-        msg_count = count_result.scalar() or 0
-        return _session_to_response(session, msg_count)
+        return _session_to_response(session)
 
 
 @router.delete("/{session_id}")
@@ -163,10 +178,7 @@ async def delete_session(session_id: str) -> dict:
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        # Delete audio files
-        audio_dir = Path(s.audio_storage_path) / str(session.id)
-        if audio_dir.exists():
-            shutil.rmtree(audio_dir, ignore_errors=True)
+        await asyncio.to_thread(remove_session_audio, Path(s.audio_storage_path), session.id)
 
         await db.delete(session)
         await db.commit()
@@ -2,6 +2,7 @@ import time
 
 from fastapi import APIRouter, Query
 
+from backend.keepalive import record_activity
 from backend.models import TranslateRequest, TranslateResponse
 from backend.resolver import resolve_translate
 
@@ -20,10 +21,13 @@ async def translate_text(
     ollama_context_length: int | None = Query(None),
 ) -> TranslateResponse:
     start = time.perf_counter()
-    translator, ad_hoc = resolve_translate(provider, api_url, api_key, model, ollama_url)
+    record_activity()
+    translator, ad_hoc = resolve_translate(
+        provider, api_url, api_key, model, ollama_url, source=req.source, target=req.target,
+    )
     try:
         translated = await translator.translate(
-            req.text, req.source, req.target, model,
+            req.text, req.source, req.target, model or translator.model,
             keep_alive=ollama_keep_alive, num_ctx=ollama_context_length,
         )
     finally:
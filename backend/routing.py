@@ -0,0 +1,132 @@
+"""Language-pair model routing for translation.
+
+Maps (source, target) to a preferred Ollama model.  The table is built from
+the JSON written by ``tools/translation-benchmark.py``: per pair, the fastest
+model whose average quality is within ``quality_tolerance`` of the best one
+wins.  Explicit ``routes`` in the same file (e.g. ``"*-fa": "qwen3:4b"``)
+override the computed choice.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouteScore:
+    model: str
+    latency_ms: float
+    quality: float | None
+    n: int
+
+
+def _pair_key(source: str, target: str) -> str:
+    return f"{source.lower()}-{target.lower()}"
+
+
+class ModelRoutingTable:
+    def __init__(self, routes: dict[str, str], scores: dict[str, list[RouteScore]] | None = None) -> None:
+        self._routes = {k.lower(): v for k, v in routes.items()}
+        self._scores = scores or {}
+
+    @classmethod
+    def from_benchmark(cls, data: dict, quality_tolerance: float = 5.0) -> "ModelRoutingTable":
+        """Build a table from benchmark output.
+
+        ``quality_tolerance`` is in the benchmark's quality unit (chrF points).
+        Models with failed or unscored runs are only considered when no model
+        for that pair has a quality score.
+        """
+        samples: dict[str, dict[str, list[tuple[int, float | None]]]] = {}
+        for result in data.get("results", []):
+            models = result.get("models")
+            if not isinstance(models, dict):
+                continue
+            pair = _pair_key(result["source"], result["target"])
+            for model, run in models.items():
+                if run.get("error"):
+                    continue
+                samples.setdefault(pair, {}).setdefault(model, []).append(
+                    (int(run.get("latency_ms", 0)), run.get("quality")),
+                )
+
+        routes: dict[str, str] = {}
+        scores: dict[str, list[RouteScore]] = {}
+        for pair, per_model in samples.items():
+            pair_scores: list[RouteScore] = []
+            for model, runs in per_model.items():
+                qualities = [q for _, q in runs if q is not None]
+                pair_scores.append(RouteScore(
+                    model=model,
+                    latency_ms=sum(ms for ms, _ in runs) / len(runs),
+                    quality=sum(qualities) / len(qualities) if qualities else None,
+                    n=len(runs),
+                ))
+            scores[pair] = pair_scores
+
+            scored = [sc for sc in pair_scores if sc.quality is not None]
+            candidates = pair_scores
+            if scored:
+                best = max(sc.quality for sc in scored if sc.quality is not None)
+                candidates = [sc for sc in scored if sc.quality is not None and sc.quality >= best - quality_tolerance]
+            routes[pair] = min(candidates, key=lambda sc: sc.latency_ms).model
+
+        routes.update(data.get("routes", {}))
+        return cls(routes, scores)
+
+    @classmethod
+    def load(cls, path: str | Path, quality_tolerance: float = 5.0) -> "ModelRoutingTable":
+        with Path(path).open(encoding="utf-8") as f:
+            return cls.from_benchmark(json.load(f), quality_tolerance)
+
+    def route(self, source: str, target: str) -> str | None:
+        """Preferred model for the pair, falling back to a ``*-target`` rule."""
+        return self._routes.get(_pair_key(source, target)) or self._routes.get(_pair_key("*", target))
+
+    def to_dict(self) -> dict:
+        return {
+            "routes": dict(self._routes),
+            "scores": {
+                pair: [sc.__dict__ for sc in pair_scores]
+                for pair, pair_scores in self._scores.items()
+            },
+        }
+
+
+_table: ModelRoutingTable | None = None
+_table_key: tuple[str, float] | None = None
+
+
+def get_routing_table() -> ModelRoutingTable | None:
+    """Return the configured table, reloading it when the file changes."""
+    global _table, _table_key
+    from backend.dependencies import get_settings
+
+    s = get_settings()
+    if not s.translate_routing_file:
+        return None
+    path = Path(s.translate_routing_file)
+    try:
+        key = (str(path), path.stat().st_mtime)
+    except OSError:
+        return None
+    if key != _table_key:
+        try:
+            _table = ModelRoutingTable.load(path, s.translate_routing_quality_tolerance)
+            logger.info("Loaded model routing table from %s", path)
+        except Exception as exc:
+            logger.warning("Could not load model routing table %s: %s", path, exc)
+            _table = None
+        _table_key = key
+    return _table
+
+
+def route_model(source: str | None, target: str | None) -> str | None:
+    """Routed model for the pair, or None if routing is off or has no entry."""
+    if not source or not target:
+        return None
+    table = get_routing_table()
+    return table.route(source, target) if table else None
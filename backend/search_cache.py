@@ -0,0 +1,112 @@
+"""Caches for semantic search.
+
+Users repeat searches and page through results.  ``QueryEmbeddingCache``
+keeps the most recently used query vectors so a repeated query skips the
+embedding call; ``SearchResultCache`` keeps the top rows of a search for a
+few seconds so the following pages skip the vector scan as well.  Results
+may lag new messages by up to the TTL.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.split())
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: str, query: str) -> list[float] | None:
+        key = (model, _normalize(query))
+        vector = self._entries.get(key)
+        if vector is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return vector
+
+    def put(self, model: str, query: str, vector: list[float]) -> None:
+        key = (model, _normalize(query))
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def result_key(query: str, **filters: object) -> str:
+    return json.dumps({"query": _normalize(query), **filters}, sort_keys=True, default=str)
+
+
+class SearchResultCache:
+    def __init__(self, ttl_s: float, max_entries: int = 256) -> None:
+        self._ttl_s = ttl_s
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, list[Any], bool]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, needed: int) -> list[Any] | None:
+        """Cached rows for ``key`` if they are fresh and cover ``needed`` rows (or all there are)."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self._ttl_s:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        _, rows, complete = entry
+        if len(rows) < needed and not complete:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return rows
+
+    def put(self, key: str, rows: list[Any], complete: bool) -> None:
+        """``complete`` means there are no further matches beyond ``rows``."""
+        self._entries[key] = (time.monotonic(), rows, complete)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_embedding_cache: QueryEmbeddingCache | None = None
+_result_cache: SearchResultCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache | None:
+    """Process-wide query vector cache sized from settings; None when disabled."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        from backend.dependencies import get_settings
+
+        size = get_settings().search_embedding_cache_size
+        if size <= 0:
+            return None
+        _embedding_cache = QueryEmbeddingCache(size)
+    return _embedding_cache
+
+
+def get_search_result_cache() -> SearchResultCache | None:
+    global _result_cache
+    if _result_cache is None:
+        from backend.dependencies import get_settings
+
+        ttl = get_settings().search_result_cache_ttl_s
+        if ttl <= 0:
+            return None
+        _result_cache = SearchResultCache(ttl)
+    return _result_cache
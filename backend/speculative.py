@@ -0,0 +1,203 @@
+"""Speculative translation of stable partial transcripts.
+
+While the speaker is still talking, partial transcripts come in.  Whenever
+a prefix of them becomes *stable* -- it ends at a sentence boundary, or the
+whole partial stayed unchanged for ``stable_updates`` updates -- the new
+part of that prefix is translated in the background.  When the final
+transcript arrives, speculated pieces that it still starts with are reused
+(hits) and only the remaining tail is translated; pieces that no longer
+match are discarded (misses).
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+
+from backend.providers.base import TranslateProvider
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"[.!?;。！？؟…]+[\"'»”)]*\s+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _starts_with(text: str, prefix: str) -> bool:
+    """Case-insensitive ``startswith`` that keeps offsets: characters are compared
+    one by one, so ``text[len(prefix):]`` is the rest (``str.casefold`` may change
+    lengths, e.g. "ß" -> "ss")."""
+    return len(text) >= len(prefix) and all(a.casefold() == b.casefold() for a, b in zip(text, prefix))
+
+
+def stable_sentence_prefix(text: str) -> str:
+    """Longest prefix of ``text`` that ends with a complete sentence."""
+    end = 0
+    for match in _SENTENCE_END.finditer(text + " "):
+        end = min(match.end(), len(text))
+    return _normalize(text[:end])
+
+
+@dataclass
+class _Piece:
+    source: str
+    task: "asyncio.Task[str] | None" = None
+    translate_ms: int | None = None
+
+
+@dataclass
+class SpeculationStats:
+    finals: int = 0
+    hits: int = 0        # speculated pieces reused in a final translation
+    misses: int = 0      # speculated pieces discarded because the final differed
+    saved_ms: int = 0    # translation time already done when the final transcript arrived
+
+    def record(self, hits: int, misses: int, saved_ms: int) -> None:
+        self.finals += 1
+        self.hits += hits
+        self.misses += misses
+        self.saved_ms += saved_ms
+
+    def to_dict(self) -> dict:
+        pieces = self.hits + self.misses
+        return {
+            "finals": self.finals,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / pieces, 3) if pieces else None,
+            "saved_ms": self.saved_ms,
+            "avg_saved_ms": round(self.saved_ms / self.finals) if self.finals else None,
+        }
+
+
+_stats = SpeculationStats()
+
+
+def get_speculation_stats() -> SpeculationStats:
+    return _stats
+
+
+class SpeculativeTranslator:
+    def __init__(
+        self,
+        translator: TranslateProvider,
+        source: str,
+        target: str,
+        model: str | None = None,
+        *,
+        stable_updates: int = 2,
+        stats: SpeculationStats | None = None,
+        **kwargs: object,
+    ) -> None:
+        self._translator = translator
+        self._source = source
+        self._target = target
+        self._model = model
+        self._kwargs = kwargs
+        self._stable_updates = max(stable_updates, 1)
+        self._stats = stats or _stats
+        self._recent: list[str] = []
+        self._pieces: list[_Piece] = []
+        self._dropped = 0
+
+    @property
+    def speculated(self) -> str:
+        return " ".join(piece.source for piece in self._pieces)
+
+    def stable_prefix(self) -> str:
+        if not self._recent:
+            return ""
+        current = self._recent[-1]
+        window = self._recent[-self._stable_updates:]
+        if len(window) == self._stable_updates and all(text == current for text in window):
+            return current
+        return stable_sentence_prefix(current)
+
+    def update(self, partial: str) -> str | None:
+        """Feed a partial transcript; returns the newly speculated piece, if any."""
+        self._recent.append(_normalize(partial))
+        del self._recent[:-self._stable_updates]
+        prefix = self.stable_prefix()
+        # The recognizer revised text we already speculated on: drop those pieces
+        while self._pieces and not _starts_with(prefix, self.speculated):
+            dropped = self._pieces.pop()
+            if dropped.task:
+                dropped.task.cancel()
+            self._dropped += 1
+        done = self.speculated
+        if not prefix or len(prefix) <= len(done):
+            return None
+        piece = prefix[len(done):].strip()
+        if not piece:
+            return None
+        spec = _Piece(piece)
+        spec.task = asyncio.create_task(self._translate(spec))
+        self._pieces.append(spec)
+        return piece
+
+    async def _translate(self, piece: _Piece) -> str:
+        start = time.perf_counter()
+        result = await self._translator.translate(
+            piece.source, self._source, self._target, self._model, **self._kwargs,
+        )
+        piece.translate_ms = int((time.perf_counter() - start) * 1000)
+        return result
+
+    async def finalize(self, final_text: str) -> tuple[str, dict]:
+        """Translate ``final_text``, reusing speculated pieces it still starts with."""
+        final = _normalize(final_text)
+        reused: list[_Piece] = []
+        consumed = ""
+        for piece in self._pieces:
+            candidate = f"{consumed} {piece.source}".strip()
+            if _starts_with(final, candidate) and final[len(candidate):len(candidate) + 1] in ("", " "):
+                reused.append(piece)
+                consumed = candidate
+            else:
+                break
+        discarded = [piece for piece in self._pieces if piece not in reused]
+        for piece in discarded:
+            if piece.task:
+                piece.task.cancel()
+        misses = len(discarded) + self._dropped
+
+        # Work already finished when the final arrived is latency saved
+        saved_ms = sum(piece.translate_ms or 0 for piece in reused)
+
+        parts: list[str] = []
+        for piece in reused:
+            try:
+                assert piece.task is not None
+                parts.append(await piece.task)
+            except Exception as exc:
+                logger.debug("Speculative translation failed, retranslating: %s", exc)
+                parts.append(await self._translator.translate(
+                    piece.source, self._source, self._target, self._model, **self._kwargs,
+                ))
+        tail = final[len(consumed):].strip()
+        if tail:
+            parts.append(await self._translator.translate(
+                tail, self._source, self._target, self._model, **self._kwargs,
+            ))
+
+        self._stats.record(len(reused), misses, saved_ms)
+        self._pieces = []
+        self._recent = []
+        self._dropped = 0
+        return " ".join(p.strip() for p in parts if p.strip()), {
+            "hits": len(reused),
+            "misses": misses,
+            "saved_ms": saved_ms,
+            "tail_chars": len(tail),
+        }
+
+    def cancel(self) -> None:
+        for piece in self._pieces:
+            if piece.task:
+                piece.task.cancel()
+        self._pieces = []
+        self._recent = []
+        self._dropped = 0
@@ -0,0 +1,190 @@
+"""Supervision of long-running background tasks.
+
+Every uvicorn worker and replica runs the same lifespan, so a loop started
+there runs N times.  Tasks registered with ``leader=True`` (expired-session
+cleanup, partition maintenance) only run in the process that holds a
+Postgres session-level advisory lock for that task; the others stay on
+standby and retry the lock every ``leader_retry_s``, taking over when the
+leader exits or its connection dies.  The lock connection is checked
+while the task runs -- if it breaks, the server has already released the
+lock, so the task is cancelled rather than keep running next to a new
+leader.
+
+A task that exits or raises is restarted with exponential backoff; the
+supervisor keeps references to all tasks, and ``status()`` reports state,
+restarts and the task's own stats for ``/api/admin/tasks``.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+HEALTHY_AFTER_S = 60.0  # a run this long resets the backoff
+
+
+def advisory_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a task name."""
+    return int.from_bytes(hashlib.sha256(f"dolmtschr:{name}".encode()).digest()[:8], "big", signed=True)
+
+
+@dataclass
+class SupervisedTask:
+    name: str
+    factory: Callable[[], Coroutine]
+    leader: bool = False
+    stats: Callable[[], dict | None] | None = None
+    state: str = "pending"  # pending, standby, running, backoff, stopped
+    restarts: int = 0
+    failures: int = 0
+    last_error: str | None = None
+    started_at: datetime | None = None
+    last_exit_at: datetime | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class TaskSupervisor:
+    def __init__(
+        self,
+        *,
+        leader_retry_s: float = 30.0,
+        lock_check_s: float = 15.0,
+        backoff_base_s: float = 1.0,
+        backoff_max_s: float = 300.0,
+    ) -> None:
+        self._tasks: dict[str, SupervisedTask] = {}
+        self._leader_retry_s = leader_retry_s
+        self._lock_check_s = lock_check_s
+        self._backoff_base_s = backoff_base_s
+        self._backoff_max_s = backoff_max_s
+
+    def add(
+        self,
+        name: str,
+        factory: Callable[[], Coroutine],
+        *,
+        leader: bool = False,
+        stats: Callable[[], dict | None] | None = None,
+    ) -> None:
+        """Register a task; ``factory`` creates a fresh coroutine for every (re)start."""
+        entry = SupervisedTask(name, factory, leader=leader, stats=stats)
+        self._tasks[name] = entry
+        entry.task = asyncio.create_task(self._supervise(entry), name=f"supervisor:{name}")
+
+    async def _supervise(self, entry: SupervisedTask) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                if entry.leader:
+                    await self._run_as_leader(entry)
+                else:
+                    await self._run(entry)
+                entry.last_error = "exited"
+            except asyncio.CancelledError:
+                entry.state = "stopped"
+                raise
+            except Exception as exc:
+                entry.last_error = f"{type(exc).__name__}: {exc}"
+                logger.warning("Background task %s failed: %s", entry.name, exc)
+            entry.last_exit_at = datetime.now(timezone.utc)
+            entry.failures = 0 if time.monotonic() - started > HEALTHY_AFTER_S else entry.failures + 1
+            entry.restarts += 1
+            entry.state = "backoff"
+            await asyncio.sleep(self.backoff_delay(entry.failures))
+
+    def backoff_delay(self, failures: int) -> float:
+        if failures <= 0:
+            return self._backoff_base_s
+        return min(self._backoff_max_s, self._backoff_base_s * 2 ** (failures - 1))
+
+    async def _run(self, entry: SupervisedTask) -> None:
+        entry.state = "running"
+        entry.started_at = datetime.now(timezone.utc)
+        await entry.factory()
+
+    async def _run_as_leader(self, entry: SupervisedTask) -> None:
+        from sqlalchemy import text
+
+        from backend.database.connection import get_engine
+
+        key = advisory_key(entry.name)
+        while True:
+            async with get_engine().connect() as conn:
+                acquired = (await conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": key})).scalar()
+                await conn.commit()  # session-level locks outlive the transaction; don't sit idle in one
+                if acquired:
+                    try:
+                        await self._run_holding_lock(entry, conn)
+                    finally:
+                        try:
+                            await conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": key})
+                        except Exception:
+                            pass  # a dead connection released the lock already
+                    return
+            entry.state = "standby"
+            await asyncio.sleep(self._leader_retry_s)
+
+    async def _run_holding_lock(self, entry: SupervisedTask, conn) -> None:
+        from sqlalchemy import text
+
+        logger.info("Background task %s: acquired leadership", entry.name)
+        work = asyncio.create_task(self._run(entry))
+        try:
+            while not work.done():
+                await asyncio.wait({work}, timeout=self._lock_check_s)
+                if not work.done():
+                    # Losing the session loses the lock; stop before another process takes over
+                    await conn.execute(text("SELECT 1"))
+                    await conn.commit()
+            await work
+        finally:
+            work.cancel()
+            try:
+                await work
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def status(self) -> dict:
+        result = {}
+        for name, entry in self._tasks.items():
+            stats = None
+            if entry.stats:
+                try:
+                    stats = entry.stats()
+                except Exception as exc:
+                    stats = {"error": str(exc)}
+            result[name] = {
+                "state": entry.state,
+                "leader_only": entry.leader,
+                "restarts": entry.restarts,
+                "last_error": entry.last_error,
+                "started_at": entry.started_at.isoformat() if entry.started_at else None,
+                "last_exit_at": entry.last_exit_at.isoformat() if entry.last_exit_at else None,
+                "stats": stats,
+            }
+        return result
+
+    async def stop(self) -> None:
+        tasks = [entry.task for entry in self._tasks.values() if entry.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for entry in self._tasks.values():
+            entry.state = "stopped"
+
+
+_supervisor: TaskSupervisor | None = None
+
+
+def init_supervisor(supervisor: TaskSupervisor | None) -> None:
+    global _supervisor
+    _supervisor = supervisor
+
+
+def get_supervisor() -> TaskSupervisor | None:
+    return _supervisor
@@ -0,0 +1,108 @@
+"""Translation memory served from message history.
+
+Every saved message stores a hash of its normalized source text.  Before
+calling the LLM, the pipeline looks for an earlier translation of the same
+text within the same organization, language pair and profile (one indexed
+query), optionally falling back to a trigram similarity match.  The profile
+is part of the key because its system prompt shapes the translation: a
+hotel-profile rendering must not be served to a medical-profile request.
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import func, select, text as sql_text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models import Message, Session
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Canonical form used for exact matching (case and whitespace insensitive)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class TMMatch:
+    translated_text: str
+    match: str  # "exact" | "fuzzy"
+    similarity: float
+    message_id: str
+    approved: bool
+
+
+def _org_scope(session_id: str | None):
+    """Condition limiting candidates to messages of the same organization."""
+    if session_id is None:
+        return Message.org_id.is_(None)
+    org = select(Session.org_id).where(Session.id == uuid.UUID(session_id)).scalar_subquery()
+    return Message.org_id.is_not_distinct_from(org)
+
+
+async def lookup(
+    db: AsyncSession,
+    text: str,
+    source: str,
+    target: str,
+    session_id: str | None = None,
+    profile_id: str | None = None,
+    *,
+    fuzzy_threshold: float = 0.0,
+    require_approved: bool = False,
+) -> TMMatch | None:
+    """Return the best stored translation for ``text`` or None.
+
+    Approved entries are preferred over unapproved ones, newer over older.
+    ``fuzzy_threshold`` (0..1) enables trigram matching when no exact hit
+    exists; 0 disables it.
+    """
+    base = (
+        select(Message.id, Message.translated_text, Message.approved)
+        .where(
+            Message.original_lang == source,
+            Message.translated_lang == target,
+            # "= / IS NULL" rather than IS NOT DISTINCT FROM, which cannot use idx_messages_tm
+            Message.profile_id == profile_id if profile_id else Message.profile_id.is_(None),
+            _org_scope(session_id),
+        )
+    )
+    if require_approved:
+        base = base.where(Message.approved.is_(True))
+
+    exact = (
+        base.where(Message.source_hash == source_hash(text))
+        .order_by(Message.approved.desc(), Message.created_at.desc())
+        .limit(1)
+    )
+    row = (await db.execute(exact)).first()
+    if row:
+        return TMMatch(row[1], "exact", 1.0, str(row[0]), row[2])
+
+    if fuzzy_threshold <= 0:
+        return None
+
+    # "%" uses the trigram GIN index with the threshold set for this transaction
+    await db.execute(sql_text("SELECT set_config('pg_trgm.similarity_threshold', :t, true)"), {"t": str(fuzzy_threshold)})
+    similarity = func.similarity(Message.original_text, text)
+    fuzzy = (
+        base.add_columns(similarity.label("sim"))
+        .where(Message.original_text.op("%")(text))
+        .order_by(similarity.desc(), Message.approved.desc())
+        .limit(1)
+    )
+    row = (await db.execute(fuzzy)).first()
+    if row:
+        return TMMatch(row[1], "fuzzy", round(float(row[3]), 4), str(row[0]), row[2])
+    return None
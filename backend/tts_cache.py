@@ -0,0 +1,67 @@
+"""Bounded in-memory cache of synthesized audio.
+
+Repeated phrases (greetings, translation-memory hits) produce identical TTS
+requests; the cache is keyed by everything that influences the audio and
+evicts least-recently-used entries once ``max_bytes`` is exceeded.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+
+def cache_key(provider: str, text: str, lang: str, voice: str | None, **params: object) -> str:
+    payload = json.dumps(
+        {"provider": provider, "text": text, "lang": lang, "voice": voice, "params": params},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> tuple[bytes, str] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, audio: bytes, audio_format: str) -> None:
+        if len(audio) > self._max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old:
+            self._bytes -= len(old[0])
+        self._entries[key] = (audio, audio_format)
+        self._bytes += len(audio)
+        while self._bytes > self._max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+_cache: TTSCache | None = None
+
+
+def get_tts_cache() -> TTSCache | None:
+    """Process-wide cache sized from settings; None when disabled."""
+    global _cache
+    if _cache is None:
+        from backend.dependencies import get_settings
+
+        max_mb = get_settings().tts_cache_max_mb
+        if max_mb <= 0:
+            return None
+        _cache = TTSCache(max_mb * 1024 * 1024)
+    return _cache
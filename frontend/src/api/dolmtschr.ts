@@ -45,7 +45,9 @@ export interface SessionResponse {
 
 export interface SessionListResponse {
   sessions: SessionResponse[]
-  total: number
+  total: number | null
+  total_estimated: boolean
+  next_cursor: string | null
 }
 
 export interface MessageResponse {
@@ -67,6 +69,8 @@ export interface MessageResponse {
 export interface MessageListResponse {
   messages: MessageResponse[]
   total: number
+  next_cursor: string | null
+  prev_cursor: string | null
 }
 
 export interface SearchResult {
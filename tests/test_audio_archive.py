@@ -0,0 +1,68 @@
+"""Tests für den Opus-Archiv-Encoder-Pool."""
+import asyncio
+import uuid
+
+from backend.database.archive import OpusArchiver
+from backend.database.segments import parse_locator, read_segment, remove_session_audio
+
+
+def test_concurrency_is_bounded_and_clips_are_packed(tmp_path):
+    async def run():
+        archiver = OpusArchiver(str(tmp_path), concurrency=2)
+        running = 0
+        peak = 0
+
+        async def fake_encode(audio):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return b"OggS" + audio
+
+        archiver.encode = fake_encode
+        paths = await asyncio.gather(*(archiver.archive(bytes([i]) * 10, sid) for i in range(6)))
+        await archiver.stop()
+        return archiver, paths, peak
+
+    sid = uuid.uuid4()
+    archiver, paths, peak = asyncio.run(run())
+    assert peak == 2
+    assert sorted(parse_locator(p)[1] for p in paths) == [i * 14 for i in range(6)]
+    assert {parse_locator(p)[0] for p in paths} == {f"{sid}.ogg"}
+    assert read_segment(tmp_path, paths[3]) == b"OggS" + bytes([3]) * 10
+    assert (tmp_path / f"{sid}.ogg").stat().st_size == 6 * 14
+    stats = archiver.stats()
+    assert stats["encoded"] == 6
+    assert stats["bytes_written"] == 6 * 14
+
+
+def test_failed_encode_returns_none(tmp_path):
+    async def run():
+        archiver = OpusArchiver(str(tmp_path), concurrency=1)
+
+        async def broken(audio):
+            raise RuntimeError("no codec")
+
+        archiver.encode = broken
+        path = await archiver.archive(b"x", uuid.uuid4())
+        await archiver.stop()
+        return archiver, path
+
+    archiver, path = asyncio.run(run())
+    assert path is None
+    assert archiver.stats()["failed"] == 1
+
+
+def test_legacy_files_are_read_and_session_removal_covers_both(tmp_path):
+    sid = uuid.uuid4()
+    legacy = tmp_path / str(sid) / "m.opus"
+    legacy.parent.mkdir()
+    legacy.write_bytes(b"old")
+    (tmp_path / f"{sid}.ogg").write_bytes(b"new")
+    assert read_segment(tmp_path, f"{sid}/m.opus") == b"old"
+    assert read_segment(tmp_path, f"{sid}.ogg@0:3") == b"new"
+    assert read_segment(tmp_path, f"{sid}.ogg@2:3") is None  # truncated range
+    assert remove_session_audio(tmp_path, sid) is True
+    assert list(tmp_path.iterdir()) == []
+    assert remove_session_audio(tmp_path, sid) is False
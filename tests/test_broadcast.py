@@ -0,0 +1,100 @@
+"""Tests für Fan-out-Pipeline und Broadcast-Kanäle."""
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import broadcast as hub_module
+from backend import dependencies
+from backend.broadcast import BroadcastHub
+from backend.config import Settings
+from backend.routers import broadcast
+
+
+def test_lagging_listener_drops_oldest_event():
+    async def run():
+        hub = BroadcastHub(queue_size=2)
+        queue = hub.subscribe("desk", "ar")
+        for i in range(3):
+            assert hub.publish("desk", "ar", {"n": i}) == 1
+        assert [queue.get_nowait()["n"] for _ in range(2)] == [1, 2]
+        hub.unsubscribe("desk", "ar", queue)
+        assert hub.languages("desk") == []
+
+    asyncio.run(run())
+
+
+def test_fanout_translates_each_language_once(monkeypatch):
+    calls = []
+
+    class FakeSTT:
+        async def transcribe(self, audio, language=None, task="transcribe"):
+            calls.append("stt")
+            return "Willkommen", "de"
+
+    class FakeTranslator:
+        model = None
+
+        async def translate(self, text, source, target, model=None, **kwargs):
+            calls.append(target)
+            return f"{text}/{target}"
+
+    hub = BroadcastHub()
+    listener = hub.subscribe("desk", "ar")
+    hub.subscribe("desk", "ar")
+    monkeypatch.setattr(dependencies, "_settings", Settings(translation_memory_enabled=False))
+    monkeypatch.setattr(hub_module, "_hub", hub)
+    monkeypatch.setattr(broadcast, "get_stt", lambda: FakeSTT())
+    monkeypatch.setattr(broadcast, "resolve_translate", lambda *a, **kw: (FakeTranslator(), False))
+    monkeypatch.setattr(broadcast, "_log_benchmark", lambda entry: None)
+
+    app = FastAPI()
+    app.include_router(broadcast.router)
+    resp = TestClient(app).post(
+        "/api/pipeline/fanout?target_langs=en,tr&channel=desk&tts=false",
+        files={"file": ("a.wav", b"RIFF")},
+    )
+    assert resp.status_code == 200
+    results = {r["target_lang"]: r for r in resp.json()["results"]}
+    assert set(results) == {"en", "tr", "ar"}
+    assert results["ar"]["listeners"] == 2
+    # One STT pass, one translation per language regardless of listener count
+    assert calls.count("stt") == 1
+    assert sorted(c for c in calls if c != "stt") == ["ar", "en", "tr"]
+    assert listener.get_nowait()["text"] == "Willkommen/ar"
+
+
+def test_audio_is_saved_with_the_first_successful_target(monkeypatch):
+    class FakeSTT:
+        async def transcribe(self, audio, language=None, task="transcribe"):
+            return "Willkommen", "de"
+
+    class FakeTranslator:
+        model = None
+
+        async def translate(self, text, source, target, model=None, **kwargs):
+            if target == "en":
+                raise RuntimeError("provider down")
+            return f"{text}/{target}"
+
+    saved = []
+
+    async def fake_save(**kwargs):
+        saved.append((kwargs["translated_lang"], kwargs["audio_enabled"], kwargs["audio_data"]))
+
+    monkeypatch.setattr(dependencies, "_settings", Settings(translation_memory_enabled=False))
+    monkeypatch.setattr(broadcast, "get_stt", lambda: FakeSTT())
+    monkeypatch.setattr(broadcast, "resolve_translate", lambda *a, **kw: (FakeTranslator(), False))
+    monkeypatch.setattr(broadcast, "_log_benchmark", lambda entry: None)
+    monkeypatch.setattr(broadcast, "_save_message", fake_save)
+
+    app = FastAPI()
+    app.include_router(broadcast.router)
+    resp = TestClient(app).post(
+        "/api/pipeline/fanout?target_langs=en,tr,ar&tts=false&session_id=00000000-0000-0000-0000-000000000001",
+        files={"file": ("a.wav", b"RIFF")},
+    )
+    assert resp.status_code == 200
+    # "en" failed and is not saved; exactly one saved message carries the recording
+    assert {lang for lang, _, _ in saved} == {"tr", "ar"}
+    assert [(enabled, data) for _, enabled, data in saved if enabled] == [(True, b"RIFF")]
@@ -0,0 +1,28 @@
+"""Tests für das Aufteilen langer Aufnahmen und das Zusammenfügen der Segmente."""
+from backend.providers.base import TranscriptSegment
+from backend.providers.stt.chunking import plan_chunks, stitch
+
+
+def test_chunks_cut_at_silences_and_stay_bounded():
+    speech = [(0.0, 10.0), (12.0, 25.0), (27.0, 40.0), (41.0, 55.0)]
+    chunks = plan_chunks(speech, 60.0, max_len=30.0)
+    assert [(c.start, c.end) for c in chunks] == [(0.0, 25.0), (27.0, 55.0)]
+    assert all(c.end - c.start <= 30.0 for c in chunks)
+    # Ownership covers the whole recording without gaps
+    assert chunks[0].own_start == 0.0 and chunks[-1].own_end == 60.0
+    assert chunks[0].own_end == chunks[1].own_start == 26.0
+
+
+def test_continuous_speech_is_split_with_overlap():
+    chunks = plan_chunks([(0.0, 70.0)], 70.0, max_len=30.0, overlap=2.0)
+    assert [(c.start, c.end) for c in chunks] == [(0.0, 30.0), (28.0, 58.0), (56.0, 70.0)]
+    assert chunks[0].own_end == 29.0
+
+
+def test_stitch_drops_duplicates_from_overlap():
+    first, second = plan_chunks([(0.0, 50.0)], 50.0, max_len=30.0, overlap=2.0)
+    merged = stitch([
+        (first, [TranscriptSegment(0.0, 27.0, "a"), TranscriptSegment(27.5, 29.8, "b")]),
+        (second, [TranscriptSegment(28.0, 29.6, "b"), TranscriptSegment(29.8, 40.0, "c")]),
+    ])
+    assert [seg.text for seg in merged] == ["a", "b", "c"]
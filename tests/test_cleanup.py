@@ -0,0 +1,67 @@
+"""Tests für die gestaffelte Aufräumroutine abgelaufener Sessions."""
+import asyncio
+import uuid
+
+from backend import dependencies
+from backend.config import Settings
+from backend.database import cleanup
+
+
+def test_cleanup_runs_in_batches_and_removes_audio(monkeypatch, tmp_path):
+    settings = Settings(audio_storage_path=str(tmp_path), cleanup_batch_size=2, cleanup_batch_pause_ms=0)
+    monkeypatch.setattr(dependencies, "_settings", settings)
+    expired = [uuid.uuid4() for _ in range(5)]
+    for sid in expired[:3]:
+        (tmp_path / str(sid)).mkdir()
+        (tmp_path / str(sid) / "a.opus").write_bytes(b"x")
+    calls: list[int] = []
+
+    async def fake_batch(batch_size):
+        calls.append(batch_size)
+        taken = expired[:batch_size]
+        del expired[:batch_size]
+        return taken
+
+    monkeypatch.setattr(cleanup, "delete_expired_batch", fake_batch)
+    stats = asyncio.run(cleanup.cleanup_expired_sessions())
+    assert stats == {"deleted_sessions": 5, "deleted_audio_dirs": 3, "batches": 3}
+    assert calls == [2, 2, 2]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cleanup_respects_max_batches(monkeypatch, tmp_path):
+    monkeypatch.setattr(dependencies, "_settings", Settings(audio_storage_path=str(tmp_path), cleanup_batch_size=1, cleanup_batch_pause_ms=0))
+
+    async def endless(batch_size):
+        return [uuid.uuid4()]
+
+    monkeypatch.setattr(cleanup, "delete_expired_batch", endless)
+    assert asyncio.run(cleanup.cleanup_expired_sessions(max_batches=3))["batches"] == 3
+
+
+def test_orphan_sweep_removes_only_unknown_sessions(monkeypatch, tmp_path):
+    monkeypatch.setattr(dependencies, "_settings", Settings(audio_storage_path=str(tmp_path)))
+    monkeypatch.setattr(cleanup, "ORPHAN_GRACE_S", -60)
+    known, orphan = uuid.uuid4(), uuid.uuid4()
+    for sid in (known, orphan):
+        (tmp_path / f"{sid}.ogg").write_bytes(b"OggS")
+    (tmp_path / "README").write_text("not audio")
+
+    class FakeResult:
+        def scalars(self):
+            return [known]
+
+    class FakeDb:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt):
+            return FakeResult()
+
+    monkeypatch.setattr(cleanup, "get_session_factory", lambda: FakeDb)
+    stats = asyncio.run(cleanup.sweep_orphan_audio())
+    assert stats == {"checked": 2, "removed": 1}
+    assert {p.name for p in tmp_path.iterdir()} == {"README", f"{known}.ogg"}
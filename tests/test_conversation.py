@@ -0,0 +1,82 @@
+"""Tests für den Konversations-WebSocket (Zwei-Personen-Modus)."""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import dependencies
+from backend.config import Settings
+from backend.models import ConversationStart
+from backend.routers import conversation
+
+
+class FakeSTT:
+    async def transcribe(self, audio, language=None, task="transcribe"):
+        return audio.decode(), language or "de"
+
+
+class FakeTranslator:
+    model = None
+
+    def __init__(self):
+        self.calls = []
+
+    async def translate(self, text, source, target, model=None, **kwargs):
+        self.calls.append((source, target))
+        return f"{text} [{source}->{target}]"
+
+    async def cleanup(self):
+        pass
+
+
+def test_direction_swaps_languages_and_voice():
+    conv = conversation.Conversation(ConversationStart(
+        source_lang="de", target_lang="ar", voice="anna", voice_reverse="omar",
+    ))
+    assert conv.langs("source") == ("de", "ar")
+    assert conv.langs("target") == ("ar", "de")
+    assert conv.voice("source") == "anna"
+    assert conv.voice("target") == "omar"
+
+
+def test_turns_reuse_resolved_providers(monkeypatch):
+    translator = FakeTranslator()
+    resolved = []
+
+    def fake_resolve(*args, **kwargs):
+        resolved.append((kwargs["source"], kwargs["target"]))
+        return translator, False
+
+    monkeypatch.setattr(dependencies, "_settings", Settings(translation_memory_enabled=False))
+    monkeypatch.setattr(conversation, "get_stt", lambda: FakeSTT())
+    monkeypatch.setattr(conversation, "resolve_translate", fake_resolve)
+    monkeypatch.setattr(conversation, "_log_benchmark", lambda entry: None)
+
+    app = FastAPI()
+    app.include_router(conversation.router)
+    with TestClient(app).websocket_connect("/api/conversation") as ws:
+        ws.send_json({"type": "start", "source_lang": "de", "target_lang": "tr", "tts": False})
+        assert ws.receive_json()["type"] == "ready"
+
+        ws.send_bytes(b"Guten Tag")
+        assert ws.receive_json()["text"] == "Guten Tag"
+        assert ws.receive_json()["text"] == "Guten Tag [de->tr]"
+        assert ws.receive_json()["type"] == "done"
+
+        ws.send_json({"type": "turn", "direction": "target"})
+        ws.send_bytes(b"Merhaba")
+        ws.receive_json()
+        assert ws.receive_json()["text"] == "Merhaba [tr->de]"
+        assert ws.receive_json()["turn"] == 2
+        ws.send_json({"type": "stop"})
+
+    # Both directions resolved once at start, not per turn
+    assert resolved == [("de", "tr"), ("tr", "de")]
+
+
+def test_binary_first_frame_is_rejected():
+    app = FastAPI()
+    app.include_router(conversation.router)
+    with TestClient(app).websocket_connect("/api/conversation") as ws:
+        ws.send_bytes(b"RIFF")
+        reply = ws.receive_json()
+    assert reply["type"] == "error"
+    assert "start message" in reply["detail"]
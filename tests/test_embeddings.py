@@ -0,0 +1,60 @@
+"""Tests für die gebündelte Embedding-Erzeugung."""
+import asyncio
+import uuid
+
+from backend.embeddings import EmbeddingQueue
+from backend.providers.base import EmbeddingProvider
+
+
+class FakeEmbedding(EmbeddingProvider):
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def embed(self, text):
+        return [float(len(text))]
+
+    async def embed_batch(self, texts):
+        self.calls.append(texts)
+        return [[float(len(t))] for t in texts]
+
+
+def test_queue_embeds_in_batches_and_bulk_stores(monkeypatch):
+    stored: list[int] = []
+
+    async def fake_store(ids, vectors):
+        assert len(ids) == len(vectors)
+        stored.append(len(ids))
+
+    monkeypatch.setattr("backend.embeddings.store_embeddings", fake_store)
+    provider = FakeEmbedding()
+
+    async def run():
+        queue = EmbeddingQueue(provider, batch_size=3, flush_interval_s=0.05)
+        for i in range(7):
+            queue.submit(uuid.uuid4(), f"text {i}")
+        queue.start()
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(run())
+    assert [len(c) for c in provider.calls] == [3, 3, 1]
+    assert stored == [3, 3, 1]
+    assert stats["embedded"] == 7
+
+
+def test_full_queue_drops_instead_of_blocking():
+    async def run():
+        queue = EmbeddingQueue(FakeEmbedding(), max_queue=1)
+        queue.submit(uuid.uuid4(), "a")
+        queue.submit(uuid.uuid4(), "b")
+        return queue.stats()
+
+    assert asyncio.run(run())["dropped"] == 1
+
+
+def test_default_embed_batch_falls_back_to_embed():
+    class Single(EmbeddingProvider):
+        async def embed(self, text):
+            return [1.0]
+
+    assert asyncio.run(Single().embed_batch(["a", "b"])) == [[1.0], [1.0]]
@@ -0,0 +1,65 @@
+"""Tests für den Streaming-Export von Sessions."""
+import asyncio
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+
+from backend import dependencies
+from backend.config import Settings
+from backend.database.segments import append_segment
+from backend.routers import export
+
+SID = uuid.uuid4()
+
+
+def _row(text: str, audio: bool = False):
+    return (
+        uuid.uuid4(), SID, "source", "de", "en", text, f"{text} (en)", "gemma3:4b",
+        120, 340, None, False, audio, datetime(2026, 10, 19, 9, 30, tzinfo=timezone.utc),
+    )
+
+
+def test_ndjson_one_object_per_line():
+    lines = export.format_rows([_row("Guten Tag"), _row("Schmerzen seit gestern")], "ndjson").splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[1])
+    assert set(record) == set(export.EXPORT_COLUMNS)
+    assert record["original_text"] == "Schmerzen seit gestern"
+    assert record["session_id"] == str(SID)
+    assert record["created_at"] == "2026-10-19T09:30:00+00:00"
+
+
+def test_csv_quotes_commas_and_newlines():
+    body = export.format_rows([_row('Ja, "genau"\nzweite Zeile', audio=True)], "csv")
+    row = next(csv.reader(io.StringIO(body)))
+    assert len(row) == len(export.EXPORT_COLUMNS)
+    assert row[export.EXPORT_COLUMNS.index("original_text")] == 'Ja, "genau"\nzweite Zeile'
+    assert row[export.EXPORT_COLUMNS.index("has_audio")] == "True"
+
+
+def test_session_audio_chains_clips_and_skips_missing(monkeypatch, tmp_path):
+    monkeypatch.setattr(dependencies, "_settings", Settings(audio_storage_path=str(tmp_path)))
+    first = append_segment(tmp_path, SID, b"OggS-1")
+    second = append_segment(tmp_path, SID, b"OggS-2")
+
+    class FakeDb:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def stream_scalars(self, stmt):
+            async def paths():
+                for path in (first, f"{SID}.ogg@500:10", second):
+                    yield path
+            return paths()
+
+    monkeypatch.setattr(export, "get_session_factory", lambda: FakeDb)
+
+    async def collect():
+        return b"".join([chunk async for chunk in export._stream_audio(SID)])
+
+    assert asyncio.run(collect()) == b"OggS-1OggS-2"
@@ -0,0 +1,87 @@
+"""Tests für Latency-Tracking und Hedged Requests."""
+import asyncio
+
+import pytest
+
+from backend.hedging import LatencyTracker, hedged_call
+
+
+def test_percentile_requires_min_samples():
+    t = LatencyTracker()
+    for ms in (100, 200, 300):
+        t.record("ollama", ms)
+    assert t.percentile("ollama", 95, min_samples=5) is None
+    assert t.percentile("ollama", 50) == 200
+    assert t.percentile("ollama", 100) == 300
+
+
+def test_window_drops_old_samples():
+    t = LatencyTracker(window=2)
+    for ms in (1000, 10, 20):
+        t.record("x", ms)
+    assert t.percentile("x", 100) == 20
+
+
+def test_fast_primary_is_not_hedged():
+    async def primary():
+        return "primary"
+
+    async def fallback():
+        raise AssertionError("fallback must not start")
+
+    result = asyncio.run(hedged_call(primary, fallback, 0.5, primary_key="p", tracker=LatencyTracker()))
+    assert result.value == "primary"
+    assert result.hedged is False
+
+
+def test_slow_primary_loses_and_is_cancelled():
+    cancelled = asyncio.Event()
+
+    async def run():
+        async def primary():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "primary"
+
+        async def fallback():
+            return "fallback"
+
+        tracker = LatencyTracker()
+        result = await hedged_call(primary, fallback, 0.01, primary_key="p", fallback_key="f", tracker=tracker)
+        return result, tracker
+
+    result, tracker = asyncio.run(run())
+    assert result.value == "fallback"
+    assert result.winner == "fallback"
+    assert result.hedged is True
+    assert cancelled.is_set()
+    # Cancelled primary is still recorded as a lower bound
+    assert tracker.percentile("p", 50) is not None
+
+
+def test_failing_fallback_waits_for_primary():
+    async def primary():
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    async def fallback():
+        raise RuntimeError("down")
+
+    result = asyncio.run(hedged_call(primary, fallback, 0.01, primary_key="p", tracker=LatencyTracker()))
+    assert result.value == "primary"
+    assert result.hedged is True
+
+
+def test_both_failing_raises_primary_error():
+    async def primary():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("primary down")
+
+    async def fallback():
+        raise RuntimeError("fallback down")
+
+    with pytest.raises(RuntimeError, match="primary down"):
+        asyncio.run(hedged_call(primary, fallback, 0.01, primary_key="p", tracker=LatencyTracker()))
@@ -0,0 +1,113 @@
+"""Tests für den gebündelten Chat-History-Writer."""
+import asyncio
+import uuid
+
+import pytest
+
+from backend.database.writer import HistoryWriter, PendingMessage
+
+
+def _msg(session_id: uuid.UUID) -> PendingMessage:
+    return PendingMessage(
+        session_id=session_id, direction="source", original_text="Hallo",
+        translated_text="Hello", original_lang="de", translated_lang="en",
+    )
+
+
+def test_messages_are_written_in_batches_and_flushed_on_stop(tmp_path):
+    async def run():
+        writer = HistoryWriter(str(tmp_path), batch_size=2, flush_interval_s=0.05)
+        batches: list[int] = []
+
+        async def fake_write(batch):
+            batches.append(len(batch))
+
+        writer.write_batch = fake_write
+        sid = uuid.uuid4()
+        for _ in range(5):
+            await writer.submit(_msg(sid))
+        writer.start()
+        await writer.stop()
+        return batches
+
+    assert asyncio.run(run()) == [2, 2, 1]
+
+
+def test_full_queue_applies_backpressure(tmp_path):
+    async def run():
+        writer = HistoryWriter(str(tmp_path), max_queue=1)
+        await writer.submit(_msg(uuid.uuid4()))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(writer.submit(_msg(uuid.uuid4())), timeout=0.05)
+
+    asyncio.run(run())
+
+
+def test_audio_is_archived_after_insert_without_blocking(monkeypatch, tmp_path):
+    from backend.database import connection
+
+    async def run():
+        release = asyncio.Event()
+        updates: list = []
+
+        class SlowArchiver:
+            def start(self):
+                pass
+
+            async def archive(self, audio, session_id):
+                await release.wait()
+                return f"{session_id}.ogg@0:{len(audio)}"
+
+            async def stop(self, timeout):
+                pass
+
+        class FakeDb:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, stmt):
+                updates.append(stmt.compile().params)
+
+            async def commit(self):
+                pass
+
+        monkeypatch.setattr(connection, "get_session_factory", lambda: FakeDb)
+        writer = HistoryWriter(str(tmp_path), archiver=SlowArchiver())
+        item = _msg(uuid.uuid4())
+        item.audio_data = b"RIFF"
+        writer._schedule_audio(item)
+        await asyncio.sleep(0.01)
+        pending = writer.stats()["audio_pending"]
+        release.set()
+        await asyncio.gather(*writer._audio_tasks)
+        return pending, updates
+
+    pending, updates = asyncio.run(run())
+    assert pending == 1
+    assert updates and updates[0]["audio_path"].endswith(".ogg@0:4")
+
+
+def test_integrity_error_only_drops_the_offending_message(tmp_path):
+    from sqlalchemy.exc import IntegrityError
+
+    async def run():
+        writer = HistoryWriter(str(tmp_path))
+        bad = _msg(uuid.uuid4())
+        good = [_msg(uuid.uuid4()) for _ in range(3)]
+        written: list[uuid.UUID] = []
+
+        async def fake_write(batch):
+            if any(item is bad for item in batch):
+                raise IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+            written.extend(item.id for item in batch)
+
+        writer.write_batch = fake_write
+        await writer._write_with_retry([good[0], bad, *good[1:]])
+        return written, writer.stats()["dropped"], good
+
+    written, dropped, good = asyncio.run(run())
+    assert written == [item.id for item in good]
+    assert dropped == 1
@@ -0,0 +1,179 @@
+"""Tests für asynchrone Pipeline-Jobs."""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from backend import dependencies
+from backend.config import Settings
+from backend.database.models import PipelineJob
+from backend.jobs import JobWorkerPool, check_webhook_url, client_tag, job_to_dict, run_pipeline_job
+from backend.providers.base import STTProvider
+
+
+class FakeSTT(STTProvider):
+    async def transcribe(self, audio, language=None, task="transcribe"):
+        return "Zimmer 12 bitte", "de"
+
+
+class FakeTranslator:
+    model = None
+
+    async def translate(self, text, source, target, model=None, **kwargs):
+        return "Room 12 please"
+
+
+def test_job_runs_stages_in_order(monkeypatch, tmp_path):
+    settings = Settings(jobs_storage_path=str(tmp_path), translation_memory_enabled=False)
+    monkeypatch.setattr(dependencies, "_settings", settings)
+    monkeypatch.setattr(dependencies, "_stt", FakeSTT())
+    monkeypatch.setattr(dependencies, "_translate", FakeTranslator())
+    monkeypatch.setattr("backend.routers.pipeline._log_benchmark", lambda entry: None)
+
+    job_id = uuid.uuid4()
+    (tmp_path / f"{job_id}.in").write_bytes(b"RIFF")
+    job = PipelineJob(id=job_id, params={"target_lang": "en", "tts": False}, audio_path=f"{job_id}.in")
+    stages: list[str] = []
+
+    async def set_stage(stage):
+        stages.append(stage)
+
+    result = asyncio.run(run_pipeline_job(job, set_stage))
+    assert stages == ["stt", "translate"]
+    assert result["translation"] == "Room 12 please"
+    assert result["segments"][0]["text"] == "Zimmer 12 bitte"
+    assert result["audio_format"] is None
+
+
+def test_status_hides_internal_audio_file():
+    now = datetime.now(timezone.utc)
+    job = PipelineJob(
+        id=uuid.uuid4(), status="done", stage="done", attempts=1,
+        result={"translation": "x", "audio_file": "abc.out.wav"},
+        created_at=now, updated_at=now, finished_at=now,
+    )
+    status = job_to_dict(job)
+    assert status["progress"] == 1.0
+    assert "audio_file" not in status["result"]
+
+
+def test_client_tag_does_not_store_key():
+    tag = client_tag("secret-key")
+    assert tag and "secret" not in tag
+    assert client_tag(None) is None
+
+
+def test_webhook_rejects_internal_targets(monkeypatch):
+    monkeypatch.setattr(dependencies, "_settings", Settings())
+    for url in ("http://127.0.0.1/hook", "http://10.0.0.5/hook", "http://169.254.169.254/latest", "http://[::1]/"):
+        assert asyncio.run(check_webhook_url(url)), url
+    assert asyncio.run(check_webhook_url("ftp://93.184.216.34/hook"))
+    assert asyncio.run(check_webhook_url("https://93.184.216.34/hook")) is None
+
+
+def test_webhook_allowlist_is_exclusive(monkeypatch):
+    monkeypatch.setattr(dependencies, "_settings", Settings(jobs_webhook_allowed_hosts="hooks.internal, 10.0.0.5"))
+    assert asyncio.run(check_webhook_url("http://10.0.0.5/hook")) is None
+    assert asyncio.run(check_webhook_url("https://Hooks.Internal/done")) is None
+    assert asyncio.run(check_webhook_url("https://93.184.216.34/hook"))
+
+
+def test_worker_survives_failed_job_bookkeeping():
+    async def scenario():
+        pool = JobWorkerPool(1, poll_interval_s=0.01)
+        jobs = [PipelineJob(id=uuid.uuid4()), PipelineJob(id=uuid.uuid4())]
+        processed: list[uuid.UUID] = []
+
+        async def claim():
+            return jobs.pop(0) if jobs else None
+
+        async def process(job):
+            processed.append(job.id)
+            if len(processed) == 1:
+                raise ConnectionError("database went away")
+
+        pool.claim = claim
+        pool.process = process
+        worker = asyncio.create_task(pool._worker())
+        await asyncio.sleep(0.05)
+        alive = not worker.done()
+        worker.cancel()
+        await pool.cleanup()
+        return alive, len(processed)
+
+    assert asyncio.run(scenario()) == (True, 2)
+
+
+def test_cancelled_job_is_handed_back_on_release(monkeypatch):
+    from backend import jobs
+    from backend.database import connection
+
+    statements = []
+
+    class FakeDb:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt):
+            statements.append(stmt.compile().params)
+
+        async def commit(self):
+            pass
+
+    async def stuck(job, set_stage):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(jobs, "run_pipeline_job", stuck)
+    monkeypatch.setattr(connection, "get_session_factory", lambda: FakeDb)
+
+    async def scenario():
+        pool = JobWorkerPool(1)
+        job = PipelineJob(id=uuid.uuid4())
+        task = asyncio.create_task(pool.process(job))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await pool.release()
+        await pool.cleanup()
+        return job.id
+
+    job_id = asyncio.run(scenario())
+    assert statements[-1]["status"] == "queued"
+    assert statements[-1]["id_1"] == [job_id]
+
+
+def test_run_cancels_all_workers_when_one_fails():
+    async def scenario():
+        pool = JobWorkerPool(3, poll_interval_s=0.01)
+        started: list[int] = []
+        cancelled: list[int] = []
+
+        async def worker():
+            index = len(started)
+            started.append(index)
+            try:
+                if index == 1:
+                    await asyncio.sleep(0.01)
+                    raise RuntimeError("boom")
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+
+        async def janitor():
+            await asyncio.sleep(3600)
+
+        pool._worker = worker
+        pool._janitor = janitor
+        try:
+            await pool.run()
+        except BaseExceptionGroup as group:
+            errors = [str(exc) for exc in group.exceptions]
+        await pool.cleanup()
+        return errors, sorted(cancelled)
+
+    errors, cancelled = asyncio.run(scenario())
+    assert errors == ["boom"]
+    assert cancelled == [0, 2]
@@ -0,0 +1,50 @@
+"""Tests für den Keep-Alive-Scheduler (Entscheidungslogik ohne Ollama)."""
+from datetime import datetime, timezone
+
+from backend.keepalive import KeepAliveScheduler
+
+MONDAY_10 = datetime(2026, 10, 19, 10, 15, tzinfo=timezone.utc)
+
+
+def _scheduler() -> KeepAliveScheduler:
+    return KeepAliveScheduler("http://ollama:11434", "gemma3:4b", active_rate=2.0, history_enabled=False)
+
+
+def test_idle_without_history():
+    keep, reason = _scheduler().decide(MONDAY_10)
+    assert keep is False
+    assert reason.startswith("idle_window")
+
+
+def test_recent_activity_keeps_warm():
+    s = _scheduler()
+    s.record_activity(MONDAY_10)
+    keep, reason = s.decide(MONDAY_10)
+    assert keep is True
+    assert reason == "recent_activity"
+
+
+def test_learned_active_window():
+    s = _scheduler()
+    s._learned[MONDAY_10.weekday() * 24 + 10] = 5.0
+    keep, reason = s.decide(MONDAY_10)
+    assert keep is True
+    assert reason.startswith("active_window")
+
+
+def test_pre_warm_before_active_hour():
+    s = _scheduler()
+    s._learned[MONDAY_10.weekday() * 24 + 11] = 5.0
+    assert s.decide(MONDAY_10)[0] is False
+    keep, reason = s.decide(MONDAY_10.replace(minute=50))
+    assert keep is True
+    assert reason.startswith("pre_warm")
+
+
+def test_routed_models_are_kept_warm(monkeypatch):
+    routes = {("de", "en"): "ministral-3:3b", ("de", "fa"): "gemma3:4b"}
+    monkeypatch.setattr("backend.routing.route_model", lambda source, target: routes.get((source, target)))
+    s = _scheduler()
+    s._history_pairs = {("de", "en"), ("de", "fa"), ("de", "tr")}
+    s.record_model("qwen3:4b")
+    assert s.translate_models() == ["gemma3:4b", "ministral-3:3b", "qwen3:4b"]
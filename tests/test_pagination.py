@@ -0,0 +1,42 @@
+"""Tests für Cursor-Pagination."""
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 10, 19, 12, 30, 5, 123456, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(ts, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (ts, row_id)
+
+
+def test_malformed_cursor_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_message_listing_never_selects_vectors():
+    from sqlalchemy import select
+
+    from backend.database.models import Message
+
+    sql = str(select(Message))
+    assert "embedding" not in sql
+    assert "search_tsv" not in sql
+
+
+def test_messages_reject_after_and_before_together():
+    import asyncio
+
+    from fastapi import HTTPException
+
+    from backend.routers.messages import get_messages
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_messages(str(uuid.uuid4()), limit=50, offset=0, after="a", before="b"))
+    assert exc.value.status_code == 400
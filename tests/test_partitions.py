@@ -0,0 +1,55 @@
+"""Tests für die Partitionsverwaltung der Nachrichtentabelle."""
+import asyncio
+from datetime import datetime, timezone
+
+from backend.database import partitions
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_monthly_bounds_and_names_roundtrip():
+    start = partitions.interval_start(_utc(2026, 12, 19, 15, 30), "month")
+    assert start == _utc(2026, 12, 1)
+    assert partitions.next_start(start, "month") == _utc(2027, 1, 1)
+    name = partitions.partition_name(start, "month")
+    assert name == "messages_p2026_12"
+    assert partitions.parse_partition(name) == (_utc(2026, 12, 1), _utc(2027, 1, 1))
+    assert partitions.parse_partition("messages_p2026_10_19") == (_utc(2026, 10, 19), _utc(2026, 10, 20))
+    assert partitions.parse_partition("messages_unpartitioned") is None
+
+
+def test_create_partition_sql_covers_interval():
+    sql = partitions.create_partition_sql(_utc(2026, 10, 1), "month")
+    assert "messages_p2026_10 PARTITION OF messages" in sql
+    assert "FROM ('2026-10-01T00:00:00+00:00') TO ('2026-11-01T00:00:00+00:00')" in sql
+
+
+def test_maintenance_drops_only_past_expired_partitions(monkeypatch):
+    existing = ["messages_p2026_08", "messages_p2026_09", "messages_p2026_10"]
+    dropped: list[str] = []
+
+    async def yes():
+        return True
+
+    async def listed():
+        return list(existing)
+
+    async def ensure(interval, ahead, now):
+        return []
+
+    async def droppable(name):
+        return name != "messages_p2026_09"  # still holds a retained session
+
+    async def drop(name):
+        dropped.append(name)
+
+    monkeypatch.setattr(partitions, "is_partitioned", yes)
+    monkeypatch.setattr(partitions, "list_partitions", listed)
+    monkeypatch.setattr(partitions, "ensure_partitions", ensure)
+    monkeypatch.setattr(partitions, "is_droppable", droppable)
+    monkeypatch.setattr(partitions, "drop_partition", drop)
+    result = asyncio.run(partitions.maintain_partitions("month", 3, now=_utc(2026, 10, 19)))
+    assert result == {"partitioned": True, "created": [], "dropped": ["messages_p2026_08"]}
+    assert dropped == ["messages_p2026_08"]
@@ -0,0 +1,56 @@
+"""Tests für den Pipeline-Planer und den TTS-Cache."""
+from backend.planner import plan_pipeline
+from backend.tts_cache import TTSCache, cache_key
+
+
+def test_whisper_translate_only_for_opted_in_profile():
+    assert plan_pipeline(None, "en", True, "hotel").stt_task == "translate"
+    assert plan_pipeline(None, "en", True, "medical").stt_task == "transcribe"
+    assert plan_pipeline(None, "en", True, None).stt_task == "transcribe"
+
+
+def test_whisper_translate_needs_english_target_and_switch():
+    assert plan_pipeline(None, "de", True, "hotel").stt_task == "transcribe"
+    assert plan_pipeline(None, "en", True, "hotel", whisper_translate_enabled=False).stt_task == "transcribe"
+
+
+def test_translate_skipped_when_languages_match():
+    plan = plan_pipeline(None, "de", True, "medical")
+    plan.after_stt("de", "de")
+    assert plan.translate == "skip"
+    assert not plan.needs_llm
+
+
+def test_whisper_task_replaces_llm():
+    plan = plan_pipeline(None, "en", True, "retail")
+    plan.after_stt("tr", "en")
+    assert plan.translate == "whisper"
+    assert plan.to_log()["stt_task"] == "translate"
+    assert plan.transcript_lang("tr") == "en"  # the STT text is already English
+    assert plan_pipeline(None, "en", True, "medical").transcript_lang("tr") == "tr"
+
+
+def test_tts_disabled_is_recorded():
+    plan = plan_pipeline("de", "ar", False)
+    plan.after_stt("de", "ar")
+    assert plan.needs_llm
+    assert plan.tts == "skip"
+    assert plan.decisions == ["tts: disabled by request"]
+
+
+def test_tts_cache_evicts_least_recently_used():
+    cache = TTSCache(max_bytes=10)
+    cache.put("a", b"12345", "wav")
+    cache.put("b", b"12345", "wav")
+    assert cache.get("a") is not None  # a ist jetzt "frisch"
+    cache.put("c", b"12345", "wav")
+    assert cache.get("b") is None
+    assert cache.get("a") == (b"12345", "wav")
+    assert cache.stats()["bytes"] == 10
+
+
+def test_cache_key_depends_on_voice_and_params():
+    base = cache_key("chatterbox", "Hallo", "de", "Lance", exaggeration=0.5)
+    assert base == cache_key("chatterbox", "Hallo", "de", "Lance", exaggeration=0.5)
+    assert base != cache_key("chatterbox", "Hallo", "de", "Anna", exaggeration=0.5)
+    assert base != cache_key("chatterbox", "Hallo", "de", "Lance", exaggeration=0.7)
@@ -0,0 +1,74 @@
+"""Tests für das benchmark-basierte Model-Routing."""
+from backend.routing import ModelRoutingTable
+
+
+def _run(ms: int, quality: float | None, error: bool = False) -> dict:
+    return {"latency_ms": ms, "quality": quality, "error": error}
+
+
+BENCHMARK = {
+    "results": [
+        {"source": "de", "target": "en", "models": {
+            "ministral-3:3b": _run(400, 78.0),
+            "gemma3:4b": _run(900, 80.0),
+        }},
+        {"source": "de", "target": "fa", "models": {
+            "ministral-3:3b": _run(450, 41.0),
+            "gemma3:4b": _run(1100, 62.0),
+        }},
+        {"source": "de", "target": "fa", "models": {
+            "ministral-3:3b": _run(500, 45.0),
+            "gemma3:4b": _run(1000, 60.0, error=True),
+        }},
+    ],
+}
+
+
+def test_fast_model_serves_easy_pair():
+    table = ModelRoutingTable.from_benchmark(BENCHMARK, quality_tolerance=5.0)
+    assert table.route("de", "en") == "ministral-3:3b"
+
+
+def test_quality_gap_keeps_bigger_model():
+    table = ModelRoutingTable.from_benchmark(BENCHMARK, quality_tolerance=5.0)
+    assert table.route("de", "fa") == "gemma3:4b"
+
+
+def test_explicit_routes_override_and_wildcard():
+    data = {**BENCHMARK, "routes": {"de-en": "gemma3:4b", "*-uk": "qwen3:4b"}}
+    table = ModelRoutingTable.from_benchmark(data)
+    assert table.route("de", "en") == "gemma3:4b"
+    assert table.route("ru", "uk") == "qwen3:4b"
+    assert table.route("de", "tr") is None
+
+
+def test_legacy_output_without_models_is_ignored():
+    legacy = {"results": [{"source": "de", "target": "en", "text": "x", "reference": "y"}]}
+    assert ModelRoutingTable.from_benchmark(legacy).route("de", "en") is None
+
+
+def test_routed_model_reuses_the_singleton(monkeypatch):
+    import asyncio
+
+    from backend import dependencies, resolver
+    from backend.config import Settings
+
+    class FakeOllama:
+        model = "gemma3:4b"
+
+        def __init__(self):
+            self.models = []
+
+        async def translate(self, text, source, target, model=None, **kwargs):
+            self.models.append(model)
+            return text
+
+    singleton = FakeOllama()
+    monkeypatch.setattr(dependencies, "_settings", Settings(translate_provider="local"))
+    monkeypatch.setattr(dependencies, "_translate", singleton)
+    monkeypatch.setattr(resolver, "route_model", lambda source, target: "ministral-3:3b")
+
+    translator, ad_hoc = resolver.resolve_translate(None, None, None, None, source="de", target="en")
+    assert not ad_hoc and translator.model == "ministral-3:3b"
+    asyncio.run(translator.translate("Hallo", "de", "en"))
+    assert singleton.models == ["ministral-3:3b"]
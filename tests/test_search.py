@@ -0,0 +1,93 @@
+"""Tests für die hybride Suche (Volltext + Vektor)."""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from backend import dependencies
+from backend.config import Settings
+from backend.routers import search
+from backend.routers.search import SearchRequest, reciprocal_rank_fusion
+
+
+def _row(key, score=0.5):
+    return (key, uuid.uuid4(), "Ibuprofen 400", "ibuprofen 400", "de", "en", datetime.now(timezone.utc), score)
+
+
+def test_rrf_prefers_rows_ranked_by_both():
+    a, b, c = _row("a"), _row("b"), _row("c")
+    fused = reciprocal_rank_fusion([[a, b], [c, b]])
+    assert [row[0] for row, _ in fused][0] == "b"
+    assert {row[0] for row, _ in fused} == {"a", "b", "c"}
+
+
+def test_keyword_mode_does_not_embed(monkeypatch):
+    monkeypatch.setattr(dependencies, "_settings", Settings(search_result_cache_ttl_s=0))
+    monkeypatch.setattr(search, "get_search_result_cache", lambda: None)
+
+    async def no_embedding(query):
+        raise AssertionError("keyword search must not call the embedding service")
+
+    async def keyword_rows(body, fetch):
+        return [_row(uuid.uuid4(), 0.8)]
+
+    monkeypatch.setattr(search, "_query_embedding", no_embedding)
+    monkeypatch.setattr(search, "_keyword_rows", keyword_rows)
+    response = asyncio.run(search.semantic_search(SearchRequest(query="Ibuprofen", mode="keyword")))
+    assert response.mode == "keyword"
+    assert response.results[0].similarity == 0.8
+
+
+def test_hybrid_falls_back_to_keyword_results_without_embeddings(monkeypatch):
+    from fastapi import HTTPException
+
+    monkeypatch.setattr(dependencies, "_settings", Settings(search_result_cache_ttl_s=0))
+    monkeypatch.setattr(search, "get_search_result_cache", lambda: None)
+
+    async def no_embedding(query):
+        raise HTTPException(status_code=503, detail="Embedding provider not available")
+
+    async def keyword_rows(body, fetch):
+        return [_row(uuid.uuid4(), 0.8)]
+
+    monkeypatch.setattr(search, "_query_embedding", no_embedding)
+    monkeypatch.setattr(search, "_keyword_rows", keyword_rows)
+    response = asyncio.run(search.semantic_search(SearchRequest(query="Ibuprofen", mode="hybrid")))
+    assert response.mode == "keyword"
+    assert response.results[0].similarity == 0.8
+
+
+def test_org_filter_uses_denormalized_column_without_join():
+    org = uuid.uuid4()
+    stmt = search._apply_filters(search._columns(search.Message.created_at), SearchRequest(query="x", org_id=str(org)))
+    sql = str(stmt)
+    assert "sessions" not in sql
+    assert f"'{org}'::uuid" in sql
+
+
+def test_ef_search_stays_within_pgvector_range(monkeypatch):
+    monkeypatch.setattr(dependencies, "_settings", Settings(search_binary_candidates=2000))
+    configured: list[dict] = []
+
+    async def embedding(query):
+        return [0.0] * 768
+
+    class FakeResult:
+        def all(self):
+            return []
+
+    class FakeDb:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt, params=None):
+            if params:
+                configured.append(params)
+            return FakeResult()
+
+    monkeypatch.setattr(search, "_query_embedding", embedding)
+    monkeypatch.setattr(search, "get_session_factory", lambda: FakeDb)
+    asyncio.run(search._vector_rows(SearchRequest(query="x", limit=100, offset=5000), 5100, 40))
+    assert configured[0] == {"v": "1000"}
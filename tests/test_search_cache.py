@@ -0,0 +1,31 @@
+"""Tests für die Caches der semantischen Suche."""
+from backend.search_cache import QueryEmbeddingCache, SearchResultCache, result_key
+
+
+def test_query_embedding_cache_is_lru_and_ignores_whitespace():
+    cache = QueryEmbeddingCache(max_entries=2)
+    cache.put("m", "zimmer  reinigung", [1.0])
+    cache.put("m", "frühstück", [2.0])
+    assert cache.get("m", " zimmer reinigung ") == [1.0]
+    cache.put("m", "check-out", [3.0])  # evicts "frühstück", the least recently used
+    assert cache.get("m", "frühstück") is None
+    assert cache.get("other-model", "zimmer reinigung") is None
+
+
+def test_result_cache_serves_pages_within_window():
+    cache = SearchResultCache(ttl_s=60)
+    key = result_key("zimmer", source_lang="de")
+    cache.put(key, list(range(100)), complete=False)
+    assert cache.get(key, needed=40) == list(range(100))
+    assert cache.get(key, needed=120) is None  # beyond the cached window
+
+    short = result_key("selten")
+    cache.put(short, [1, 2], complete=True)
+    assert cache.get(short, needed=20) == [1, 2]
+
+
+def test_result_cache_expires():
+    cache = SearchResultCache(ttl_s=0)
+    key = result_key("zimmer")
+    cache.put(key, [1], complete=True)
+    assert cache.get(key, needed=1) is None
@@ -0,0 +1,71 @@
+"""Tests für die spekulative Übersetzung stabiler Teiltranskripte."""
+import asyncio
+
+from backend.speculative import SpeculationStats, SpeculativeTranslator, stable_sentence_prefix
+
+
+class EchoTranslator:
+    model = None
+
+    def __init__(self):
+        self.calls = []
+
+    async def translate(self, text, source, target, model=None, **kwargs):
+        self.calls.append(text)
+        return text.upper()
+
+
+def test_sentence_prefix_is_stable():
+    assert stable_sentence_prefix("Guten Tag. Ich habe") == "Guten Tag."
+    assert stable_sentence_prefix("Ich habe Schmerzen") == ""
+
+
+def test_matching_final_only_translates_tail():
+    async def run():
+        translator = EchoTranslator()
+        stats = SpeculationStats()
+        spec = SpeculativeTranslator(translator, "de", "en", stats=stats)
+        spec.update("Guten Tag. Ich")
+        spec.update("Guten Tag. Ich habe Schmerzen")
+        await asyncio.sleep(0)
+        result, info = await spec.finalize("Guten Tag. Ich habe Schmerzen im Bauch.")
+        return translator, stats, result, info
+
+    translator, stats, result, info = asyncio.run(run())
+    assert translator.calls == ["Guten Tag.", "Ich habe Schmerzen im Bauch."]
+    assert result == "GUTEN TAG. ICH HABE SCHMERZEN IM BAUCH."
+    assert info["hits"] == 1 and info["misses"] == 0
+    assert stats.to_dict()["hit_rate"] == 1.0
+
+
+def test_unchanged_partials_count_as_stable_and_misses_are_retranslated():
+    async def run():
+        translator = EchoTranslator()
+        stats = SpeculationStats()
+        spec = SpeculativeTranslator(translator, "de", "en", stable_updates=2, stats=stats)
+        spec.update("Zimmer zwölf")
+        spec.update("Zimmer zwölf")
+        await asyncio.sleep(0)
+        result, info = await spec.finalize("Zimmer elf bitte")
+        return translator, result, info
+
+    translator, result, info = asyncio.run(run())
+    assert translator.calls == ["Zimmer zwölf", "Zimmer elf bitte"]
+    assert result == "ZIMMER ELF BITTE"
+    assert info["misses"] == 1 and info["hits"] == 0
+
+
+def test_case_insensitive_match_keeps_offsets_of_the_final_transcript():
+    async def run():
+        translator = EchoTranslator()
+        spec = SpeculativeTranslator(translator, "de", "en", stable_updates=2)
+        spec.update("Die Straße.")
+        spec.update("Die Straße.")
+        await asyncio.sleep(0)
+        result, info = await spec.finalize("DIE STRASSE. Ist gesperrt.")
+        return translator, result, info
+
+    translator, result, info = asyncio.run(run())
+    # "ß" casefolds to "ss": the piece no longer lines up with the final and is retranslated whole
+    assert translator.calls == ["Die Straße.", "DIE STRASSE. Ist gesperrt."]
+    assert info["hits"] == 0 and info["misses"] == 1
@@ -0,0 +1,42 @@
+"""Tests für den Supervisor der Hintergrund-Tasks (ohne Datenbank)."""
+import asyncio
+
+from backend.supervisor import TaskSupervisor, advisory_key
+
+
+def test_advisory_key_is_stable_and_distinct():
+    assert advisory_key("cleanup") == advisory_key("cleanup")
+    assert advisory_key("cleanup") != advisory_key("partitions")
+    assert -(2**63) <= advisory_key("cleanup") < 2**63
+
+
+def test_backoff_grows_and_is_capped():
+    supervisor = TaskSupervisor(backoff_base_s=1.0, backoff_max_s=10.0)
+    assert [supervisor.backoff_delay(n) for n in range(6)] == [1.0, 1.0, 2.0, 4.0, 8.0, 10.0]
+
+
+def test_crashed_task_is_restarted_and_reported():
+    runs: list[int] = []
+
+    async def flaky():
+        runs.append(1)
+        if len(runs) < 3:
+            raise RuntimeError("boom")
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        supervisor = TaskSupervisor(backoff_base_s=0.001, backoff_max_s=0.001)
+        supervisor.add("flaky", flaky, stats=lambda: {"runs": len(runs)})
+        for _ in range(100):
+            await asyncio.sleep(0.005)
+            if supervisor.status()["flaky"]["state"] == "running" and len(runs) == 3:
+                break
+        status = supervisor.status()["flaky"]
+        await supervisor.stop()
+        return status, supervisor.status()["flaky"]["state"]
+
+    status, final_state = asyncio.run(scenario())
+    assert status["restarts"] == 2
+    assert status["last_error"] == "RuntimeError: boom"
+    assert status["stats"] == {"runs": 3}
+    assert final_state == "stopped"
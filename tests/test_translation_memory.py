@@ -0,0 +1,49 @@
+"""Tests für die Normalisierung der Translation Memory."""
+from backend.translation_memory import normalize, source_hash
+
+
+def test_normalize_ignores_case_and_whitespace():
+    assert normalize("  Haben Sie   Allergien? ") == normalize("haben sie allergien?")
+
+
+def test_normalize_keeps_punctuation():
+    """Frage und Aussage dürfen nicht zusammenfallen."""
+    assert normalize("Sie haben Allergien.") != normalize("Sie haben Allergien?")
+
+
+def test_source_hash_is_stable_hex():
+    h = source_hash("Do you have allergies?")
+    assert len(h) == 64
+    assert h == source_hash("do  you have ALLERGIES?")
+
+
+def test_normalize_unicode_compatibility():
+    # Fullwidth and composed forms collapse to the same key
+    assert normalize("ＡＢＣ") == normalize("abc")
+
+
+def test_lookup_is_scoped_to_the_profile():
+    """Eine Hotel-Übersetzung darf keiner Medizin-Anfrage dienen."""
+    import asyncio
+
+    from backend.translation_memory import lookup
+
+    class FakeDb:
+        def __init__(self):
+            self.statements = []
+
+        async def execute(self, stmt):
+            self.statements.append(stmt.compile())
+
+            class Result:
+                def first(self):
+                    return None
+
+            return Result()
+
+    db = FakeDb()
+    asyncio.run(lookup(db, "Haben Sie Allergien?", "de", "en", profile_id="medical"))
+    asyncio.run(lookup(db, "Haben Sie Allergien?", "de", "en"))
+    medical, generic = db.statements
+    assert "messages.profile_id = " in str(medical) and "medical" in medical.params.values()
+    assert "messages.profile_id IS NULL" in str(generic)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Fill in missing message embeddings.
+
+Walks messages with ``embedding IS NULL`` in id order, embeds them in
+batches through Ollama's ``/api/embed`` and writes them back with bulk
+UPDATEs.  The cursor is saved after every batch, so an interrupted run
+resumes where it stopped; ``--restart`` starts from the beginning again
+(e.g. to retry batches that failed).
+
+Uses the same environment variables as the backend (``DATABASE_URL``,
+``EMBEDDING_URL``, ``EMBEDDING_MODEL``).
+
+Usage:
+    python tools/backfill_embeddings.py
+    python tools/backfill_embeddings.py --batch-size 64 --rate 20
+    python tools/backfill_embeddings.py --restart --limit 1000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.config import Settings  # noqa: E402
+from backend.database.connection import close_db, init_db  # noqa: E402
+from backend.embeddings import backfill  # noqa: E402
+from backend.providers.embedding.ollama_embed import OllamaEmbeddingProvider  # noqa: E402
+
+DEFAULT_STATE = ROOT / "data" / "embedding_backfill.json"
+
+
+def load_cursor(path: Path) -> uuid.UUID | None:
+    if not path.exists():
+        return None
+    cursor = json.loads(path.read_text()).get("cursor")
+    return uuid.UUID(cursor) if cursor else None
+
+
+def save_cursor(path: Path, cursor: uuid.UUID, done: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"cursor": str(cursor), "embedded": done}))
+    tmp.replace(path)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill missing message embeddings")
+    parser.add_argument("--batch-size", type=int, default=64, help="Messages per embedding call")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum messages per second")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many messages")
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE, help="Cursor file for resuming")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved cursor")
+    args = parser.parse_args()
+
+    settings = Settings()
+    cursor = None if args.restart else load_cursor(args.state)
+    if cursor:
+        print(f"Resuming after {cursor}")
+
+    await init_db(settings.database_url)
+    provider = OllamaEmbeddingProvider(base_url=settings.embedding_url, model=settings.embedding_model)
+    try:
+        stats = await backfill(
+            provider,
+            batch_size=args.batch_size,
+            max_rate=args.rate,
+            after=cursor,
+            limit=args.limit,
+            on_batch=lambda last_id, done: save_cursor(args.state, last_id, done),
+        )
+    finally:
+        await provider.cleanup()
+        await close_db()
+    print(f"Embedded {stats['embedded']} messages ({stats['failed']} failed), cursor {stats['cursor']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Manage per-organization partial vector indexes.
+
+Large tenants get their own HNSW index over their messages only
+(``WHERE org_id = '<org>'``).  Searches filtered to that organization then
+walk a graph that contains nothing but their rows, instead of the global
+index plus a post-filter.  ``/api/search`` inlines the org id so the
+planner can match the partial index.  Indexes are built CONCURRENTLY and
+do not block writes -- except on a partitioned ``messages`` table
+(``tools/partition_messages.py``), where PostgreSQL only supports plain
+builds and writes wait until the index is ready.
+
+Uses the backend's ``DATABASE_URL``.
+
+Usage:
+    python tools/org_vector_index.py list
+    python tools/org_vector_index.py sizes --min-messages 100000
+    python tools/org_vector_index.py create <org_id> [--binary]
+    python tools/org_vector_index.py drop <org_id>
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+from backend.config import Settings  # noqa: E402
+from backend.database.connection import close_db, get_engine, init_db  # noqa: E402
+from backend.database.partitions import is_partitioned  # noqa: E402
+
+PREFIX = "idx_messages_emb_org_"
+
+
+def index_names(org_id: uuid.UUID) -> tuple[str, str]:
+    return f"{PREFIX}{org_id.hex}", f"{PREFIX}bit_{org_id.hex}"
+
+
+async def run(sql: str) -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction, nor on partitioned tables
+    if await is_partitioned():
+        sql = sql.replace(" CONCURRENTLY", "")
+    engine = get_engine().execution_options(isolation_level="AUTOCOMMIT")
+    async with engine.connect() as conn:
+        await conn.execute(text(sql))
+
+
+async def list_indexes() -> None:
+    async with get_engine().connect() as conn:
+        rows = (await conn.execute(text(
+            "SELECT indexname, pg_size_pretty(pg_relation_size(format('%I', indexname)::regclass)) "
+            "FROM pg_indexes WHERE tablename = 'messages' AND indexname LIKE :prefix ORDER BY indexname"
+        ), {"prefix": PREFIX + "%"})).all()
+    for name, size in rows:
+        print(f"{name}  {size}")
+    if not rows:
+        print("No per-organization vector indexes")
+
+
+async def org_sizes(min_messages: int) -> None:
+    async with get_engine().connect() as conn:
+        rows = (await conn.execute(text(
+            "SELECT org_id, count(*) FROM messages WHERE org_id IS NOT NULL AND embedding IS NOT NULL "
+            "GROUP BY org_id HAVING count(*) >= :min ORDER BY count(*) DESC"
+        ), {"min": min_messages})).all()
+    for org_id, count in rows:
+        print(f"{org_id}  {count:,} embedded messages")
+
+
+async def create(org_id: uuid.UUID, binary: bool) -> None:
+    name, bit_name = index_names(org_id)
+    print(f"Building {name}...")
+    await run(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON messages "
+        f"USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64) "
+        f"WHERE org_id = '{org_id}'::uuid"
+    )
+    if binary:
+        print(f"Building {bit_name}...")
+        await run(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {bit_name} ON messages "
+            f"USING hnsw (embedding_bit bit_hamming_ops) WHERE org_id = '{org_id}'::uuid"
+        )
+
+
+async def drop(org_id: uuid.UUID) -> None:
+    for name in index_names(org_id):
+        await run(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        print(f"Dropped {name}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-organization partial vector indexes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List existing per-organization indexes")
+    sizes = sub.add_parser("sizes", help="Organizations by embedded message count")
+    sizes.add_argument("--min-messages", type=int, default=50_000)
+    create_cmd = sub.add_parser("create", help="Build the partial index for an organization")
+    create_cmd.add_argument("org_id", type=uuid.UUID)
+    create_cmd.add_argument("--binary", action="store_true", help="Also index embedding_bit (SEARCH_BINARY_CANDIDATES)")
+    drop_cmd = sub.add_parser("drop", help="Drop an organization's partial indexes")
+    drop_cmd.add_argument("org_id", type=uuid.UUID)
+    args = parser.parse_args()
+
+    await init_db(Settings().database_url)
+    try:
+        if args.command == "list":
+            await list_indexes()
+        elif args.command == "sizes":
+            await org_sizes(args.min_messages)
+        elif args.command == "create":
+            await create(args.org_id, args.binary)
+        else:
+            await drop(args.org_id)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
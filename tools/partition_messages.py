@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Convert the ``messages`` table to the time-partitioned layout.
+
+``migrate`` builds ``messages_partitioned`` (range-partitioned by
+``created_at``, ``PARTITION_INTERVAL`` per partition, primary key
+``(id, created_at)``), copies the rows in batches while the server keeps
+writing, recreates every index of ``messages`` on it, and finally takes a
+short ``EXCLUSIVE`` lock (reads continue, writes wait) to copy the rows
+written meanwhile and swap the tables.  The old table is kept as
+``messages_unpartitioned`` until ``drop-old``.
+
+Corrections and approvals made while the rows are copied are carried over
+(older rows just before the swap, rows created during the migration also
+under the lock, together with their late embeddings); run
+``tools/backfill_embeddings.py`` afterwards to catch any other embeddings.
+
+Uses the backend's ``DATABASE_URL``.
+
+Usage:
+    python tools/partition_messages.py status
+    python tools/partition_messages.py migrate [--batch-size 5000]
+    python tools/partition_messages.py maintain
+    python tools/partition_messages.py drop-old
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+from backend.config import Settings  # noqa: E402
+from backend.database.connection import close_db, get_engine, init_db  # noqa: E402
+from backend.database.partitions import (  # noqa: E402
+    create_partition_sql, interval_start, is_partitioned, list_partitions, maintain_partitions, next_start,
+)
+
+NEW = "messages_partitioned"
+OLD = "messages_unpartitioned"
+LATE_MARGIN = timedelta(minutes=10)  # rows the writer inserts with a slightly older created_at
+
+
+async def columns() -> list[str]:
+    # search_tsv is generated and cannot be inserted
+    async with get_engine().connect() as conn:
+        rows = await conn.execute(text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = 'messages' AND is_generated = 'NEVER' ORDER BY ordinal_position"
+        ))
+        return [row[0] for row in rows]
+
+
+async def create_table(interval: str, ahead: int) -> None:
+    async with get_engine().begin() as conn:
+        await conn.execute(text(
+            f"CREATE TABLE {NEW} (LIKE messages INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE) "
+            "PARTITION BY RANGE (created_at)"
+        ))
+        # The partition key has to be part of the primary key
+        await conn.execute(text(f"ALTER TABLE {NEW} ADD CONSTRAINT {NEW}_pkey PRIMARY KEY (id, created_at)"))
+        await conn.execute(text(
+            f"ALTER TABLE {NEW} ADD CONSTRAINT {NEW}_session_id_fkey "
+            "FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE"
+        ))
+        oldest = (await conn.execute(text("SELECT min(created_at) FROM messages"))).scalar()
+        now = datetime.now(timezone.utc)
+        start = interval_start(oldest or now, interval)
+        last = interval_start(now, interval)
+        for _ in range(ahead):
+            last = next_start(last, interval)
+        count = 0
+        while start <= last:
+            await conn.execute(text(create_partition_sql(start, interval, parent=NEW)))
+            start = next_start(start, interval)
+            count += 1
+    print(f"Created {NEW} with {count} partitions")
+
+
+async def copy_rows(cols: list[str], batch_size: int, after: tuple | None) -> tuple | None:
+    """Copy rows ordered by (created_at, id) after the given key; returns the last key copied."""
+    col_list = ", ".join(cols)
+    copied = 0
+    while True:
+        where = "WHERE (created_at, id) > (:ts, :id)" if after else ""
+        async with get_engine().begin() as conn:
+            row = (await conn.execute(text(
+                f"WITH batch AS (SELECT {col_list} FROM messages {where} ORDER BY created_at, id LIMIT :n), "
+                f"ins AS (INSERT INTO {NEW} ({col_list}) SELECT {col_list} FROM batch) "
+                "SELECT created_at, id, (SELECT count(*) FROM batch) FROM batch "
+                "ORDER BY created_at DESC, id DESC LIMIT 1"
+            ), {"ts": after[0] if after else None, "id": after[1] if after else None, "n": batch_size})).first()
+        if row is None:
+            return after
+        after = (row[0], row[1])
+        copied += row[2]
+        print(f"  {copied:>10,} rows copied (up to {after[0]:%Y-%m-%d %H:%M})", end="\r", flush=True)
+        if row[2] < batch_size:
+            print()
+            return after
+
+
+async def create_indexes() -> list[tuple[str, str]]:
+    """Recreate every secondary index of messages on the new table under a temporary name."""
+    async with get_engine().connect() as conn:
+        rows = (await conn.execute(text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = 'messages' AND indexname <> 'messages_pkey'"
+        ))).all()
+    renames = []
+    for name, definition in rows:
+        temp = f"{name[:55]}_part"
+        sql = re.sub(r"^CREATE INDEX \S+ ON (\S+\.)?messages ", f"CREATE INDEX {temp} ON {NEW} ", definition)
+        print(f"  {name}")
+        start = time.perf_counter()
+        async with get_engine().begin() as conn:
+            await conn.execute(text("SET LOCAL maintenance_work_mem = '1GB'"))
+            await conn.execute(text(sql))
+        print(f"    built in {time.perf_counter() - start:.0f}s")
+        renames.append((name, temp))
+    return renames
+
+
+async def sync_edits() -> int:
+    """Carry over corrections and approvals made to already copied rows (no lock held)."""
+    async with get_engine().begin() as conn:
+        result = await conn.execute(text(
+            f"UPDATE {NEW} n SET translated_text = m.translated_text, approved = m.approved "
+            "FROM messages m WHERE m.id = n.id AND m.created_at = n.created_at "
+            "AND (n.translated_text IS DISTINCT FROM m.translated_text OR n.approved <> m.approved)"
+        ))
+    return result.rowcount
+
+
+async def swap(cols: list[str], after: tuple | None, started: datetime, renames: list[tuple[str, str]]) -> None:
+    col_list = ", ".join(cols)
+    since = (after[0] if after else started) - LATE_MARGIN
+    async with get_engine().begin() as conn:
+        await conn.execute(text("LOCK TABLE messages IN EXCLUSIVE MODE"))
+        inserted = await conn.execute(text(
+            f"INSERT INTO {NEW} ({col_list}) SELECT {col_list} FROM messages m WHERE m.created_at >= :since "
+            f"AND NOT EXISTS (SELECT 1 FROM {NEW} n WHERE n.id = m.id AND n.created_at = m.created_at)"
+        ), {"since": since})
+        # Embeddings and corrections (PATCH) may arrive after the row was copied
+        updated = await conn.execute(text(
+            f"UPDATE {NEW} n SET embedding = m.embedding, embedding_bit = m.embedding_bit, "
+            "translated_text = m.translated_text, approved = m.approved "
+            "FROM messages m WHERE m.id = n.id AND m.created_at = n.created_at AND m.created_at >= :since "
+            "AND (n.embedding IS DISTINCT FROM m.embedding OR n.translated_text IS DISTINCT FROM m.translated_text "
+            "OR n.approved <> m.approved)"
+        ), {"since": started - LATE_MARGIN})
+        await conn.execute(text(f"ALTER TABLE messages RENAME TO {OLD}"))
+        await conn.execute(text(f"ALTER TABLE {OLD} RENAME CONSTRAINT messages_pkey TO {OLD}_pkey"))
+        await conn.execute(text(
+            f"ALTER TABLE {OLD} RENAME CONSTRAINT messages_session_id_fkey TO {OLD}_session_id_fkey"
+        ))
+        for name, temp in renames:
+            await conn.execute(text(f"ALTER INDEX {name} RENAME TO {name[:50]}_unpart"))
+            await conn.execute(text(f"ALTER INDEX {temp} RENAME TO {name}"))
+        await conn.execute(text(f"ALTER TABLE {NEW} RENAME TO messages"))
+        await conn.execute(text(f"ALTER TABLE messages RENAME CONSTRAINT {NEW}_pkey TO messages_pkey"))
+        await conn.execute(text(
+            f"ALTER TABLE messages RENAME CONSTRAINT {NEW}_session_id_fkey TO messages_session_id_fkey"
+        ))
+    print(f"Swapped tables ({inserted.rowcount} late rows copied, {updated.rowcount} rows refreshed)")
+
+
+async def migrate(batch_size: int) -> None:
+    s = Settings()
+    if await is_partitioned():
+        print("messages is already partitioned")
+        return
+    started = datetime.now(timezone.utc)
+    await create_table(s.partition_interval, s.partitions_ahead)
+    cols = await columns()
+    print("Copying rows...")
+    after = await copy_rows(cols, batch_size, None)
+    print("Building indexes...")
+    renames = await create_indexes()
+    print("Copying rows written meanwhile...")
+    after = await copy_rows(cols, batch_size, after)
+    print(f"Carried over {await sync_edits()} edited rows")
+    await swap(cols, after, started, renames)
+    async with get_engine().connect() as conn:
+        await conn.execute(text("ANALYZE messages"))
+    print(f"Done in {(datetime.now(timezone.utc) - started).total_seconds():.0f}s; "
+          f"old table kept as {OLD} (drop it with 'drop-old')")
+
+
+async def status() -> None:
+    if not await is_partitioned():
+        print("messages is not partitioned")
+        return
+    async with get_engine().connect() as conn:
+        for name in await list_partitions():
+            size = (await conn.execute(text(
+                "SELECT pg_size_pretty(pg_total_relation_size(to_regclass(:n)))"
+            ), {"n": name})).scalar()
+            print(f"{name}  {size}")
+        if (await conn.execute(text("SELECT to_regclass(:t)"), {"t": OLD})).scalar():
+            print(f"{OLD} still exists")
+
+
+async def drop_old() -> None:
+    async with get_engine().begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS {OLD}"))
+    print(f"Dropped {OLD}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Time-partitioned messages table")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="List partitions and their sizes")
+    migrate_cmd = sub.add_parser("migrate", help="Convert messages to the partitioned layout")
+    migrate_cmd.add_argument("--batch-size", type=int, default=5000, help="Rows copied per transaction")
+    sub.add_parser("maintain", help="Pre-create future partitions and drop expired ones now")
+    sub.add_parser("drop-old", help=f"Drop {OLD} after a successful migration")
+    args = parser.parse_args()
+
+    await init_db(Settings().database_url)
+    try:
+        if args.command == "status":
+            await status()
+        elif args.command == "migrate":
+            await migrate(args.batch_size)
+        elif args.command == "maintain":
+            s = Settings()
+            print(await maintain_partitions(s.partition_interval, s.partitions_ahead, s.partition_drop_enabled))
+        else:
+            await drop_old()
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
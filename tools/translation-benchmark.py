@@ -11,6 +11,10 @@ Voraussetzung: Ollama laeuft + alle drei Modelle gepullt:
 
 Usage: python translation-benchmark.py [--ollama-url http://localhost:11434]
        python translation-benchmark.py --models gemma3:4b qwen2.5:7b
+       python translation-benchmark.py --output benchmarks/routing.json
+
+Die JSON-Ausgabe enthaelt pro Satz und Modell Latenz und chrF-Score und kann
+direkt als TRANSLATE_ROUTING_FILE vom Backend geladen werden.
 """
 
 import argparse
@@ -202,6 +206,31 @@ def ollama_translate(ollama_url, model, text, source, target):
     return translation, duration
 
 
+def chrf(hypothesis, reference, max_n=6, beta=2.0):
+    """Character n-gram F-score (chrF, 0-100) against the reference translation."""
+    hyp = hypothesis.replace(" ", "")
+    ref = reference.replace(" ", "")
+    precisions, recalls = [], []
+    for n in range(1, max_n + 1):
+        hyp_ngrams, ref_ngrams = {}, {}
+        for i in range(len(hyp) - n + 1):
+            hyp_ngrams[hyp[i:i + n]] = hyp_ngrams.get(hyp[i:i + n], 0) + 1
+        for i in range(len(ref) - n + 1):
+            ref_ngrams[ref[i:i + n]] = ref_ngrams.get(ref[i:i + n], 0) + 1
+        if not hyp_ngrams or not ref_ngrams:
+            continue
+        overlap = sum(min(c, ref_ngrams.get(g, 0)) for g, c in hyp_ngrams.items())
+        precisions.append(overlap / sum(hyp_ngrams.values()))
+        recalls.append(overlap / sum(ref_ngrams.values()))
+    if not precisions:
+        return 0.0
+    p = sum(precisions) / len(precisions)
+    r = sum(recalls) / len(recalls)
+    if p == 0 and r == 0:
+        return 0.0
+    return round(100 * (1 + beta ** 2) * p * r / (beta ** 2 * p + r), 2)
+
+
 def check_model_available(ollama_url, model):
     """Check if model is pulled in Ollama."""
     try:
@@ -243,7 +272,8 @@ def print_test_result(idx, test, results):
     for model in MODELS:
         translation, duration = results[model]
         model_short = model.split(":")[0].upper()
-        print(f"  {model_short:12s} ({duration:5.1f}s): {translation}")
+        score = chrf(translation, test["reference"])
+        print(f"  {model_short:12s} ({duration:5.1f}s, chrF {score:5.1f}): {translation}")
     print()
 
 
@@ -275,6 +305,10 @@ def main():
     parser = argparse.ArgumentParser(description="Dolmtschr Translation Benchmark")
     parser.add_argument("--ollama-url", default="http://localhost:11434", help="Ollama API URL")
     parser.add_argument("--models", nargs="+", default=None, help="Override models to test")
+    parser.add_argument(
+        "--output", default="benchmark-results.json",
+        help="Result file (usable as TRANSLATE_ROUTING_FILE for the backend)",
+    )
     args = parser.parse_args()
 
     global MODELS
@@ -315,6 +349,7 @@ def main():
     print_header()
 
     all_durations = {m: [] for m in MODELS}
+    all_results = []
 
     for idx, test in enumerate(TEST_SENTENCES):
         results = {}
@@ -331,6 +366,7 @@ def main():
 
         sys.stdout.write("\r" + " " * 80 + "\r")
         print_test_result(idx, test, results)
+        all_results.append(results)
 
     print_summary(all_durations)
 
@@ -340,13 +376,21 @@ def main():
         "models": MODELS,
         "results": [],
     }
-    for idx, test in enumerate(TEST_SENTENCES):
-        entry = {**test}
+    for test, results in zip(TEST_SENTENCES, all_results):
+        entry = {**test, "models": {}}
+        for model, (translation, duration) in results.items():
+            failed = translation.startswith("[ERROR")
+            entry["models"][model] = {
+                "translation": translation,
+                "latency_ms": int(duration * 1000),
+                "quality": None if failed else chrf(translation, test["reference"]),
+                "error": failed,
+            }
         output["results"].append(entry)
-    
-    with open("benchmark-results.json", "w", encoding="utf-8") as f:
+
+    with open(args.output, "w", encoding="utf-8") as f:
         json.dump(output, f, ensure_ascii=False, indent=2)
-    print(f"\n  Config saved to benchmark-results.json")
+    print(f"\n  Results saved to {args.output}")
 
 
 if __name__ == "__main__":